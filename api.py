@@ -10,7 +10,7 @@ from rest_api import router as api_router
 
 from typing import List
 import models, schemas
-from database import SessionLocal
+from database import SessionLocal, engine
 
 templates = Jinja2Templates(directory="templates/")
 
@@ -35,6 +35,8 @@ def create_rooms():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print('****START')
+    # Crear tablas en la BD al arrancar, no al importar rest_api
+    models.Base.metadata.create_all(bind=engine)
     create_rooms()
     yield
     print('****END')
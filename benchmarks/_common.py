@@ -0,0 +1,41 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def use_temp_database() -> str:
+    """
+    Point DATABASE_URL at a fresh SQLite file so sql_app.db is never touched.
+
+    Must be called before anything under src/ is imported.
+
+    Returns:
+        The database URL in use
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="ws-bench-"), "bench.db")
+    url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    return url
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Run fn `number` times per round and return the best per-call seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def report(name: str, seconds: float, extra: str = ""):
+    """Print one aligned result line."""
+    print(f"{name:<48} {seconds * 1000:>10.3f} ms  {extra}")
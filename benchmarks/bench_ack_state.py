@@ -0,0 +1,91 @@
+"""Acknowledgement state: query latency, memory and flush cost.
+
+USERS members of one room with SEQS alerts, every CRITICAL_EVERY-th one
+critical. Each user has read up to a random point with a few
+out-of-order reads above it, and has acknowledged the critical alerts up
+to there. Measures the unread count of one user, "who has not read
+critical alert X" over all members, ack calls, the memory held and a
+full flush to SQLite.
+
+Run with: python -m benchmarks.bench_ack_state
+"""
+import random
+import time
+import tracemalloc
+
+from benchmarks._common import use_temp_database, best_of, report
+
+USERS = 10_000
+SEQS = 50_000
+CRITICAL_EVERY = 500
+OUT_OF_ORDER = 20
+
+
+def main():
+    use_temp_database()
+    from src.entities.read_state import ACK_READ
+    from src.frameworks_drivers.db.connection import SessionLocal, engine
+    from src.frameworks_drivers.db.orm_models import Base
+    from src.interface_adapters.repositories.ack_states import AckStates
+
+    rng = random.Random(1)
+    room_id = 1
+    members = list(range(1, USERS + 1))
+
+    def fill() -> AckStates:
+        rng.seed(1)
+        states = AckStates()
+        for seq in range(CRITICAL_EVERY, SEQS + 1, CRITICAL_EVERY):
+            states.track(room_id, seq)
+        for user_id in members:
+            read_to = rng.randrange(SEQS)
+            states.ack(room_id, user_id, ACK_READ, up_to=read_to)
+            states.ack(room_id, user_id, ACK_READ, [rng.randrange(read_to + 1, SEQS + 1) for _ in range(OUT_OF_ORDER)])
+        return states
+
+    start = time.perf_counter()
+    fill()
+    report(f"ack: up_to + {OUT_OF_ORDER} seqs (avg per call)", (time.perf_counter() - start) / USERS / 2)
+    # Measured on a second fill, tracing slows it down
+    tracemalloc.start()
+    states = fill()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  memory: {current / USERS:.0f} B/user, {current / 2**20:.1f} MiB")
+
+    user_ids = [rng.choice(members) for _ in range(1000)]
+    seconds = best_of(lambda: [states.unread(room_id, user_id, SEQS) for user_id in user_ids])
+    report("unread count (avg per query)", seconds / len(user_ids))
+
+    critical = SEQS // 2 // CRITICAL_EVERY * CRITICAL_EVERY
+    pending = states.unacked(room_id, critical, ACK_READ, members)
+    report(
+        f"unacked: seq {critical} over {USERS} members",
+        best_of(lambda: states.unacked(room_id, critical, ACK_READ, members)),
+        f"{len(pending)} pending"
+    )
+    few = members[:100]
+    report("unacked: over 100 members", best_of(lambda: states.unacked(room_id, critical, ACK_READ, few)))
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = time.perf_counter()
+    rows = states.flush(db)
+    report("flush: every state", time.perf_counter() - start, f"{rows} rows")
+    stored = db.connection().exec_driver_sql(
+        "SELECT SUM(LENGTH(above)) FROM ack_states"
+    ).scalar()
+    print(f"  bitmap bytes stored: {stored / USERS:.0f} B/user")
+    states.ack(room_id, 1, ACK_READ, up_to=SEQS)
+    start = time.perf_counter()
+    rows = states.flush(db)
+    report("flush: one changed user", time.perf_counter() - start, f"{rows} rows")
+    fresh = AckStates()
+    start = time.perf_counter()
+    rows = fresh.load(db)
+    report("load: every state", time.perf_counter() - start, f"{rows} rows")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
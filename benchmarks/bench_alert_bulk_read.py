@@ -0,0 +1,86 @@
+"""Alert history bulk read: columnar batch vs ORM -> entity -> dict path.
+
+Run with: python -m benchmarks.bench_alert_bulk_read [rows]
+"""
+import sys
+import time
+import tracemalloc
+
+from benchmarks._common import use_temp_database, best_of, report
+
+
+def seed(engine, rows: int):
+    """Insert `rows` alerts into room 1 with a single executemany."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO users (id, username, password) VALUES (1, 'bench', 'x')")
+        conn.exec_driver_sql("INSERT INTO rooms (id, name) VALUES (1, 'bench')")
+        conn.exec_driver_sql(
+            "INSERT INTO alerts (content, user_id, room_id) VALUES (?, 1, 1)",
+            [(f"alert number {i} disk at {i % 100}%",) for i in range(rows)]
+        )
+
+
+def peak_memory(fn) -> int:
+    """Peak traced allocation of one fn() call, keeping its result alive."""
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main(rows: int = 100_000):
+    use_temp_database()
+    from src.frameworks_drivers.db.connection import engine, SessionLocal
+    from src.frameworks_drivers.db.schema import ensure_schema
+    from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+    from src.interface_adapters.presenters.serializers import alerts_to_json, alert_batch_to_json
+
+    ensure_schema(engine)
+    seed(engine, rows)
+
+    def triple_copy():
+        # ORM objects -> entities -> dicts, as the controller used to do
+        db = SessionLocal()
+        try:
+            alerts = SQLAlertRepository(db).get_all(room_id=1)
+            return [
+                {"id": a.id, "content": a.content, "created_at": a.created_at, "user_id": a.user_id}
+                for a in alerts
+            ]
+        finally:
+            db.close()
+
+    def entities_json():
+        db = SessionLocal()
+        try:
+            return alerts_to_json(SQLAlertRepository(db).get_all(room_id=1))
+        finally:
+            db.close()
+
+    def columnar():
+        db = SessionLocal()
+        try:
+            return SQLAlertRepository(db).get_batch(room_id=1)
+        finally:
+            db.close()
+
+    def columnar_json():
+        return alert_batch_to_json(columnar())
+
+    print(f"{rows} rows")
+    report("read: ORM -> entity -> dict", best_of(triple_copy, repeat=3),
+           f"peak {peak_memory(triple_copy) / 2**20:.1f} MiB")
+    report("read: columnar batch", best_of(columnar, repeat=3),
+           f"peak {peak_memory(columnar) / 2**20:.1f} MiB")
+    report("read + JSON: entities", best_of(entities_json, repeat=3))
+    report("read + JSON: columnar batch", best_of(columnar_json, repeat=3))
+
+    start = time.perf_counter()
+    size = len(columnar_json())
+    report("columnar JSON size", time.perf_counter() - start, f"{size / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
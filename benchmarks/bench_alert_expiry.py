@@ -0,0 +1,77 @@
+"""Cost of finding expired alerts: timer wheel tick vs polling the table.
+
+The wheel is filled with PENDING expiries spread over a day and advanced
+one second at a time; the alternative is a periodic query for rows whose
+expires_at passed, on a table holding the same number of expiring alerts
+plus ROWS alerts that never expire.
+
+Run with: python -m benchmarks.bench_alert_expiry
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+from benchmarks._common import use_temp_database, best_of, report
+
+PENDING = 100_000
+ROWS = 200_000
+HORIZON = 24 * 3600
+
+
+def main():
+    use_temp_database()
+    from sqlalchemy import insert, select
+    from src.frameworks_drivers.db.connection import SessionLocal, engine
+    from src.frameworks_drivers.db.orm_models import AlertORM, Base, RoomORM
+    from src.interface_adapters.alert_expiry import TimerWheel
+
+    rng = random.Random(1)
+    deadlines = [rng.randrange(1, HORIZON) for _ in range(PENDING)]
+
+    def fill() -> TimerWheel:
+        wheel = TimerWheel(0)
+        for i, deadline in enumerate(deadlines):
+            wheel.add(deadline, i)
+        return wheel
+
+    report(f"wheel: schedule {PENDING}", best_of(fill, repeat=3), "(total)")
+    wheel = fill()
+    ticks = 3600
+    fired = 0
+    start = wheel.current
+
+    def tick_hour():
+        nonlocal fired
+        for _ in range(ticks):
+            fired += len(wheel.advance(wheel.current + 1))
+
+    seconds = best_of(tick_hour, repeat=1)
+    report("wheel: one tick (avg over an hour)", seconds / ticks, f"{fired} fired")
+    assert wheel.current == start + ticks
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(RoomORM(id=1, name="bench"))
+    db.commit()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    table = AlertORM.__table__
+    db.execute(insert(table), [
+        {"content": "x", "user_id": 1, "room_id": 1} for _ in range(ROWS)
+    ])
+    db.execute(insert(table), [
+        {"content": "x", "user_id": 1, "room_id": 1, "expires_at": now + timedelta(seconds=d)}
+        for d in deadlines
+    ])
+    db.commit()
+
+    poll = select(AlertORM.id, AlertORM.room_id).where(AlertORM.expires_at <= now)
+    report("poll: expires_at query (indexed)", best_of(lambda: db.execute(poll).all()))
+    conn = db.connection()
+    scan = "SELECT id, room_id FROM alerts NOT INDEXED WHERE expires_at <= ?"
+    report("poll: expires_at query (full scan)", best_of(
+        lambda: conn.exec_driver_sql(scan, (str(now),)).all()
+    ))
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""GET /api/alerts?room_id=: versioned response cache against a rebuild per call.
+
+Calls the endpoint function directly (no HTTP stack) for a room of
+`rows` alerts: cache miss (query + serialize + hash), hit, and a
+revalidation answered 304. Then one alert is created to show the bump.
+
+Run with: python -m benchmarks.bench_alert_history_cache [rows]
+"""
+import sys
+
+from benchmarks._common import use_temp_database, best_of, report
+
+
+def main(rows: int = 1_000):
+    use_temp_database()
+    from src.entities.alert import Alert
+    from src.entities.user import User
+    from src.frameworks_drivers.db.connection import engine, SessionLocal
+    from src.frameworks_drivers.db.schema import ensure_schema
+    from src.interface_adapters.controllers.alerts_controller import get_alerts
+    from src.interface_adapters.repositories.alert_history_cache import alert_history_cache
+    from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+    from benchmarks.bench_alert_bulk_read import seed
+
+    ensure_schema(engine)
+    seed(engine, rows)
+    user = User(id=1, username="bench", password="x")
+    db = SessionLocal()
+    repo = SQLAlertRepository(db)
+
+    def call(if_none_match=None):
+        return get_alerts(
+            room_id=1, from_seq=None, to_seq=None, if_none_match=if_none_match, user=user, alert_repo=repo
+        )
+
+    def miss():
+        alert_history_cache.clear()
+        return call()
+
+    response = call()
+    etag = response.headers["etag"]
+    report(f"miss: query + serialize + ETag ({rows} alerts)", best_of(miss, number=20), f"{len(response.body)} B")
+    report("hit: cached bytes", best_of(lambda: call(), number=2000))
+    report("hit: If-None-Match -> 304", best_of(lambda: call(etag), number=2000))
+
+    repo.create(Alert(id=None, content="new", user_id=1, room_id=1))
+    response = call(etag)
+    print(f"  after a new alert: {response.status_code}, version {alert_history_cache.version(1)}")
+    print(f"  {alert_history_cache.stats()}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
@@ -0,0 +1,71 @@
+"""Ephemeral events: publish cost and how much coalescing saves.
+
+ROOMS rooms with USERS_PER_ROOM members each send typing indicators and
+ticks of METRICS metrics as fast as the loop allows for SECONDS seconds.
+Counts events in against frames out (one per room per flush) and the
+events those frames carry, for the default flush interval and for 0
+(coalescing within one loop iteration only). Listeners only count, no
+sockets are involved.
+
+Run with: python -m benchmarks.bench_ephemeral_events
+"""
+import asyncio
+import time
+
+from benchmarks._common import report
+
+ROOMS = 200
+USERS_PER_ROOM = 20
+METRICS = 5
+SECONDS = 1.0
+BATCH = 1000
+
+
+async def _run(interval: float):
+    from src.entities.ephemeral_event import EVENT_METRIC, EVENT_TYPING, EphemeralEvent
+    from src.interface_adapters.ephemeral_events import EphemeralEvents
+
+    events = EphemeralEvents(interval)
+    sent = {"frames": 0, "events": 0}
+
+    async def count(room_id, batch):
+        sent["frames"] += 1
+        sent["events"] += len(batch)
+
+    events.add_listener(count)
+    # Pre-built events, so the loop measures publish() only
+    pool = []
+    for room_id in range(ROOMS):
+        for user_id in range(USERS_PER_ROOM):
+            pool.append(EphemeralEvent(EVENT_TYPING, room_id, user_id, {"active": True}))
+            pool.append(EphemeralEvent(
+                EVENT_METRIC, room_id, user_id, {"name": f"m{user_id % METRICS}", "value": 1.0}
+            ))
+    published = 0
+    busy = 0.0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for index in range(BATCH):
+            events.publish(pool[(published + index) % len(pool)])
+        busy += time.perf_counter() - start
+        published += BATCH
+        # Let the scheduled flushes run
+        await asyncio.sleep(0)
+    await asyncio.sleep(interval + 0.05)
+    report(f"publish (avg per event), interval {interval}s", busy / published)
+    print(
+        f"  {published} events in, {sent['frames']} frames out carrying {sent['events']} events "
+        f"({published / max(sent['frames'], 1):.0f} events per frame)"
+    )
+
+
+def main():
+    from src.frameworks_drivers import settings
+
+    asyncio.run(_run(settings.EPHEMERAL_FLUSH_INTERVAL))
+    asyncio.run(_run(0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Inbound frame parsing: precompiled schema against json.loads + hand checks.
+
+The legacy path is the receive loop before the inbound schema: json.loads
+then .get() and isinstance() checks per field, as _submit_alert, _ack
+and _fetch_range did them. Both run on the same frames; the schema path
+also rejects what the legacy one let through (200+ character messages,
+bad severities), which is why the oversized cases are shown separately.
+
+Run with: python -m benchmarks.bench_inbound_frames
+"""
+import json
+
+from benchmarks._common import best_of, report
+
+NUMBER = 20_000
+MAX_FRAME_SIZE = 16_384
+
+
+def _legacy(data: str):
+    """The pre-schema path, kept here for comparison."""
+    try:
+        frame = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    action = frame.get("action")
+    if action == "fetch":
+        from_seq, to_seq = frame.get("from_seq"), frame.get("to_seq")
+        if not isinstance(from_seq, int) or not isinstance(to_seq, int) or not 0 < from_seq <= to_seq:
+            return None
+    elif action in ("ack", "read"):
+        seqs, up_to = frame.get("seqs", []), frame.get("up_to")
+        if (
+            not isinstance(seqs, list) or len(seqs) > 1000
+            or not all(isinstance(seq, int) and not isinstance(seq, bool) for seq in seqs)
+            or (up_to is not None and (not isinstance(up_to, int) or isinstance(up_to, bool)))
+        ):
+            return None
+    else:
+        if not frame.get("message", ""):
+            return None
+        client_msg_id = frame.get("client_msg_id")
+        if not isinstance(client_msg_id, str) or len(client_msg_id) > 64:
+            client_msg_id = None
+        severity = frame.get("severity", "info")
+        if severity not in ("info", "warning", "critical"):
+            severity = "info"
+        ttl = frame.get("ttl")
+        if not isinstance(ttl, int) or isinstance(ttl, bool) or not 0 < ttl <= 30 * 24 * 3600:
+            ttl = None
+    return frame
+
+
+def main():
+    from src.interface_adapters.presenters.inbound_frames import FrameError, parse_room_frame
+
+    def schema(data: str):
+        try:
+            return parse_room_frame(data, MAX_FRAME_SIZE)
+        except FrameError:
+            return None
+
+    cases = [
+        ("alert", json.dumps({
+            "message": "Disk usage above 90% on db-1", "client_msg_id": "3f2a9c1e-0b7d",
+            "severity": "warning", "ttl": 3600
+        })),
+        ("fetch", json.dumps({"action": "fetch", "from_seq": 120, "to_seq": 180})),
+        ("read, 100 seqs", json.dumps({"action": "read", "seqs": list(range(1, 101)), "up_to": 50})),
+        ("typing event", json.dumps({"action": "event", "type": "typing", "data": {"active": True}})),
+        ("invalid json", '{"message": "unterminated'),
+        ("1 MiB message (refused by size)", json.dumps({"message": "x" * (1 << 20)})),
+    ]
+    for name, data in cases:
+        number = NUMBER if len(data) < 10_000 else 50
+        legacy = best_of(lambda: [_legacy(data) for _ in range(number)]) / number
+        compiled = best_of(lambda: [schema(data) for _ in range(number)]) / number
+        report(f"{name}: legacy", legacy, f"{legacy * 1e6:.2f} us")
+        report(f"{name}: schema", compiled, f"{compiled * 1e6:.2f} us  x{legacy / compiled:.1f}")
+
+
+if __name__ == "__main__":
+    main()
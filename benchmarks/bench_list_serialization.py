@@ -0,0 +1,60 @@
+"""List endpoint serialization: precompiled serializer vs response_model path.
+
+Also checks once that both paths produce the same JSON, which is the
+validation the endpoints no longer do per request.
+
+Run with: python -m benchmarks.bench_list_serialization [items]
+"""
+import json
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from benchmarks._common import best_of, report
+
+
+def main(items: int = 10_000):
+    from pydantic import TypeAdapter
+    from src.entities.alert import Alert as AlertEntity
+    from src.interface_adapters.presenters.schemas import Alert as AlertSchema, Room as RoomSchema
+    from src.interface_adapters.presenters.serializers import alerts_to_json, rooms_to_json
+
+    start = datetime(2024, 1, 1)
+    alerts = [
+        AlertEntity(id=i, content=f"alert {i}", user_id=i % 50, room_id=1,
+                    created_at=start + timedelta(seconds=i))
+        for i in range(items)
+    ]
+    users = [SimpleNamespace(id=i, username=f"user{i}") for i in range(20)]
+    rooms = [SimpleNamespace(id=i, name=f"room {i}", users=users, alert_ttl=None) for i in range(items // 10)]
+
+    alert_model = TypeAdapter(List[AlertSchema])
+    room_model = TypeAdapter(List[RoomSchema])
+
+    def old_alerts():
+        # Controller dict copy, then what FastAPI does for response_model:
+        # validate, serialize to JSON-able python, json.dumps
+        data = [
+            {"id": a.id, "content": a.content, "created_at": a.created_at, "user_id": a.user_id}
+            for a in alerts
+        ]
+        validated = alert_model.validate_python(data)
+        return json.dumps(alert_model.dump_python(validated, mode="json")).encode()
+
+    def old_rooms():
+        validated = room_model.validate_python(rooms, from_attributes=True)
+        return json.dumps(room_model.dump_python(validated, mode="json")).encode()
+
+    assert json.loads(old_alerts()) == json.loads(alerts_to_json(alerts))
+    assert json.loads(old_rooms()) == json.loads(rooms_to_json(rooms))
+
+    print(f"{items} alerts / {len(rooms)} rooms x {len(users)} users")
+    report("alerts: dict copy + response_model", best_of(old_alerts))
+    report("alerts: precompiled serializer", best_of(lambda: alerts_to_json(alerts)))
+    report("rooms: from_attributes + response_model", best_of(old_rooms))
+    report("rooms: precompiled serializer", best_of(lambda: rooms_to_json(rooms)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,73 @@
+"""SQL repositories against the in-memory ones, same calls on both.
+
+The memory numbers are the floor the layers above the repositories
+(use cases, serialization, fan-out) are measured against: what is left
+of a request once the database is out of the way.
+
+Run with: python -m benchmarks.bench_memory_repositories [rows]
+"""
+import sys
+
+from benchmarks._common import use_temp_database, best_of, report
+
+
+def main(rows: int = 10_000):
+    use_temp_database()
+    from src.entities.alert import Alert
+    from src.entities.token import Token
+    from src.entities.user import User
+    from src.frameworks_drivers.db.connection import engine, SessionLocal
+    from src.frameworks_drivers.db.schema import ensure_schema
+    from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+    from src.interface_adapters.repositories.token_repository import SQLTokenRepository
+    from src.interface_adapters.repositories.user_repository import SQLUserRepository
+    from src.interface_adapters.repositories.memory_repositories import (
+        MemoryStore,
+        MemoryAlertRepository,
+        MemoryTokenRepository,
+        MemoryUserRepository
+    )
+
+    ensure_schema(engine)
+    db = SessionLocal()
+    store = MemoryStore()
+    backends = {
+        "sql": (SQLUserRepository(db), SQLTokenRepository(db), SQLAlertRepository(db)),
+        "memory": (MemoryUserRepository(store), MemoryTokenRepository(store), MemoryAlertRepository(store))
+    }
+
+    for name, (users, tokens, alerts) in backends.items():
+        user = users.create(User(id=None, username="bench", password="x"))
+        tokens.create(Token(key=f"{name}-key", user_id=user.id))
+        # Room 1 holds `rows` alerts, one room per backend keeps the seqs apart
+        room_id = 1 if name == "sql" else 2
+        for start in range(0, rows, 1_000):
+            alerts.create_many([
+                Alert(id=None, content=f"alert {i}", user_id=user.id, room_id=room_id)
+                for i in range(start, min(start + 1_000, rows))
+            ])
+        last = alerts.get_all(room_id)[-1]
+        batch = [Alert(id=None, content="batch", user_id=user.id, room_id=room_id + 10) for _ in range(100)]
+
+        print(f"{name}:")
+        report("  token -> user", best_of(
+            lambda: users.get_by_id(tokens.get_by_key(f"{name}-key").user_id), number=1_000
+        ))
+        report("  create", best_of(
+            lambda: alerts.create(Alert(id=None, content="one", user_id=user.id, room_id=room_id + 20)),
+            number=200
+        ))
+        report("  create_many (100)", best_of(lambda: alerts.create_many(batch), number=10))
+        report("  get_after (catch-up, last 50)", best_of(
+            lambda: alerts.get_after(room_id, last.id - 50, 100), number=200
+        ))
+        report("  get_range (seq window of 50)", best_of(
+            lambda: alerts.get_range(room_id, rows // 2, rows // 2 + 49, 100), number=200
+        ))
+        report(f"  get_all ({rows} alerts)", best_of(lambda: alerts.get_all(room_id), number=5))
+        report(f"  get_batch ({rows} alerts)", best_of(lambda: alerts.get_batch(room_id), number=5))
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,80 @@
+"""Memory and cost of offline mailboxes for USERS offline users.
+
+Every user belongs to one of ROOMS rooms and ALERTS alerts are posted
+round-robin, so each user gets ALERTS / ROOMS ids, below the capacity.
+A second run posts past the capacity so every mailbox collapses to the
+resync flag. The same ids kept in a list of ints per user are shown for
+comparison.
+
+Run with: python -m benchmarks.bench_offline_mailbox
+"""
+import time
+import tracemalloc
+
+from benchmarks._common import report
+
+USERS = 100_000
+ROOMS = 100
+ALERTS = 4_000
+CAPACITY = 64
+
+
+def _measure(fill) -> tuple:
+    """Time one fill, then measure the memory of another (tracing slows it down)."""
+    start = time.perf_counter()
+    fill()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    kept = fill()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, seconds, current
+
+
+def main():
+    from src.interface_adapters.offline_mailbox import OfflineMailbox
+
+    members = [list(range(room, USERS, ROOMS)) for room in range(ROOMS)]
+    per_user = ALERTS // ROOMS
+
+    def fill_mailbox(alerts: int):
+        def fill():
+            mailbox = OfflineMailbox(CAPACITY)
+            for alert_id in range(alerts):
+                mailbox.store(members[alert_id % ROOMS], (alert_id,))
+            return mailbox
+        return fill
+
+    def fill_lists():
+        boxes = {}
+        for alert_id in range(ALERTS):
+            for user_id in members[alert_id % ROOMS]:
+                boxes.setdefault(user_id, []).append(alert_id)
+        return boxes
+
+    mailbox, seconds, size = _measure(fill_mailbox(ALERTS))
+    report(f"mailbox: {ALERTS} alerts, {per_user} ids/user", seconds,
+           f"{size / USERS:.0f} B/user, {size / 2**20:.1f} MiB")
+    print(f"  {mailbox.stats()}")
+    del mailbox
+
+    boxes, seconds, size = _measure(fill_lists)
+    report(f"list[int]: {ALERTS} alerts, {per_user} ids/user", seconds,
+           f"{size / USERS:.0f} B/user, {size / 2**20:.1f} MiB")
+    del boxes
+
+    overflow = ROOMS * (CAPACITY + 1)
+    mailbox, seconds, size = _measure(fill_mailbox(overflow))
+    report(f"mailbox: {overflow} alerts, all overflowed", seconds,
+           f"{size / USERS:.0f} B/user, {size / 2**20:.1f} MiB")
+    print(f"  {mailbox.stats()}")
+
+    mailbox = fill_mailbox(ALERTS)()
+    start = time.perf_counter()
+    for user_id in range(USERS):
+        mailbox.take(user_id)
+    report("mailbox: take (avg per user)", (time.perf_counter() - start) / USERS)
+
+
+if __name__ == "__main__":
+    main()
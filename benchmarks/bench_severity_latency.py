@@ -0,0 +1,97 @@
+"""Delivery latency per severity under load, with and without priority lanes.
+
+A burst of alerts (mostly info, some warning, a few critical) is broadcast
+to a room of slow fake sockets; latency is broadcast-to-send time per frame.
+
+Run with: python -m benchmarks.bench_severity_latency
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks._common import report
+
+SOCKETS = 200
+ALERTS = 500
+# Simulated per-frame write time of a slow client
+SEND_SECONDS = 0.0002
+
+
+class FakeSocket:
+    """Records when each message was written."""
+
+    def __init__(self, sent_at: Dict[str, Tuple[str, float]], latencies: Dict[str, List[float]]):
+        self.sent_at = sent_at
+        self.latencies = latencies
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+    async def send_text(self, message: str):
+        await asyncio.sleep(SEND_SECONDS)
+        entry = self.sent_at.get(message)
+        if entry is not None:
+            severity, broadcast_at = entry
+            self.latencies[severity].append(time.perf_counter() - broadcast_at)
+
+
+def _severity(i: int) -> str:
+    if i % 50 == 49:
+        return "critical"
+    if i % 10 == 9:
+        return "warning"
+    return "info"
+
+
+async def run(prioritize: bool) -> Dict[str, List[float]]:
+    from src.interface_adapters.controllers.websocket_controller import ConnectionManager
+
+    manager = ConnectionManager(max_pending_messages=ALERTS)
+    sent_at: Dict[str, Tuple[str, float]] = {}
+    latencies: Dict[str, List[float]] = {"info": [], "warning": [], "critical": []}
+    for _ in range(SOCKETS):
+        await manager.connect(FakeSocket(sent_at, latencies), room_id=1)
+
+    for i in range(ALERTS):
+        severity = _severity(i)
+        message = json.dumps({"id": i, "severity": severity, "room_id": 1})
+        sent_at[message] = (severity, time.perf_counter())
+        await manager.broadcast_to_room(
+            1, message, event_id=i, critical=prioritize and severity == "critical"
+        )
+        # Producers arrive over time, not in one synchronous burst
+        if i % 10 == 0:
+            await asyncio.sleep(0)
+
+    total = SOCKETS * ALERTS
+    while sum(len(v) for v in latencies.values()) < total:
+        await asyncio.sleep(0.01)
+    for websocket in list(manager.active_connections):
+        manager.disconnect(websocket)
+    return latencies
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    for prioritize in (False, True):
+        label = "priority lanes" if prioritize else "single FIFO"
+        latencies = asyncio.run(run(prioritize))
+        for severity in ("critical", "warning", "info"):
+            values = latencies[severity]
+            report(
+                f"{severity:<8} p50 ({label})",
+                _percentile(values, 0.5),
+                f"p99 {_percentile(values, 0.99) * 1000:.1f} ms, n={len(values)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Cold-start benchmark: import time of main.py and lifespan startup.
+
+Run with: python -m benchmarks.bench_startup
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks._common import ROOT, use_temp_database, report
+
+
+def import_time(repeat: int = 5) -> float:
+    """Best wall time to import main in a fresh interpreter."""
+    code = (
+        "import time; t = time.perf_counter(); import main; "
+        "print(time.perf_counter() - t)"
+    )
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=os.environ,
+            capture_output=True, text=True, check=True
+        )
+        runs.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+async def lifespan_time(app) -> float:
+    """Wall time of the application lifespan startup."""
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    use_temp_database()
+    report("import main (fresh interpreter)", import_time())
+
+    from main import app
+    from src.frameworks_drivers.db.connection import engine
+    from src.frameworks_drivers.db.orm_models import Base
+    from src.frameworks_drivers.db.schema import ensure_schema
+
+    report("lifespan startup (empty db, creates schema)", asyncio.run(lifespan_time(app)))
+    report("lifespan startup (schema up to date)", asyncio.run(lifespan_time(app)))
+
+    start = time.perf_counter()
+    ensure_schema(engine)
+    report("ensure_schema() (schema up to date)", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    report("previous import-time create_all()", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
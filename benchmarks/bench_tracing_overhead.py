@@ -0,0 +1,66 @@
+"""Tracing overhead: decorated calls with sampling off, and fully sampled.
+
+Run with: python -m benchmarks.bench_tracing_overhead
+"""
+from benchmarks._common import use_temp_database, best_of, report
+
+
+def main():
+    use_temp_database()
+
+    from src.frameworks_drivers.db.connection import SessionLocal, engine
+    from src.frameworks_drivers.db.orm_models import Base, UserORM, RoomORM
+    from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+    from src.interface_adapters.tracing import tracer, InMemorySpanExporter
+    from src.use_cases.alerts.get_alerts import GetAlertsUseCase
+    from src.use_cases.alerts.create_alerts_batch import CreateAlertsBatchUseCase
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(UserORM(id=1, username="bench", password="x"))
+    db.add(RoomORM(id=1, name="bench"))
+    db.commit()
+    repo = SQLAlertRepository(db)
+    CreateAlertsBatchUseCase(repo).execute([f"alert {i}" for i in range(100)], 1, 1)
+
+    use_case = GetAlertsUseCase(repo)
+    raw_get_all = SQLAlertRepository.get_all.__wrapped__
+    number = 2000
+
+    # Undecorated baseline: the repository's wrapped function called directly
+    def undecorated():
+        repo.get_all = lambda room_id: raw_get_all(repo, room_id)
+        try:
+            use_case.execute(1)
+        finally:
+            del repo.get_all
+
+    baseline = best_of(undecorated, number=number)
+    report("get_alerts x100 (undecorated)", baseline)
+
+    tracer.configure(0.0)
+    off = best_of(lambda: use_case.execute(1), number=number)
+    report("get_alerts x100 (tracing off)", off, f"{(off / baseline - 1) * 100:+.2f}%")
+
+    exporter = InMemorySpanExporter()
+    tracer.configure(1.0, exporter)
+
+    def sampled():
+        with tracer.start_trace("bench"):
+            use_case.execute(1)
+
+    on = best_of(sampled, number=number)
+    report("get_alerts x100 (every call sampled)", on, f"{(on / baseline - 1) * 100:+.2f}%")
+
+    @tracer.traced("noop")
+    def noop():
+        return None
+
+    tracer.configure(0.0)
+    per_call = best_of(noop, number=200000)
+    report("decorated no-op call (tracing off)", per_call, f"{per_call * 1e9:.0f} ns/call")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
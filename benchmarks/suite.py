@@ -0,0 +1,326 @@
+"""Micro-benchmark suite for the hot paths, checked against stored baselines.
+
+Runs offline on a temporary SQLite database. Each case reports its best
+per-call time; a case slower than its baseline by more than the threshold
+is flagged and the run exits with status 1.
+
+Run with:
+    python -m benchmarks.suite                   # compare with baseline.json
+    python -m benchmarks.suite --update          # record a new baseline
+    python -m benchmarks.suite -k broadcast      # only matching cases
+    python -m benchmarks.suite --threshold 0.1   # flag regressions > 10%
+
+Baselines are only comparable on the machine that recorded them: record
+one locally before touching these modules, then compare after.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks._common import ROOT, use_temp_database, best_of
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Minimum wall time of one timing round; fast cases are looped up to it
+ROUND_SECONDS = 0.05
+
+# (name, factory): a factory does the setup and returns the timed callable
+CASES: List[Tuple[str, Callable[["Fixture"], Callable[[], object]]]] = []
+
+
+def case(name: str):
+    """Register a benchmark case."""
+    def register(factory):
+        CASES.append((name, factory))
+        return factory
+    return register
+
+
+class Fixture:
+    """Database, user, room and token shared by the cases."""
+
+    def __init__(self):
+        from src.frameworks_drivers.db.connection import SessionLocal, engine
+        from src.frameworks_drivers.db.orm_models import Base, RoomORM
+        from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+        from src.interface_adapters.repositories.token_repository import SQLTokenRepository
+        from src.interface_adapters.repositories.user_repository import SQLUserRepository
+        from src.use_cases.auth.login import LoginUseCase
+        from src.use_cases.auth.register import RegisterUseCase
+
+        Base.metadata.create_all(bind=engine)
+        self.db = SessionLocal()
+        self.db.add_all([RoomORM(id=1, name="bench"), RoomORM(id=2, name="filler")])
+        self.db.commit()
+        self.users = SQLUserRepository(self.db)
+        self.tokens = SQLTokenRepository(self.db)
+        self.alerts = SQLAlertRepository(self.db)
+        self.password = "bench-password"
+        RegisterUseCase(self.users).execute("bench", self.password)
+        self.user = self.users.get_by_username("bench")
+        self.token = LoginUseCase(self.users, self.tokens).execute("bench", self.password)
+        self.rows = 0
+        # Teardown callbacks registered by the cases
+        self.cleanups: List[Callable[[], None]] = []
+        # Room 1 always holds 100 alerts; the table grows through room 2
+        self.fill_alerts(100, room_id=1)
+
+    def fill_alerts(self, rows: int, room_id: int = 2):
+        """Grow the alerts table to `rows` rows in total."""
+        from src.entities.alert import Alert
+
+        while self.rows < rows:
+            chunk = min(1000, rows - self.rows)
+            self.alerts.create_many([
+                Alert(id=None, content=f"alert {self.rows + i}", user_id=self.user.id, room_id=room_id)
+                for i in range(chunk)
+            ])
+            self.rows += chunk
+
+
+class FakeSocket:
+    """Accepts and counts frames; signals once `expected` frames arrived."""
+
+    def __init__(self, counter: Dict[str, object]):
+        self.counter = counter
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+    async def send_text(self, message: str):
+        counter = self.counter
+        counter["received"] += 1
+        if counter["received"] >= counter["expected"]:
+            counter["done"].set()
+
+
+def _broadcast_case(sockets: int):
+    def factory(fixture: Fixture) -> Callable[[], object]:
+        from src.interface_adapters.controllers.websocket_controller import ConnectionManager
+
+        loop = asyncio.new_event_loop()
+        manager = ConnectionManager()
+        counter: Dict[str, object] = {"received": 0, "expected": sockets, "done": None}
+
+        async def connect():
+            for _ in range(sockets):
+                await manager.connect(FakeSocket(counter), room_id=1)
+
+        async def broadcast_once():
+            counter["received"] = 0
+            counter["done"] = asyncio.Event()
+            await manager.broadcast_to_room(1, '{"id": 1, "content": "bench"}', event_id=1)
+            await counter["done"].wait()
+
+        async def disconnect():
+            for websocket in list(manager.active_connections):
+                manager.disconnect(websocket)
+            await asyncio.sleep(0)
+
+        def teardown():
+            loop.run_until_complete(disconnect())
+            loop.close()
+
+        loop.run_until_complete(connect())
+        fixture.cleanups.append(teardown)
+        return lambda: loop.run_until_complete(broadcast_once())
+    return factory
+
+
+for _sockets in (100, 1000):
+    case(f"broadcast_to_room[sockets={_sockets}] (until delivered)")(_broadcast_case(_sockets))
+
+
+def _sample_alerts(count: int):
+    from src.entities.alert import Alert
+
+    start = datetime(2024, 1, 1)
+    return [
+        Alert(id=i, content=f"alert {i}", user_id=i % 50, room_id=1,
+              created_at=start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+@case("serialize alert_message")
+def _serialize_one(fixture: Fixture):
+    from src.interface_adapters.presenters.serializers import alert_message
+
+    alert = _sample_alerts(1)[0]
+    return lambda: alert_message(alert)
+
+
+@case("serialize alerts_to_json[1000]")
+def _serialize_list(fixture: Fixture):
+    from src.interface_adapters.presenters.serializers import alerts_to_json
+
+    alerts = _sample_alerts(1000)
+    return lambda: alerts_to_json(alerts)
+
+
+@case("serialize alerts_message[100]")
+def _serialize_coalesced(fixture: Fixture):
+    from src.interface_adapters.presenters.serializers import alerts_message
+
+    alerts = _sample_alerts(100)
+    return lambda: alerts_message(1, alerts)
+
+
+def _repo_cases(rows: int):
+    def create(fixture: Fixture) -> Callable[[], object]:
+        from src.entities.alert import Alert
+
+        fixture.fill_alerts(rows)
+        return lambda: fixture.alerts.create(
+            Alert(id=None, content="bench", user_id=fixture.user.id, room_id=2)
+        )
+
+    def get_all(fixture: Fixture) -> Callable[[], object]:
+        fixture.fill_alerts(rows)
+        return lambda: fixture.alerts.get_all(room_id=1)
+
+    case(f"SQLAlertRepository.create[table={rows}]")(create)
+    case(f"SQLAlertRepository.get_all[table={rows}, room=100]")(get_all)
+
+
+for _rows in (1_000, 50_000):
+    _repo_cases(_rows)
+
+
+@case("dependencies._resolve_token (cache hit)")
+def _token_hit(fixture: Fixture):
+    from src.frameworks_drivers.http.dependencies import _resolve_token
+
+    _resolve_token(fixture.token, fixture.db)
+    return lambda: _resolve_token(fixture.token, fixture.db)
+
+
+@case("dependencies._resolve_token (cache miss)")
+def _token_miss(fixture: Fixture):
+    from src.frameworks_drivers.http.dependencies import _resolve_token
+    from src.interface_adapters.repositories.lookup_cache import lookup_cache
+
+    def resolve():
+        lookup_cache.invalidate_token(fixture.token)
+        return _resolve_token(fixture.token, fixture.db)
+    return resolve
+
+
+@case("dependencies.authorize_websocket (cache miss)")
+def _authorize_miss(fixture: Fixture):
+    from src.frameworks_drivers.http.dependencies import authorize_websocket
+    from src.interface_adapters.repositories.lookup_cache import lookup_cache
+
+    def authorize():
+        lookup_cache.clear()
+        return authorize_websocket(f"Token_{fixture.token}", 1)
+    return authorize
+
+
+@case("LoginUseCase.execute (valid password)")
+def _login(fixture: Fixture):
+    from src.use_cases.auth.login import LoginUseCase
+
+    use_case = LoginUseCase(fixture.users, fixture.tokens)
+    return lambda: use_case.execute("bench", fixture.password)
+
+
+@case("LoginUseCase.execute (unknown user)")
+def _login_unknown(fixture: Fixture):
+    from src.use_cases.auth.login import LoginUseCase
+
+    use_case = LoginUseCase(fixture.users, fixture.tokens)
+    return lambda: use_case.execute("nobody", fixture.password)
+
+
+def _calibrate(fn: Callable[[], object]) -> int:
+    """Calls per round so one round lasts about ROUND_SECONDS."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return max(1, min(100_000, int(ROUND_SECONDS / max(elapsed, 1e-9))))
+
+
+def run(pattern: str = "") -> Dict[str, float]:
+    """Run the matching cases, in registration order."""
+    fixture = Fixture()
+    results = {}
+    for name, factory in CASES:
+        if pattern and pattern not in name:
+            continue
+        fn = factory(fixture)
+        results[name] = best_of(fn, repeat=5, number=_calibrate(fn))
+    for cleanup in fixture.cleanups:
+        cleanup()
+    fixture.db.close()
+    return results
+
+
+def _machine() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine()
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.getenv("BENCH_THRESHOLD", DEFAULT_THRESHOLD)),
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    use_temp_database()
+    results = run(args.pattern)
+
+    baseline: Dict[str, float] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored.get("results", {})
+        if stored.get("machine") != _machine() and not args.update:
+            print("warning: baseline was recorded on a different machine/interpreter")
+
+    regressions = 0
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            status = "new"
+        else:
+            change = seconds / base - 1
+            status = f"{change * 100:+7.1f}%"
+            if change > args.threshold:
+                status += "  REGRESSION"
+                regressions += 1
+        print(f"{name:<56} {seconds * 1e6:>12.1f} us  {status}")
+
+    if args.update:
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": _machine(), "results": merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {os.path.relpath(args.baseline, ROOT)}")
+        return 0
+
+    if regressions:
+        print(f"{regressions} case(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,3 +4,8 @@ from src.frameworks_drivers.http.app import app
 # This is the main entry point for uvicorn
 # venv/bin/activate
 # Run with: uvicorn main:app --reload
+# or with the launcher: python main.py --profile latency (see --help)
+
+if __name__ == "__main__":
+    from src.frameworks_drivers.launcher import main
+    main()
@@ -6,10 +6,7 @@ from typing import List, Optional
 
 import models
 import schemas
-from database import SessionLocal, engine
-
-# Crear tablas en la BD (para propósitos de este ejemplo)
-models.Base.metadata.create_all(bind=engine)
+from database import SessionLocal
 
 router = APIRouter()
 
@@ -1,8 +1,20 @@
 """Alert entity - Core business model."""
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
+# Alert severities, lowest priority first. Critical alerts are delivered
+# ahead of everything else and never dropped for slow consumers
+SEVERITY_INFO = "info"
+SEVERITY_WARNING = "warning"
+SEVERITY_CRITICAL = "critical"
+SEVERITIES = (SEVERITY_INFO, SEVERITY_WARNING, SEVERITY_CRITICAL)
+
+
+def utcnow() -> datetime:
+    """Naive UTC now, the format created_at and expires_at are kept in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 @dataclass
 class Alert:
@@ -12,3 +24,10 @@ class Alert:
     user_id: int
     room_id: int
     created_at: Optional[datetime] = None
+    # Position in the room, 1, 2, 3... without gaps at allocation time
+    seq: Optional[int] = None
+    # Client-chosen id used to drop resent frames after a reconnect
+    client_msg_id: Optional[str] = None
+    severity: str = SEVERITY_INFO
+    # Naive UTC instant after which the alert is gone (None = kept forever)
+    expires_at: Optional[datetime] = None
@@ -0,0 +1,89 @@
+"""Alert batch entity - Columnar representation for bulk reads."""
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional, Tuple
+from src.entities.alert import SEVERITIES
+
+# Code of each severity in severity_codes (its index in SEVERITIES)
+SEVERITY_CODES = {severity: code for code, severity in enumerate(SEVERITIES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def epoch_micros(value: datetime) -> int:
+    """Microseconds since the Unix epoch of a naive UTC datetime."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+@dataclass
+class AlertBatch:
+    """
+    Columnar batch of alerts.
+
+    One typed array per numeric column and all contents in a single UTF-8
+    buffer, so a 100k-row read allocates a handful of objects instead of
+    one ORM object, one entity and one dict per row.
+    """
+    room_id: Optional[int] = None
+    ids: array = field(default_factory=lambda: array("q"))
+    # 0 where the author is unknown (alerts.user_id is nullable)
+    user_ids: array = field(default_factory=lambda: array("q"))
+    # Microseconds since the Unix epoch (UTC)
+    created_at: array = field(default_factory=lambda: array("q"))
+    # contents[i] == content[offsets[i]:offsets[i + 1]].decode()
+    content: bytearray = field(default_factory=bytearray)
+    offsets: array = field(default_factory=lambda: array("q", [0]))
+    # Index into SEVERITIES
+    severity_codes: array = field(default_factory=lambda: array("b"))
+    # Per-room sequence numbers (0 where unknown)
+    seqs: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(
+        self,
+        alert_id: int,
+        user_id: int,
+        created_at: int,
+        content: str,
+        severity_code: int = 0,
+        seq: int = 0
+    ):
+        """Append one row."""
+        self.ids.append(alert_id)
+        self.user_ids.append(user_id)
+        self.created_at.append(created_at)
+        self.content += content.encode("utf-8")
+        self.offsets.append(len(self.content))
+        self.severity_codes.append(severity_code)
+        self.seqs.append(seq)
+
+    def content_at(self, index: int) -> str:
+        """Decode the content of one row."""
+        return self.content[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def contents(self) -> Iterator[str]:
+        """Decode every content in order."""
+        buffer, offsets = self.content, self.offsets
+        for i in range(len(self.ids)):
+            yield buffer[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+    def severities(self) -> Iterator[str]:
+        """Severity name of every row in order."""
+        for code in self.severity_codes:
+            yield SEVERITIES[code]
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[int, int, int, str, int, int]],
+        room_id: Optional[int] = None
+    ) -> "AlertBatch":
+        """Build a batch from (id, user_id, created_at_us, content, severity_code, seq) rows."""
+        batch = cls(room_id=room_id)
+        for alert_id, user_id, created_at, content, severity_code, seq in rows:
+            batch.append(alert_id, user_id, created_at, content, severity_code, seq)
+        return batch
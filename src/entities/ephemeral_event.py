@@ -0,0 +1,29 @@
+"""Ephemeral event entity - Disposable room signal that is never stored."""
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+# Event types. Typing indicators coalesce per user, metric ticks per
+# metric name: within one flush only the latest value of a key is sent
+EVENT_TYPING = "typing"
+EVENT_METRIC = "metric"
+EVENT_TYPES = (EVENT_TYPING, EVENT_METRIC)
+
+# Longest metric name accepted
+MAX_METRIC_NAME_LENGTH = 64
+
+
+@dataclass(frozen=True)
+class EphemeralEvent:
+    """Typing indicator or metric tick sent by a user to a room."""
+    type: str
+    room_id: int
+    user_id: int
+    data: Dict[str, Any]
+
+    @property
+    def key(self) -> Tuple[str, Any]:
+        """Coalescing key within the room: a newer event with the same key replaces this one."""
+        if self.type == EVENT_METRIC:
+            return (EVENT_METRIC, self.data["name"])
+        return (self.type, self.user_id)
+
@@ -0,0 +1,52 @@
+"""Read state entity - Seqs of a room acknowledged by one user."""
+from dataclasses import dataclass, field
+from src.entities.seq_bitmap import SeqBitmap
+
+# Acknowledgement kinds: the client received the alert / the user saw it.
+# Reading implies delivery
+ACK_DELIVERED = "delivered"
+ACK_READ = "read"
+ACK_KINDS = (ACK_DELIVERED, ACK_READ)
+
+
+@dataclass
+class ReadState:
+    """
+    Every seq up to `floor` plus the seqs in `above`.
+
+    Clients mostly acknowledge in order, so the floor absorbs nearly
+    everything and the bitmap only holds the out-of-order acks.
+    """
+    floor: int = 0
+    above: SeqBitmap = field(default_factory=SeqBitmap)
+
+    def __contains__(self, seq: int) -> bool:
+        return seq <= self.floor or seq in self.above
+
+    def __len__(self) -> int:
+        return self.floor + len(self.above)
+
+    def add(self, seq: int) -> bool:
+        """Acknowledge one seq. Returns False if it already was."""
+        if seq <= self.floor:
+            return False
+        if seq != self.floor + 1:
+            return self.above.add(seq)
+        self.floor = seq
+        self._absorb()
+        return True
+
+    def add_up_to(self, seq: int) -> bool:
+        """Acknowledge every seq up to `seq`. Returns False if nothing changed."""
+        if seq <= self.floor:
+            return False
+        self.floor = seq
+        self.above.discard_below(seq + 1)
+        self._absorb()
+        return True
+
+    def _absorb(self):
+        """Move the seqs right above the floor into it."""
+        above = self.above
+        while above.discard(self.floor + 1):
+            self.floor += 1
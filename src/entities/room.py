@@ -9,3 +9,5 @@ class Room:
     id: Optional[int]
     name: str
     user_ids: List[int] = field(default_factory=list)
+    # Default TTL in seconds for alerts posted without one (None = no expiry)
+    alert_ttl: Optional[int] = None
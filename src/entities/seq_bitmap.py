@@ -0,0 +1,196 @@
+"""Seq bitmap entity - Roaring-style compressed set of small non-negative ints."""
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Union
+
+# A chunk holding more values than this switches from a sorted array of
+# 16-bit values (2 bytes each) to a 65536-bit bitmap (8 KiB); a bitmap
+# chunk falls back to an array below half of it
+ARRAY_MAX = 4096
+_BITMAP_BYTES = 1 << 13
+_CHUNK_HEADER = struct.Struct("<HBI")
+_KIND_ARRAY = 0
+_KIND_BITMAP = 1
+
+Chunk = Union[array, bytearray]
+
+
+def _bitmap_values(bits: bytearray) -> array:
+    """Set positions of a bitmap chunk, in order."""
+    values = array("H")
+    for index, byte in enumerate(bits):
+        if byte:
+            base = index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    values.append(base | bit)
+    return values
+
+
+class SeqBitmap:
+    """
+    Set of ints in [0, 2**32), e.g. alert seqs or user ids.
+
+    Values are split by their high 16 bits into chunks, as in roaring
+    bitmaps: a sparse chunk is a sorted array("H") (2 bytes per value), a
+    dense one a 65536-bit bitmap, so no chunk takes more than 8 KiB and
+    membership is a dict lookup plus a bisect or a bit test. Size is
+    tracked on every change, so len() is O(1).
+    """
+
+    __slots__ = ("_chunks", "_counts", "_size")
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._chunks: Dict[int, Chunk] = {}
+        # Cardinality of bitmap chunks (array chunks use len())
+        self._counts: Dict[int, int] = {}
+        self._size = 0
+        for value in values:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, value: int) -> bool:
+        chunk = self._chunks.get(value >> 16)
+        if chunk is None:
+            return False
+        low = value & 0xFFFF
+        if type(chunk) is bytearray:
+            return bool(chunk[low >> 3] >> (low & 7) & 1)
+        index = bisect_left(chunk, low)
+        return index < len(chunk) and chunk[index] == low
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._chunks):
+            chunk = self._chunks[high]
+            base = high << 16
+            for low in _bitmap_values(chunk) if type(chunk) is bytearray else chunk:
+                yield base | low
+
+    def add(self, value: int) -> bool:
+        """Add a value. Returns False if it was already there."""
+        high, low = value >> 16, value & 0xFFFF
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            self._chunks[high] = array("H", (low,))
+        elif type(chunk) is bytearray:
+            byte, bit = low >> 3, 1 << (low & 7)
+            if chunk[byte] & bit:
+                return False
+            chunk[byte] |= bit
+            self._counts[high] += 1
+        else:
+            index = bisect_left(chunk, low)
+            if index < len(chunk) and chunk[index] == low:
+                return False
+            if len(chunk) < ARRAY_MAX:
+                chunk.insert(index, low)
+            else:
+                bits = bytearray(_BITMAP_BYTES)
+                for existing in chunk:
+                    bits[existing >> 3] |= 1 << (existing & 7)
+                bits[low >> 3] |= 1 << (low & 7)
+                self._chunks[high] = bits
+                self._counts[high] = len(chunk) + 1
+        self._size += 1
+        return True
+
+    def discard(self, value: int) -> bool:
+        """Remove a value. Returns False if it was not there."""
+        high, low = value >> 16, value & 0xFFFF
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            return False
+        if type(chunk) is bytearray:
+            byte, bit = low >> 3, 1 << (low & 7)
+            if not chunk[byte] & bit:
+                return False
+            chunk[byte] &= ~bit
+            self._counts[high] -= 1
+            if self._counts[high] < ARRAY_MAX // 2:
+                self._chunks[high] = _bitmap_values(chunk)
+                del self._counts[high]
+        else:
+            index = bisect_left(chunk, low)
+            if index == len(chunk) or chunk[index] != low:
+                return False
+            del chunk[index]
+            if not chunk:
+                del self._chunks[high]
+        self._size -= 1
+        return True
+
+    def discard_below(self, value: int) -> int:
+        """Remove every value lower than `value`. Returns how many were removed."""
+        removed = 0
+        boundary = value >> 16
+        for high in [high for high in self._chunks if high <= boundary]:
+            if high < boundary:
+                chunk = self._chunks.pop(high)
+                removed += self._counts.pop(high, None) or len(chunk)
+                continue
+            low = value & 0xFFFF
+            chunk = self._chunks[high]
+            if type(chunk) is bytearray:
+                byte, shift = low >> 3, low & 7
+                below = (
+                    bin(int.from_bytes(chunk[:byte], "little")).count("1")
+                    + bin(chunk[byte] & ((1 << shift) - 1)).count("1")
+                )
+                chunk[:byte] = bytes(byte)
+                chunk[byte] &= (0xFF << shift) & 0xFF
+                removed += below
+                self._counts[high] -= below
+                if self._counts[high] < ARRAY_MAX // 2:
+                    chunk = self._chunks[high] = _bitmap_values(chunk)
+                    del self._counts[high]
+            else:
+                index = bisect_left(chunk, low)
+                del chunk[:index]
+                removed += index
+            if type(chunk) is array and not chunk:
+                del self._chunks[high]
+        self._size -= removed
+        return removed
+
+    def to_bytes(self) -> bytes:
+        """Compact little-endian encoding: per chunk (high, kind, count) then its payload."""
+        parts = []
+        for high in sorted(self._chunks):
+            chunk = self._chunks[high]
+            if type(chunk) is bytearray:
+                parts.append(_CHUNK_HEADER.pack(high, _KIND_BITMAP, self._counts[high]))
+                parts.append(bytes(chunk))
+            else:
+                parts.append(_CHUNK_HEADER.pack(high, _KIND_ARRAY, len(chunk)))
+                if sys.byteorder == "big":
+                    chunk = array("H", chunk)
+                    chunk.byteswap()
+                parts.append(chunk.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SeqBitmap":
+        """Decode the output of to_bytes()."""
+        bitmap = cls()
+        offset = 0
+        view = memoryview(data)
+        while offset < len(data):
+            high, kind, count = _CHUNK_HEADER.unpack_from(data, offset)
+            offset += _CHUNK_HEADER.size
+            if kind == _KIND_BITMAP:
+                bitmap._chunks[high] = bytearray(view[offset:offset + _BITMAP_BYTES])
+                bitmap._counts[high] = count
+                offset += _BITMAP_BYTES
+            else:
+                chunk = array("H")
+                chunk.frombytes(view[offset:offset + 2 * count])
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                bitmap._chunks[high] = chunk
+                offset += 2 * count
+            bitmap._size += count
+        return bitmap
@@ -1,13 +1,82 @@
 """Database connection and configuration."""
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import Delete, Insert, Update, create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from src.frameworks_drivers import settings
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+
+def _sqlite_file(url: str) -> Optional[str]:
+    """Path of a file-based SQLite database, None for anything else."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.database
+
+
+_db_file = _sqlite_file(SQLALCHEMY_DATABASE_URL)
+SPLIT_READ_WRITE = settings.DB_SPLIT_READ_WRITE and _db_file is not None
+
+if SPLIT_READ_WRITE:
+    # Single writer connection: mutations are serialized in the pool
+    # instead of fighting over SQLite's write lock. A checkout can wait
+    # up to DB_WRITE_TIMEOUT, so writes must run in the threadpool
+    # (sync endpoints, run_in_threadpool), never on the event loop
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_WRITE_TIMEOUT
+    )
+    # Read-only pool; under WAL readers never wait for the writer's commit
+    read_engine = create_engine(
+        f"sqlite:///file:{_db_file}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_writer(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_WRITE_TIMEOUT * 1000)}")
+        cursor.close()
+
+    @event.listens_for(read_engine, "connect")
+    def _configure_reader(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_WRITE_TIMEOUT * 1000)}")
+        cursor.close()
+else:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    )
+    read_engine = engine
+
+
+class RoutingSession(Session):
+    """
+    Session that routes reads to the reader pool and writes to the writer.
+
+    Flushes and INSERT/UPDATE/DELETE statements (create, update, delete
+    repository methods) go to the writer; queries (get_all, get_by_id,
+    token lookups...) go to the read-only pool.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return engine
+        return read_engine
+
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
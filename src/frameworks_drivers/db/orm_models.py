@@ -1,5 +1,5 @@
 """SQLAlchemy ORM models."""
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.frameworks_drivers.db.connection import Base
@@ -8,7 +8,9 @@ import secrets
 # Tabla intermedia para la relación ManyToMany entre Room y User
 room_users = Table('room_users', Base.metadata,
     Column('room_id', Integer, ForeignKey('rooms.id')),
-    Column('user_id', Integer, ForeignKey('users.id'))
+    Column('user_id', Integer, ForeignKey('users.id')),
+    # One row per membership, even with concurrent adds
+    Index("uq_room_users_room_user", "room_id", "user_id", unique=True)
 )
 
 
@@ -32,21 +34,60 @@ class AlertORM(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     room_id = Column(Integer, ForeignKey("rooms.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    client_msg_id = Column(String(64), nullable=True)
+    # Per-room sequence number, allocated in memory (room_sequences)
+    seq = Column(Integer, nullable=True)
+    severity = Column(String(16), nullable=False, default="info", server_default="info")
+    # Naive UTC, NULL for alerts that never expire
+    expires_at = Column(DateTime, nullable=True)
     
     user = relationship("UserORM", back_populates="alerts")
     room = relationship("RoomORM", back_populates="alerts")
 
+    __table_args__ = (
+        # NULLs never collide, so only frames carrying an id are deduplicated
+        Index("uq_alerts_user_client_msg", "user_id", "client_msg_id", unique=True),
+        # Startup reload of pending expiries reads only the expiring rows
+        Index("ix_alerts_expires_at", "expires_at"),
+        # Seq range reads; also catches two workers allocating the same seq
+        Index("uq_alerts_room_seq", "room_id", "seq", unique=True),
+    )
+
 
 class RoomORM(Base):
     """SQLAlchemy ORM model for Room."""
     __tablename__ = "rooms"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(60), unique=True)
+    # Default alert TTL in seconds, NULL = alerts never expire
+    alert_ttl = Column(Integer, nullable=True)
     
     alerts = relationship("AlertORM", back_populates="room")
     users = relationship("UserORM", secondary=room_users, back_populates="rooms_joined")
 
 
+class AckStateORM(Base):
+    """SQLAlchemy ORM model for the seqs of a room a user acknowledged."""
+    __tablename__ = "ack_states"
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # "delivered" or "read"
+    kind = Column(String(16), primary_key=True)
+    # Every seq up to floor, plus the SeqBitmap encoded in above
+    floor = Column(Integer, nullable=False, default=0)
+    above = Column(LargeBinary, nullable=False, default=b"")
+
+
+class AlertAckORM(Base):
+    """SQLAlchemy ORM model for the users that acknowledged a critical alert."""
+    __tablename__ = "alert_acks"
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    kind = Column(String(16), primary_key=True)
+    # SeqBitmap of user ids
+    users = Column(LargeBinary, nullable=False, default=b"")
+
+
 class TokenORM(Base):
     """SQLAlchemy ORM model for Token."""
     __tablename__ = "tokens"
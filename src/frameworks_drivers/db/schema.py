@@ -0,0 +1,110 @@
+"""Schema version check - replaces create_all() on every start."""
+from typing import Callable, List, Tuple
+from sqlalchemy.engine import Connection, Engine
+from src.frameworks_drivers.db.orm_models import Base
+
+# Bump when orm_models changes and register a migration below
+# (6: ack_states and alert_acks, new tables only; 7: unique memberships)
+SCHEMA_VERSION = 7
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str):
+    """Add a column unless create_all() just created the table with it."""
+    columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _migrate_v2(conn: Connection):
+    """Alert client_msg_id for idempotent submission."""
+    _add_column(conn, "alerts", "client_msg_id", "VARCHAR(64)")
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_alerts_user_client_msg "
+        "ON alerts (user_id, client_msg_id)"
+    )
+
+
+def _migrate_v3(conn: Connection):
+    """Alert severity for priority-aware delivery."""
+    _add_column(conn, "alerts", "severity", "VARCHAR(16) NOT NULL DEFAULT 'info'")
+
+
+def _migrate_v4(conn: Connection):
+    """Alert expiry and per-room default alert TTL."""
+    _add_column(conn, "alerts", "expires_at", "DATETIME")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_alerts_expires_at ON alerts (expires_at)"
+    )
+    _add_column(conn, "rooms", "alert_ttl", "INTEGER")
+
+
+def _migrate_v5(conn: Connection):
+    """Per-room alert seq, numbered by id for existing alerts."""
+    _add_column(conn, "alerts", "seq", "INTEGER")
+    conn.exec_driver_sql(
+        "UPDATE alerts SET seq = numbered.seq FROM ("
+        "SELECT id, ROW_NUMBER() OVER (PARTITION BY room_id ORDER BY id) AS seq "
+        "FROM alerts) AS numbered WHERE alerts.id = numbered.id"
+    )
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_alerts_room_seq ON alerts (room_id, seq)"
+    )
+
+
+def _migrate_v7(conn: Connection):
+    """Unique (room_id, user_id) memberships, duplicates left by racing adds removed."""
+    conn.exec_driver_sql(
+        "DELETE FROM room_users WHERE rowid NOT IN ("
+        "SELECT MIN(rowid) FROM room_users GROUP BY room_id, user_id)"
+    )
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_room_users_room_user ON room_users (room_id, user_id)"
+    )
+
+
+# (version, migration) pairs applied in order to databases below `version`.
+# create_all() already builds missing tables, migrations only have to
+# upgrade tables that existed before (new columns, indexes...).
+MIGRATIONS: List[Tuple[int, Callable[[Connection], None]]] = [
+    (2, _migrate_v2),
+    (3, _migrate_v3),
+    (4, _migrate_v4),
+    (5, _migrate_v5),
+    (7, _migrate_v7),
+]
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Read the schema version stored in the SQLite header."""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def ensure_schema(engine: Engine) -> bool:
+    """
+    Create or upgrade the schema only when the stored version is behind.
+
+    Up to date databases cost a single PRAGMA instead of reflecting
+    every table.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        True if the schema was created or upgraded
+    """
+    if engine.dialect.name != "sqlite":
+        # No version header to check, fall back to checkfirst create_all
+        Base.metadata.create_all(bind=engine)
+        return True
+
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        if version >= SCHEMA_VERSION:
+            return False
+
+        Base.metadata.create_all(bind=conn)
+        for target, migrate in MIGRATIONS:
+            if version < target:
+                migrate(conn)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
@@ -1,26 +1,121 @@
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Depends
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from src.interface_adapters.controllers import (
     auth_controller, 
     alerts_controller, 
     rooms_controller,
-    websocket_controller
+    websocket_controller,
+    events_controller,
+    admin_controller
 )
-from src.frameworks_drivers.db.connection import engine
-from src.frameworks_drivers.db.orm_models import Base
+from src.frameworks_drivers import settings
+from src.frameworks_drivers.db.connection import engine, SessionLocal
+from src.frameworks_drivers.db.schema import ensure_schema
 from src.frameworks_drivers.http.dependencies import (
-    get_user_by_token_query,
-    get_room_repository,
-    get_alert_repository
+    authorize_websocket,
+    authorize_websocket_user,
+    room_exists,
+    room_alert_ttl,
+    room_last_seq,
+    room_members,
+    alert_repository_scope,
+    MEMORY_BACKEND,
+    MEMORY_ROOMS
 )
-from src.entities.user import User
+from src.interface_adapters.alert_expiry import alert_expiry
+from src.interface_adapters.ephemeral_events import ephemeral_events
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.interface_adapters.room_catalog import room_catalog
+from src.interface_adapters.room_router import room_router
+from src.interface_adapters.tracing import tracer, FileSpanExporter
+from src.use_cases.alerts.expire_alerts import ExpireAlertsUseCase
+
+
+def _delete_expired(alert_ids):
+    """Delete one batch of expired alerts on a short-lived session."""
+    with alert_repository_scope() as alert_repo:
+        return ExpireAlertsUseCase(alert_repo).execute(alert_ids)
+
+
+def _flush_ack_states():
+    """Write changed acknowledgement state on a short-lived session."""
+    db = SessionLocal()
+    try:
+        return ack_states.flush(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: check schema version, warm caches, load acknowledgement state
+    and schedule pending alert expiries. Nothing runs at import.
+    Shutdown: drain whatever sockets and streams are still open, then
+    write the acknowledgement state left.
+    
+    With the memory backend the database is never opened and
+    acknowledgement state is kept in memory only.
+    """
+    if not MEMORY_BACKEND:
+        ensure_schema(engine)
+        if settings.WARM_UP_CACHES:
+            db = SessionLocal()
+            try:
+                lookup_cache.warm_up(db)
+                room_sequences.warm_up(db)
+            finally:
+                db.close()
+        db = SessionLocal()
+        try:
+            ack_states.load(db)
+        finally:
+            db.close()
+        # Memory rooms start over at seq 1: their stored acks are stale
+        for room_id in MEMORY_ROOMS:
+            ack_states.forget_room(room_id)
+        ack_states.start(flush=_flush_ack_states, interval=settings.ACK_FLUSH_INTERVAL)
+    room_catalog.bind(asyncio.get_running_loop())
+    with alert_repository_scope() as alert_repo:
+        alert_expiry.load(ExpireAlertsUseCase(alert_repo).pending())
+    alert_expiry.start(delete_batch=_delete_expired)
+    if settings.TRACE_SAMPLE_RATE > 0:
+        tracer.configure(settings.TRACE_SAMPLE_RATE, FileSpanExporter(settings.TRACE_EXPORT_PATH))
+    yield
+    await websocket_controller.manager.start_drain(
+        waves=settings.DRAIN_WAVES,
+        wave_interval=settings.DRAIN_WAVE_INTERVAL,
+        max_delay=settings.DRAIN_MAX_RECONNECT_DELAY
+    )
+    ephemeral_events.clear()
+    await alert_expiry.stop()
+    await ack_states.stop()
+    tracer.shutdown()
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware starting a sampled trace per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        with tracer.start_trace("http.request", method=scope["method"], path=scope["path"]):
+            await self.app(scope, receive, send)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -35,41 +130,99 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware)
+
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """Build the Jinja2 environment on first use, only the chat page needs it."""
+    from fastapi.templating import Jinja2Templates
+    return Jinja2Templates(directory="templates/")
 
-# Setup templates
-templates = Jinja2Templates(directory="templates/")
 
 # Include routers with /api prefix
 app.include_router(auth_controller.router, prefix="/api")
 app.include_router(alerts_controller.router, prefix="/api")
 app.include_router(rooms_controller.router, prefix="/api")
+app.include_router(events_controller.router, prefix="/api")
+app.include_router(admin_controller.router, prefix="/api")
 
 
 @app.get('/')
 def form(request: Request):
     """Render WebSocket chat page."""
-    return templates.TemplateResponse(request=request, name='ws/chat.html')
+    return get_templates().TemplateResponse(request=request, name='ws/chat.html')
 
 
 @app.websocket("/ws/alert/room/{room_id}")
 async def websocket_endpoint(
     websocket: WebSocket, 
     room_id: int, 
-    user: User = Depends(get_user_by_token_query),
-    room_repo=Depends(get_room_repository),
-    alert_repo=Depends(get_alert_repository)
+    token: str,
+    last_alert_id: Optional[int] = None
 ):
     """
     WebSocket endpoint refactored to Clean Architecture.
-    Delegates logic to the interface adapter.
+    Delegates logic to the interface adapter. Reconnecting clients pass
+    `last_alert_id` to receive what they missed. In a cluster, rooms
+    owned by another node get a {"redirect": url} frame instead.
     """
+    if not room_router.is_local(room_id):
+        await websocket_controller.redirect_handler(
+            websocket, room_router.redirect_url(room_id, websocket.url), room_id
+        )
+        return
+    with tracer.start_trace("ws.handshake", room_id=room_id):
+        user = await run_in_threadpool(authorize_websocket, token, room_id)
     await websocket_controller.websocket_handler(
         websocket=websocket,
         room_id=room_id,
         user=user,
-        room_repo=room_repo,
-        alert_repo=alert_repo
+        alert_scope=alert_repository_scope,
+        last_alert_id=last_alert_id,
+        room_alert_ttl=room_alert_ttl,
+        room_last_seq=room_last_seq,
+        room_members=room_members
+    )
+
+
+@app.websocket("/ws/alert/multiplex")
+async def websocket_multiplex_endpoint(
+    websocket: WebSocket,
+    token: str
+):
+    """One authenticated WebSocket subscribed to many rooms."""
+    with tracer.start_trace("ws.handshake"):
+        user = await run_in_threadpool(authorize_websocket_user, token)
+    await websocket_controller.multiplex_handler(
+        websocket=websocket,
+        user=user,
+        room_exists=room_exists,
+        alert_scope=alert_repository_scope,
+        room_alert_ttl=room_alert_ttl,
+        room_last_seq=room_last_seq,
+        room_members=room_members
     )
+
+
+
+@app.websocket("/ws/rooms/catalog")
+async def websocket_catalog_endpoint(
+    websocket: WebSocket,
+    token: str,
+    epoch: Optional[str] = None,
+    version: Optional[int] = None
+):
+    """Room catalog events (created, renamed, deleted, membership)."""
+    with tracer.start_trace("ws.handshake"):
+        user = await run_in_threadpool(authorize_websocket_user, token)
+    await websocket_controller.catalog_handler(
+        websocket=websocket,
+        user=user,
+        epoch=epoch,
+        version=version
+    )
+
         
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -1,14 +1,56 @@
 """HTTP layer dependencies - Dependency injection for controllers."""
-from typing import Optional
+import json
+import secrets
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
 from fastapi import Depends, HTTPException, status, Header
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from src.frameworks_drivers import settings
 from src.frameworks_drivers.db.connection import SessionLocal
-from src.frameworks_drivers.db.orm_models import TokenORM
+from src.frameworks_drivers.db.orm_models import AlertORM, TokenORM, UserORM, RoomORM, room_users
 from src.entities.user import User
+from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
 from src.interface_adapters.repositories.user_repository import SQLUserRepository
 from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
 from src.interface_adapters.repositories.room_repository import SQLRoomRepository
 from src.interface_adapters.repositories.token_repository import SQLTokenRepository
+from src.interface_adapters.repositories.memory_repositories import (
+    memory_store,
+    MemoryAlertRepository,
+    MemoryRoomRepository,
+    MemoryTokenRepository,
+    MemoryUserRepository,
+    RoomRoutedAlertRepository
+)
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.interface_adapters.room_catalog import room_catalog, ROOM_DELETED
+from src.interface_adapters.tracing import tracer
+
+# Every repository in process memory (no database is touched)
+MEMORY_BACKEND = settings.REPOSITORY_BACKEND == "memory"
+# Rooms whose alerts are kept in memory next to the database
+MEMORY_ROOMS = frozenset(int(room_id) for room_id in settings.MEMORY_ROOMS.split(",") if room_id.strip())
+
+
+def is_memory_room(room_id: int) -> bool:
+    """Whether a room's alerts live in memory."""
+    return MEMORY_BACKEND or room_id in MEMORY_ROOMS
+
+
+def _forget_deleted_memory_room(message: str):
+    """Drop the in-memory alerts of a deleted MEMORY_ROOMS room (catalog listener)."""
+    event = json.loads(message)
+    if event["catalog"] == ROOM_DELETED and event["room_id"] in MEMORY_ROOMS:
+        memory_store.forget_room(event["room_id"])
+
+
+# The SQL room repository knows nothing of memory rooms; their alerts go
+# with the room when its deletion reaches the catalog (with the memory
+# backend MemoryRoomRepository.delete drops them itself)
+if MEMORY_ROOMS and not MEMORY_BACKEND:
+    room_catalog.add_listener(_forget_deleted_memory_room)
 
 
 def get_db():
@@ -22,24 +64,49 @@ def get_db():
 
 def get_user_repository(db: Session = Depends(get_db)):
     """Get user repository instance."""
+    if MEMORY_BACKEND:
+        return MemoryUserRepository(memory_store)
     return SQLUserRepository(db)
 
 
 def get_alert_repository(db: Session = Depends(get_db)):
     """Get alert repository instance."""
-    return SQLAlertRepository(db)
+    return _alert_repository(db)
 
 
 def get_room_repository(db: Session = Depends(get_db)):
     """Get room repository instance."""
+    if MEMORY_BACKEND:
+        return MemoryRoomRepository(memory_store)
     return SQLRoomRepository(db)
 
 
 def get_token_repository(db: Session = Depends(get_db)):
     """Get token repository instance."""
+    if MEMORY_BACKEND:
+        return MemoryTokenRepository(memory_store)
     return SQLTokenRepository(db)
 
 
+@contextmanager
+def alert_repository_scope() -> Iterator[AlertRepositoryInterface]:
+    """Short-lived alert repository for long-lived streams (no pinned session)."""
+    db = SessionLocal()
+    try:
+        yield _alert_repository(db)
+    finally:
+        db.close()
+
+
+def _alert_repository(db: Session) -> AlertRepositoryInterface:
+    """Alert repository of the configured backend (sessions open lazily)."""
+    if MEMORY_BACKEND:
+        return MemoryAlertRepository(memory_store)
+    if MEMORY_ROOMS:
+        return RoomRoutedAlertRepository(SQLAlertRepository(db), MemoryAlertRepository(memory_store), MEMORY_ROOMS)
+    return SQLAlertRepository(db)
+
+
 def get_current_user(
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
@@ -76,20 +143,14 @@ def get_current_user(
         )
     
     # Validate token
-    token_orm = db.query(TokenORM).filter(TokenORM.key == key).first()
-    if not token_orm:
+    user = _resolve_token(key, db)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
     
-    # Return user entity
-    user_orm = token_orm.user
-    return User(
-        id=user_orm.id,
-        username=user_orm.username,
-        password=user_orm.password
-    )
+    return user
 
 
 def get_user_by_token_query(
@@ -105,17 +166,236 @@ def get_user_by_token_query(
         )
     
     _, key = token.split("_")
-    token_orm = db.query(TokenORM).filter(TokenORM.key == key).first()
+    user = _resolve_token(key, db)
     
-    if not token_orm:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid token"
         )
     
+    return user
+
+
+@tracer.traced("auth.resolve_token")
+def _resolve_token(key: str, db: Session) -> Optional[User]:
+    """Resolve a token key to its user, lookup cache first."""
+    user = lookup_cache.get_user(key)
+    if user:
+        return user
+
+    if MEMORY_BACKEND:
+        token = MemoryTokenRepository(memory_store).get_by_key(key)
+        user = MemoryUserRepository(memory_store).get_by_id(token.user_id) if token else None
+        if user:
+            lookup_cache.put_token(key, user)
+        return user
+
+    token_orm = db.query(TokenORM).filter(TokenORM.key == key).first()
+    if not token_orm:
+        return None
+
     user_orm = token_orm.user
-    return User(
+    user = User(
         id=user_orm.id,
         username=user_orm.username,
         password=user_orm.password
     )
+    lookup_cache.put_token(key, user)
+    return user
+
+
+@tracer.traced("auth.authorize_websocket")
+def authorize_websocket(token: str, room_id: int) -> Optional[User]:
+    """
+    Fast WebSocket handshake check: token and room together.
+    
+    Served from the lookup cache when warm, otherwise with a single query
+    on a short-lived session, so no session is pinned for the handshake.
+    
+    Args:
+        token: Token query parameter (format: "Token_<key>")
+        room_id: Requested room ID
+        
+    Returns:
+        The user if both token and room are valid, None otherwise
+    """
+    if "_" not in token:
+        return None
+    _, key = token.split("_", 1)
+    
+    user = lookup_cache.get_user(key)
+    if user and lookup_cache.has_room(room_id):
+        return user
+    
+    if MEMORY_BACKEND:
+        user = _resolve_token(key, None)
+        return user if user and room_exists(room_id) else None
+    
+    room_name = select(RoomORM.name).where(RoomORM.id == room_id).scalar_subquery()
+    db = SessionLocal()
+    try:
+        row = db.query(
+            UserORM.id, UserORM.username, UserORM.password, room_name
+        ).join(TokenORM, TokenORM.user_id == UserORM.id).filter(
+            TokenORM.key == key
+        ).first()
+    finally:
+        db.close()
+    
+    if not row:
+        return None
+    user_id, username, password, name = row
+    user = User(id=user_id, username=username, password=password)
+    lookup_cache.put_token(key, user)
+    if name is None:
+        return None
+    lookup_cache.put_room(room_id, name)
+    return user
+
+
+def authorize_websocket_user(token: str) -> Optional[User]:
+    """
+    WebSocket handshake check for connections not bound to one room.
+    
+    Args:
+        token: Token query parameter (format: "Token_<key>")
+        
+    Returns:
+        The user if the token is valid, None otherwise
+    """
+    if "_" not in token:
+        return None
+    _, key = token.split("_", 1)
+    
+    db = SessionLocal()
+    try:
+        return _resolve_token(key, db)
+    finally:
+        db.close()
+
+
+@tracer.traced("auth.room_exists")
+def room_exists(room_id: int) -> bool:
+    """Check a room from the lookup cache, one primary-key query on a miss."""
+    if lookup_cache.has_room(room_id):
+        return True
+    
+    if MEMORY_BACKEND:
+        room = MemoryRoomRepository(memory_store).get_by_id(room_id)
+        name = room.name if room else None
+    else:
+        db = SessionLocal()
+        try:
+            name = db.query(RoomORM.name).filter(RoomORM.id == room_id).scalar()
+        finally:
+            db.close()
+    
+    if name is None:
+        return False
+    lookup_cache.put_room(room_id, name)
+    return True
+
+
+def room_alert_ttl(room_id: int) -> Optional[int]:
+    """Default alert TTL of a room, lookup cache first (None = no expiry)."""
+    if room_id in lookup_cache.room_ttls:
+        return lookup_cache.room_ttls[room_id]
+    
+    if MEMORY_BACKEND:
+        room = MemoryRoomRepository(memory_store).get_by_id(room_id)
+        alert_ttl = room.alert_ttl if room else None
+    else:
+        db = SessionLocal()
+        try:
+            alert_ttl = db.query(RoomORM.alert_ttl).filter(RoomORM.id == room_id).scalar()
+        finally:
+            db.close()
+    
+    lookup_cache.put_room_ttl(room_id, alert_ttl)
+    return alert_ttl
+
+
+def room_members(room_id: int) -> Sequence[int]:
+    """User ids of a room's members, lookup cache first, one query on a miss."""
+    members = lookup_cache.room_members.get(room_id)
+    if members is not None:
+        return members
+    
+    if MEMORY_BACKEND:
+        room = MemoryRoomRepository(memory_store).get_by_id(room_id)
+        user_ids = room.user_ids if room else []
+    else:
+        db = SessionLocal()
+        try:
+            user_ids = db.execute(
+                select(room_users.c.user_id).where(room_users.c.room_id == room_id)
+            ).scalars().all()
+        finally:
+            db.close()
+    
+    lookup_cache.put_room_members(room_id, user_ids)
+    return lookup_cache.room_members[room_id]
+
+
+def room_last_seq(room_id: int) -> int:
+    """Last seq allocated in a room, seeding its counter from the table on a miss."""
+    last = room_sequences.last(room_id)
+    if last is not None:
+        return last
+    
+    if is_memory_room(room_id):
+        last = memory_store.max_seq(room_id)
+    else:
+        db = SessionLocal()
+        try:
+            last = db.query(func.max(AlertORM.seq)).filter(AlertORM.room_id == room_id).scalar() or 0
+        finally:
+            db.close()
+    
+    room_sequences.reseed(room_id, last)
+    return last
+
+
+def get_stream_user(
+    token: Optional[str] = None,
+    authorization: Optional[str] = Header(None)
+) -> User:
+    """
+    Authentication for event streams.
+    
+    EventSource cannot set headers, so the token may also come as a query
+    parameter. Uses a short-lived session so none stays pinned while the
+    stream is open.
+    
+    Raises:
+        HTTPException: If authentication fails
+    """
+    raw = token or authorization
+    if not raw:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Credentials missing"
+        )
+    
+    user = authorize_websocket_user(raw.replace(" ", "_", 1))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    return user
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Guard for operational endpoints.
+    
+    Raises:
+        HTTPException: 404 if ADMIN_TOKEN is not configured, 403 if the
+            X-Admin-Token header does not match it
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
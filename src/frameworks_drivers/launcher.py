@@ -0,0 +1,271 @@
+"""Launcher - Runs the app under uvicorn with one consistent set of server knobs.
+
+Usage: python main.py [--profile latency|throughput|dev] [--workers auto|N] ...
+(python main.py --help lists every option, --print-config prints the
+effective configuration and exits).
+
+A profile sets the WebSocket limits (max message size, ping interval,
+per-message deflate, receive queue), the listen backlog, keep-alive and
+access logging; command line options override it. uvloop and httptools
+are used when installed.
+
+Rooms live in one process (sockets, seq counters, ring buffers,
+mailboxes), so plain uvicorn workers sharing a port would split a room's
+subscribers. Every profile runs one process; --workers auto|N opts into
+N processes on consecutive ports, started as the nodes of a local
+cluster: rooms are spread over them by consistent hashing and clients
+reaching the wrong one are redirected (see CLUSTER_NODES). Redirects
+carry --public-host, which is required when binding a wildcard address.
+With CLUSTER_NODES already set, this process is one node of that
+cluster and runs alone.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import signal
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+from src.frameworks_drivers import settings
+
+# Environment variable carrying the uvicorn options of a worker process
+_WORKER_OPTIONS = "LAUNCHER_WORKER_OPTIONS"
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Alerts out as soon as possible: no compression work per frame,
+    # dead peers noticed within seconds, short inbound queues
+    "latency": {
+        "workers": 1,
+        "ws_per_message_deflate": False,
+        "ws_ping_interval": 10.0,
+        "ws_ping_timeout": 10.0,
+        "ws_max_queue": 16,
+        "backlog": 2048,
+        "timeout_keep_alive": 5,
+        "access_log": False
+    },
+    # Many subscribers and big fan-outs: compressed frames, patient with
+    # slow peers, deeper accept queue for reconnect storms
+    "throughput": {
+        "workers": 1,
+        "ws_per_message_deflate": True,
+        "ws_ping_interval": 30.0,
+        "ws_ping_timeout": 30.0,
+        "ws_max_queue": 64,
+        "backlog": 8192,
+        "timeout_keep_alive": 30,
+        "access_log": False
+    },
+    # One process with auto-reload and the access log
+    "dev": {
+        "workers": 1,
+        "reload": True,
+        "ws_per_message_deflate": True,
+        "ws_ping_interval": 20.0,
+        "ws_ping_timeout": 20.0,
+        "ws_max_queue": 32,
+        "backlog": 2048,
+        "timeout_keep_alive": 5,
+        "access_log": True
+    }
+}
+
+
+def usable_cores() -> int:
+    """CPUs this process may run on (honours affinity masks and cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python main.py", description="Run the alerts server.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=settings.SERVER_PROFILE)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--public-host",
+        default=settings.SERVER_PUBLIC_HOST,
+        help="host clients use in redirects between workers (default: --host, "
+             "required with --workers > 1 on 0.0.0.0 or ::)"
+    )
+    parser.add_argument(
+        "--workers",
+        default=settings.SERVER_WORKERS or None,
+        help="auto (one per core) or a number, more than one starts a local cluster (default: 1)"
+    )
+    parser.add_argument("--ws-max-size", type=int, help="largest WebSocket message in bytes")
+    parser.add_argument("--ws-ping-interval", type=float)
+    parser.add_argument("--ws-ping-timeout", type=float)
+    parser.add_argument("--ws-per-message-deflate", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--ws-max-queue", type=int)
+    parser.add_argument("--backlog", type=int)
+    parser.add_argument("--timeout-keep-alive", type=int)
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--reload", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--print-config", action="store_true", help="print the effective configuration and exit")
+    return parser
+
+
+def build_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Resolve the profile, the options given and the environment into uvicorn options.
+
+    Returns:
+        Options for uvicorn.run() plus "profile", "workers", "nodes" and
+        "notes" (why a value differs from what was asked)
+        
+    Raises:
+        ValueError: Several workers on a wildcard host without --public-host
+    """
+    config = dict(PROFILES[args.profile])
+    for option in (
+        "ws_max_size", "ws_ping_interval", "ws_ping_timeout", "ws_per_message_deflate",
+        "ws_max_queue", "backlog", "timeout_keep_alive", "access_log", "reload"
+    ):
+        value = getattr(args, option)
+        if value is not None:
+            config[option] = value
+    if args.workers is not None:
+        config["workers"] = args.workers
+    notes: List[str] = []
+
+    # Every frame the app can answer with a typed error must get through
+    # the protocol layer: WS_MAX_FRAME_SIZE characters, up to 4 bytes each
+    config.setdefault("ws_max_size", 4 * settings.WS_MAX_FRAME_SIZE)
+    config["loop"] = "uvloop" if _installed("uvloop") else "asyncio"
+    config["http"] = "httptools" if _installed("httptools") else "h11"
+    config["ws"] = "websockets" if _installed("websockets") else "wsproto"
+    for module, option in (("uvloop", "loop"), ("httptools", "http")):
+        if config[option] != module:
+            notes.append(f"{module} not installed, {option}={config[option]}")
+
+    workers = config["workers"]
+    workers = usable_cores() if workers == "auto" else int(workers)
+    if settings.CLUSTER_NODES and workers > 1:
+        notes.append("CLUSTER_NODES is set: this process is one node, workers=1")
+        workers = 1
+    if settings.REPOSITORY_BACKEND == "memory" and workers > 1:
+        notes.append("memory repositories are per process, workers=1")
+        workers = 1
+    if config.get("reload") and workers > 1:
+        notes.append("reload runs a single process, workers=1")
+        workers = 1
+    config["workers"] = max(1, workers)
+
+    public_host = args.public_host or args.host
+    if config["workers"] > 1 and public_host in ("0.0.0.0", "::"):
+        # Clients elsewhere could not follow a redirect to a guessed host
+        raise ValueError(
+            f"--public-host is required with --workers {config['workers']} on {args.host}"
+        )
+    config["nodes"] = [
+        f"http://{public_host}:{args.port + index}" for index in range(config["workers"])
+    ] if config["workers"] > 1 else []
+    config.update(profile=args.profile, host=args.host, port=args.port, notes=notes)
+    return config
+
+
+def format_config(config: Dict[str, Any]) -> str:
+    """Human readable effective configuration, one option per line."""
+    lines = ["Effective server configuration:"]
+    for key in (
+        "profile", "host", "port", "workers", "loop", "http", "ws", "ws_max_size",
+        "ws_ping_interval", "ws_ping_timeout", "ws_per_message_deflate", "ws_max_queue",
+        "backlog", "timeout_keep_alive", "access_log", "reload"
+    ):
+        lines.append(f"  {key:<24} {config.get(key, False)}")
+    lines.append(f"  {'usable_cores':<24} {usable_cores()}")
+    lines.append(f"  {'ws_max_frame_size (app)':<24} {settings.WS_MAX_FRAME_SIZE}")
+    if config["nodes"]:
+        lines.append(f"  {'nodes':<24} {', '.join(config['nodes'])}")
+    elif settings.CLUSTER_NODES:
+        lines.append(f"  {'cluster node':<24} {settings.CLUSTER_NODE} of {settings.CLUSTER_NODES}")
+    for note in config["notes"]:
+        lines.append(f"  note: {note}")
+    return "\n".join(lines)
+
+
+def _uvicorn_options(config: Dict[str, Any], port: int) -> Dict[str, Any]:
+    options = {
+        key: config[key]
+        for key in (
+            "host", "loop", "http", "ws", "ws_max_size", "ws_ping_interval", "ws_ping_timeout",
+            "ws_per_message_deflate", "ws_max_queue", "backlog", "timeout_keep_alive", "access_log"
+        )
+    }
+    options["port"] = port
+    if config.get("reload"):
+        options["reload"] = True
+    return options
+
+
+def _serve(options: Dict[str, Any]):
+    import uvicorn
+    uvicorn.run("main:app", **options)
+
+
+def _run_workers(config: Dict[str, Any]) -> int:
+    """Start one process per node and wait; stopping one stops them all."""
+    from src.frameworks_drivers.db.connection import engine
+    from src.frameworks_drivers.db.schema import ensure_schema
+
+    # Once here, so the workers do not race to create a fresh database
+    ensure_schema(engine)
+    engine.dispose()
+    nodes = config["nodes"]
+    processes = []
+    for index, node in enumerate(nodes):
+        env = dict(os.environ)
+        env["CLUSTER_NODES"] = ",".join(nodes)
+        env["CLUSTER_NODE"] = node
+        env[_WORKER_OPTIONS] = json.dumps(_uvicorn_options(config, config["port"] + index))
+        processes.append(subprocess.Popen([sys.executable, "-m", "src.frameworks_drivers.launcher"], env=env))
+
+    def stop(*_):
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    exit_code = 0
+    try:
+        # The first worker to exit brings the others down
+        while all(process.poll() is None for process in processes):
+            try:
+                processes[0].wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+        for process in processes:
+            exit_code = exit_code or process.wait()
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point of python main.py."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        config = build_config(args)
+    except ValueError as e:
+        parser.error(str(e))
+    print(format_config(config), flush=True)
+    if args.print_config:
+        return
+    if config["nodes"]:
+        sys.exit(_run_workers(config))
+    _serve(_uvicorn_options(config, config["port"]))
+
+
+if __name__ == "__main__":
+    # Worker process started by _run_workers()
+    _serve(json.loads(os.environ[_WORKER_OPTIONS]))
@@ -0,0 +1,98 @@
+"""Runtime settings read from environment variables."""
+import os
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+
+# Repositories: "sql" (the database above) or "memory" (every table in
+# process memory, nothing durable: benchmarking baseline, throwaway
+# deployments). With "sql", the alerts of the MEMORY_ROOMS rooms (comma
+# separated ids: real-time feeds without history to keep) live in
+# memory, at most MEMORY_ROOM_MAX_ALERTS per room (0 = unbounded)
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "sql")
+MEMORY_ROOMS = os.getenv("MEMORY_ROOMS", "")
+MEMORY_ROOM_MAX_ALERTS = int(os.getenv("MEMORY_ROOM_MAX_ALERTS", "10000"))
+
+# Startup
+# Preload rooms (with their members) and tokens into the lookup cache
+# during lifespan startup. Offline mailboxes and ack queries read room
+# members from it
+WARM_UP_CACHES = os.getenv("WARM_UP_CACHES", "1") == "1"
+# Seconds a cached token stays valid; bounds how long a logout done on
+# another worker can go unnoticed by this one
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+
+# WebSocket admission control (0 = unlimited)
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "10000"))
+WS_MAX_CONNECTIONS_PER_ROOM = int(os.getenv("WS_MAX_CONNECTIONS_PER_ROOM", "2000"))
+# Non-critical messages queued per connection before the oldest are shed
+WS_MAX_PENDING_MESSAGES = int(os.getenv("WS_MAX_PENDING_MESSAGES", "1000"))
+if WS_MAX_PENDING_MESSAGES < 1:
+    raise ValueError("WS_MAX_PENDING_MESSAGES must be at least 1")
+# Longest inbound text frame (characters) parsed; longer ones are refused
+# with a "frame too large" error. The ASGI server's own limit (uvicorn
+# --ws-max-size, 16 MiB by default, 4x this under the launcher) still
+# bounds what gets buffered
+WS_MAX_FRAME_SIZE = int(os.getenv("WS_MAX_FRAME_SIZE", "16384"))
+
+# Read/write split for file-based SQLite: one serialized writer
+# connection and a pool of read-only WAL readers
+DB_SPLIT_READ_WRITE = os.getenv("DB_SPLIT_READ_WRITE", "1") == "1"
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+# Seconds a write waits for the writer connection / the SQLite lock
+DB_WRITE_TIMEOUT = float(os.getenv("DB_WRITE_TIMEOUT", "30"))
+
+# Tracing: fraction of handshakes/frames traced (0 = off) and the file
+# spans are exported to in OTLP/JSON
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+
+# Graceful drain (admin call or lifespan shutdown): sockets are closed in
+# DRAIN_WAVES waves DRAIN_WAVE_INTERVAL seconds apart, each told to
+# reconnect after a random delay of up to DRAIN_MAX_RECONNECT_DELAY seconds
+DRAIN_WAVES = int(os.getenv("DRAIN_WAVES", "10"))
+DRAIN_WAVE_INTERVAL = float(os.getenv("DRAIN_WAVE_INTERVAL", "0.5"))
+DRAIN_MAX_RECONNECT_DELAY = float(os.getenv("DRAIN_MAX_RECONNECT_DELAY", "30"))
+
+# Cluster: base URLs of every node (comma separated) and of this node.
+# Rooms are placed on nodes by consistent hashing; empty = single node
+CLUSTER_NODES = os.getenv("CLUSTER_NODES", "")
+CLUSTER_NODE = os.getenv("CLUSTER_NODE", "")
+CLUSTER_VNODES = int(os.getenv("CLUSTER_VNODES", "64"))
+# Recent alert frames kept per room for catch-up and handed off with it
+WS_ROOM_RING_SIZE = int(os.getenv("WS_ROOM_RING_SIZE", "256"))
+
+# Alert ids queued per offline room member (4 bytes each); past that the
+# mailbox collapses to a "resync" flag. 0 disables mailboxes
+WS_MAILBOX_SIZE = int(os.getenv("WS_MAILBOX_SIZE", "64"))
+
+# Seconds between writes of changed delivery/read acknowledgement state
+ACK_FLUSH_INTERVAL = float(os.getenv("ACK_FLUSH_INTERVAL", "10"))
+
+# Ephemeral events (typing, metric ticks): seconds they are coalesced per
+# room before the fan-out, and the per-connection token bucket
+# (events per second, burst; rate 0 = unlimited)
+EPHEMERAL_FLUSH_INTERVAL = float(os.getenv("EPHEMERAL_FLUSH_INTERVAL", "0.1"))
+EPHEMERAL_RATE = float(os.getenv("EPHEMERAL_RATE", "20"))
+EPHEMERAL_BURST = int(os.getenv("EPHEMERAL_BURST", "40"))
+
+# GET /api/alerts responses cached per room until its next alert, expiry
+# or deletion (0 bytes disables). Writes from other processes are not
+# seen, so an entry is rebuilt after ALERT_CACHE_MAX_AGE seconds anyway
+ALERT_CACHE_MAX_BYTES = int(os.getenv("ALERT_CACHE_MAX_BYTES", str(64 << 20)))
+ALERT_CACHE_MAX_AGE = float(os.getenv("ALERT_CACHE_MAX_AGE", "60"))
+
+# Longest alert TTL (seconds) accepted per alert or as a room default
+ALERT_MAX_TTL = int(os.getenv("ALERT_MAX_TTL", str(30 * 24 * 3600)))
+
+# Launcher (python main.py): server profile (latency, throughput, dev),
+# bind address, host used in redirects between worker processes, and
+# worker count ("auto" = one per usable core; empty = the profile's)
+SERVER_PROFILE = os.getenv("SERVER_PROFILE", "latency")
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_PUBLIC_HOST = os.getenv("SERVER_PUBLIC_HOST", "")
+SERVER_WORKERS = os.getenv("SERVER_WORKERS", "")
+
+# Shared secret for /api/admin endpoints (X-Admin-Token); empty disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
@@ -0,0 +1,183 @@
+"""Alert expiry - Hierarchical timer wheel driving alert TTLs.
+
+Alerts with an `expires_at` are scheduled in memory when they are created
+(and loaded once at startup), so expiry never scans the alerts table. Once
+a second the wheel hands back what expired: listeners get one expiry event
+per room and the rows are deleted in batches by id.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+
+# (alert_id, room_id)
+ExpiryItem = Tuple[int, int]
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel with 1 second ticks.
+
+    LEVELS wheels of 64 slots each: level 0 covers the next 64 s, level 1
+    the next 64^2 s and so on (about 194 days with 4 levels; later deadlines
+    wait in an overflow list). Adding is O(1); an entry is cascaded to a
+    finer wheel at most once per level, instead of every tick checking
+    every pending deadline.
+    """
+
+    BITS = 6
+    SLOTS = 1 << BITS
+    LEVELS = 4
+
+    def __init__(self, now_tick: int):
+        self.current = now_tick
+        self._wheels: List[List[List[Tuple[int, object]]]] = [
+            [[] for _ in range(self.SLOTS)] for _ in range(self.LEVELS)
+        ]
+        self._overflow: List[Tuple[int, object]] = []
+        self.pending = 0
+
+    def add(self, deadline: int, item: object):
+        """Schedule `item` for tick `deadline` (past deadlines fire on the next tick)."""
+        self.pending += 1
+        self._place(max(deadline, self.current + 1), item)
+
+    def _place(self, deadline: int, item: object):
+        delta = deadline - self.current
+        for level in range(self.LEVELS):
+            if delta < 1 << (self.BITS * (level + 1)):
+                slot = (deadline >> (self.BITS * level)) & (self.SLOTS - 1)
+                self._wheels[level][slot].append((deadline, item))
+                return
+        self._overflow.append((deadline, item))
+
+    def advance(self, now_tick: int) -> List[object]:
+        """Move the wheel up to `now_tick` and return the items that expired."""
+        expired = []
+        mask = self.SLOTS - 1
+        while self.current < now_tick:
+            self.current += 1
+            tick = self.current
+            # On a level boundary, pour the matching coarse slot into the
+            # finer wheels, highest level first
+            for level in range(self.LEVELS - 1, 0, -1):
+                if tick & ((1 << (self.BITS * level)) - 1):
+                    continue
+                if level == self.LEVELS - 1 and self._overflow:
+                    overflow, self._overflow = self._overflow, []
+                    for deadline, item in overflow:
+                        self._place(deadline, item)
+                slot = (tick >> (self.BITS * level)) & mask
+                bucket = self._wheels[level][slot]
+                if bucket:
+                    self._wheels[level][slot] = []
+                    for deadline, item in bucket:
+                        self._place(deadline, item)
+            bucket = self._wheels[0][tick & mask]
+            if bucket:
+                self._wheels[0][tick & mask] = []
+                for _, item in bucket:
+                    expired.append(item)
+        self.pending -= len(expired)
+        return expired
+
+
+def _to_tick(expires_at: datetime) -> int:
+    """Epoch second of a naive-UTC (or aware) datetime, rounded up."""
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    timestamp = expires_at.timestamp()
+    tick = int(timestamp)
+    return tick if tick == timestamp else tick + 1
+
+
+class AlertExpiry:
+    """Schedules alert expiries and emits/deletes them as they fire."""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self._wheel = TimerWheel(int(time.time()))
+        # schedule() runs on request threads, advance() on the loop
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int, List[int]], object]] = []
+        self._delete_batch: Optional[Callable[[List[int]], int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of scheduled expiries."""
+        return self._wheel.pending
+
+    def add_listener(self, listener: Callable[[int, List[int]], object]):
+        """Register an async callback(room_id, alert_ids) for expiry events."""
+        self._listeners.append(listener)
+
+    def schedule(self, alert_id: int, room_id: int, expires_at: Optional[datetime]):
+        """Schedule one alert; no-op without expires_at."""
+        if expires_at is None:
+            return
+        with self._lock:
+            self._wheel.add(_to_tick(expires_at), (alert_id, room_id))
+
+    def load(self, rows: Iterable[Tuple[int, int, datetime]]) -> int:
+        """Schedule (alert_id, room_id, expires_at) rows, e.g. at startup."""
+        count = 0
+        with self._lock:
+            for alert_id, room_id, expires_at in rows:
+                self._wheel.add(_to_tick(expires_at), (alert_id, room_id))
+                count += 1
+        return count
+
+    def start(self, delete_batch: Callable[[List[int]], int]):
+        """Start ticking; `delete_batch(ids)` deletes rows (run in a thread)."""
+        self._delete_batch = delete_batch
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop ticking."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def expire_due(self, now: Optional[float] = None) -> List[ExpiryItem]:
+        """Advance the wheel to `now` and return the expired (alert_id, room_id)."""
+        with self._lock:
+            return self._wheel.advance(int(now if now is not None else time.time()))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(1.0)
+            expired = self.expire_due()
+            if not expired:
+                continue
+            try:
+                await self._emit(expired)
+                await self._delete(expired)
+            except Exception as e:
+                print(f"Alert expiry error: {e}")
+
+    async def _emit(self, expired: List[ExpiryItem]):
+        by_room: Dict[int, List[int]] = {}
+        for alert_id, room_id in expired:
+            by_room.setdefault(room_id, []).append(alert_id)
+        for room_id, alert_ids in by_room.items():
+            for listener in self._listeners:
+                await listener(room_id, alert_ids)
+
+    async def _delete(self, expired: List[ExpiryItem]):
+        if self._delete_batch is None:
+            return
+        ids = [alert_id for alert_id, _ in expired]
+        for start in range(0, len(ids), self.batch_size):
+            await run_in_threadpool(self._delete_batch, ids[start:start + self.batch_size])
+
+
+# Global expiry engine, started by the application lifespan
+alert_expiry = AlertExpiry()
@@ -1,2 +1,2 @@
 # Controllers package
-from . import auth_controller, alerts_controller, rooms_controller, websocket_controller
+from . import auth_controller, alerts_controller, rooms_controller, websocket_controller, events_controller, admin_controller
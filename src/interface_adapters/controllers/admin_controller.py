@@ -0,0 +1,103 @@
+"""Admin controller - Operational endpoints guarded by X-Admin-Token."""
+import json
+import urllib.request
+from typing import List
+from fastapi import APIRouter, Depends, status
+from starlette.concurrency import run_in_threadpool
+from src.frameworks_drivers import settings
+from src.frameworks_drivers.http.dependencies import require_admin
+from src.interface_adapters.controllers.websocket_controller import manager
+from src.interface_adapters.ephemeral_events import ephemeral_events
+from src.interface_adapters.presenters.schemas import ClusterNodesRequest, RoomHandoff
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.interface_adapters.room_router import room_router
+
+router = APIRouter()
+
+# Seconds a handoff POST to the new owner may take
+HANDOFF_TIMEOUT = 5.0
+
+
+@router.post("/admin/drain", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+async def drain():
+    """
+    Start draining this worker before it is stopped.
+    
+    New sockets and streams are refused; open ones get a jittered
+    reconnect hint and are closed in waves. Call it from the deploy's
+    pre-stop hook: uvicorn closes sockets itself before lifespan shutdown.
+    """
+    connections = len(manager.active_connections)
+    manager.start_drain(
+        waves=settings.DRAIN_WAVES,
+        wave_interval=settings.DRAIN_WAVE_INTERVAL,
+        max_delay=settings.DRAIN_MAX_RECONNECT_DELAY
+    )
+    return {"draining": True, "connections": connections}
+
+
+@router.get("/admin/cluster", dependencies=[Depends(require_admin)])
+def cluster():
+    """This node, the ring's nodes and the rooms held here."""
+    return {
+        "node": room_router.node,
+        "nodes": room_router.ring.nodes,
+        "rooms": sorted(manager.held_rooms())
+    }
+
+
+def _post_handoff(node: str, states: List[dict]):
+    """Send room states to their new owner (blocking, run in a thread)."""
+    request = urllib.request.Request(
+        f"{node}/api/admin/cluster/handoff",
+        data=json.dumps(states).encode("utf-8"),
+        headers={"Content-Type": "application/json", "X-Admin-Token": settings.ADMIN_TOKEN},
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=HANDOFF_TIMEOUT) as response:
+        response.read()
+
+
+@router.put("/admin/cluster", dependencies=[Depends(require_admin)])
+async def set_cluster_nodes(request: ClusterNodesRequest):
+    """
+    Apply a new node list and hand off the rooms that moved away.
+    
+    Call it on every node. For each room now owned elsewhere, its clients
+    are redirected first (so nothing else is written here), then its ring
+    buffer, last alert id and seq counter are posted to the new owner.
+    A failed handoff only costs the new owner a cold start: catch-up
+    falls back to the database and the seq counter reseeds from it.
+    """
+    moving = room_router.set_nodes(request.nodes, manager.held_rooms())
+    moved = {}
+    for node, rooms in moving.items():
+        for room_id in rooms:
+            await manager.redirect_room(
+                room_id, lambda url, room_id=room_id: room_router.redirect_url(room_id, url)
+            )
+        states = []
+        for room_id in rooms:
+            state = manager.export_room(room_id)
+            state["seq"] = room_sequences.last(room_id)
+            states.append(state)
+            manager.forget_room(room_id)
+            room_sequences.forget(room_id)
+            ephemeral_events.forget_room(room_id)
+        try:
+            await run_in_threadpool(_post_handoff, node, states)
+        except Exception as e:
+            print(f"Handoff to {node} failed: {e}")
+        moved[node] = rooms
+    return {"node": room_router.node, "nodes": room_router.ring.nodes, "moved": moved}
+
+
+@router.post("/admin/cluster/handoff", dependencies=[Depends(require_admin)])
+async def receive_handoff(states: List[RoomHandoff]):
+    """Take over rooms handed off by another node."""
+    for state in states:
+        manager.import_room(state.model_dump())
+        if state.seq is not None:
+            room_sequences.reseed(state.room_id, state.seq)
+        room_router.adopt(state.room_id)
+    return {"adopted": [state.room_id for state in states]}
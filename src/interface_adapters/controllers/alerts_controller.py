@@ -1,34 +1,278 @@
 """Alerts controller - HTTP routes for alerts."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import RedirectResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
+from src.entities.alert import Alert as AlertEntity, SEVERITY_CRITICAL
+from src.entities.read_state import ACK_READ
 from src.entities.user import User
-from src.interface_adapters.presenters.schemas import Alert
+from src.interface_adapters.presenters.schemas import Alert, AlertCreateRequest, UnackedUsers, UnreadCount
+from src.interface_adapters.presenters import serializers
+from src.interface_adapters.presenters.serializers import (
+    alerts_to_json,
+    alert_message,
+    alerts_message,
+    alert_batch_to_json,
+    alert_batch_to_msgpack
+)
+from src.interface_adapters.controllers.websocket_controller import manager, CATCH_UP_LIMIT
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.alert_history_cache import alert_history_cache, make_etag
+from src.interface_adapters.room_router import room_router
 from src.use_cases.alerts.get_alerts import GetAlertsUseCase
+from src.use_cases.alerts.create_alerts_batch import CreateAlertsBatchUseCase
+from src.use_cases.alerts.get_read_state import GetReadStateUseCase
 from src.frameworks_drivers.http.dependencies import (
     get_alert_repository,
-    get_current_user
+    get_current_user,
+    room_exists,
+    room_alert_ttl,
+    room_last_seq,
+    room_members
 )
 
 router = APIRouter()
 
+# Largest accepted batch; bigger bursts must be split by the producer
+MAX_BATCH_SIZE = 1000
+
+# Largest accepted batch body. An item is at most ~1.3 KB of JSON
+# (200 characters of content, each \uXXXX-escaped, plus the other fields)
+MAX_BATCH_BYTES = MAX_BATCH_SIZE * 2048
+
+# Open-ended seq ranges run up to here (SQLite INTEGER max)
+MAX_SEQ = 2 ** 63 - 1
+
+_alert_item = TypeAdapter(AlertCreateRequest)
+_alert_items = TypeAdapter(List[AlertCreateRequest])
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (a list of tags, weak or not, or *) against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _alerts_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """200 with the body, or 304 if the client already has it."""
+    # Authenticated per user: browsers may keep it but must revalidate
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/alerts", response_model=List[Alert])
 def get_alerts(
     room_id: Optional[int] = None,
+    from_seq: Optional[int] = Query(None, ge=1),
+    to_seq: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None),
     user: User = Depends(get_current_user),
     alert_repo=Depends(get_alert_repository)
 ):
-    """Get alerts endpoint with optional room filtering."""
+    """
+    Get alerts endpoint with optional room filtering.
+    
+    With from_seq and/or to_seq (room_id required) only that seq range of
+    the room is returned, at most CATCH_UP_LIMIT alerts in seq order.
+    
+    Responses carry an ETag; If-None-Match with it answers 304. A room's
+    responses are served from the alert history cache until the room's
+    next alert, expiry or deletion (rooms owned by another cluster node
+    are not cached here, their writes happen there).
+    """
+    if (from_seq is not None or to_seq is not None) and room_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="room_id required for a seq range")
+    
+    cacheable = room_id is not None and room_router.is_local(room_id)
+    cursor = (from_seq, to_seq)
+    if cacheable:
+        cached = alert_history_cache.get(room_id, cursor)
+        if cached is not None:
+            return _alerts_response(cached.body, cached.etag, if_none_match)
+        # Read before the query: a write landing in between makes put() skip it
+        version = alert_history_cache.version(room_id)
+    
     use_case = GetAlertsUseCase(alert_repo)
-    alerts = use_case.execute(room_id=room_id)
-    
-    # Convert entities to ORM-compatible format for Pydantic
-    return [
-        {
-            "id": alert.id,
-            "content": alert.content,
-            "created_at": alert.created_at,
-            "user_id": alert.user_id
-        }
-        for alert in alerts
-    ]
+    if from_seq is None and to_seq is None:
+        alerts = use_case.execute(room_id=room_id)
+    else:
+        alerts = use_case.execute_range(
+            room_id, from_seq or 1, to_seq if to_seq is not None else MAX_SEQ, CATCH_UP_LIMIT
+        )
+    
+    # Entities go straight to JSON bytes; returning a Response skips the
+    # response_model validation (kept for the OpenAPI docs)
+    body = alerts_to_json(alerts)
+    if cacheable:
+        entry = alert_history_cache.put(room_id, cursor, version, body)
+        return _alerts_response(body, entry.etag, if_none_match)
+    return _alerts_response(body, make_etag(body), if_none_match)
+
+
+@router.get("/alerts/batch")
+def get_alerts_batch(
+    room_id: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+    user: User = Depends(get_current_user),
+    alert_repo=Depends(get_alert_repository)
+):
+    """
+    Get alerts as one columnar batch (lists per column, created_at in epoch µs).
+    
+    Served as MessagePack when requested via Accept and msgpack is installed.
+    """
+    use_case = GetAlertsUseCase(alert_repo)
+    batch = use_case.execute_batch(room_id=room_id)
+    
+    if accept and "msgpack" in accept and serializers.msgpack is not None:
+        return Response(content=alert_batch_to_msgpack(batch), media_type="application/msgpack")
+    return Response(content=alert_batch_to_json(batch), media_type="application/json")
+
+
+def _batch_too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+async def _read_batch_body(request: Request) -> bytes:
+    """Read the body of a batch, refusing it once it passes MAX_BATCH_BYTES."""
+    detail = f"At most {MAX_BATCH_BYTES} bytes per batch"
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > MAX_BATCH_BYTES:
+        raise _batch_too_large(detail)
+    
+    # Chunked bodies have no Content-Length: stop reading at the cap
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BATCH_BYTES:
+            raise _batch_too_large(detail)
+    return bytes(body)
+
+
+def _parse_batch(body: bytes, content_type: str) -> List[AlertCreateRequest]:
+    """Parse a JSON array or an NDJSON stream of alert items."""
+    try:
+        if "ndjson" in content_type:
+            return [
+                _alert_item.validate_json(line)
+                for line in body.splitlines()
+                if line.strip()
+            ]
+        return _alert_items.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+
+def _create_batch(
+    alert_repo,
+    room_id: int,
+    user_id: int,
+    items: List[AlertCreateRequest]
+) -> List[AlertEntity]:
+    """Check the room and insert the batch (blocking, run in the threadpool)."""
+    if not room_exists(room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+    if not items:
+        return []
+    
+    default_ttl = room_alert_ttl(room_id)
+    return CreateAlertsBatchUseCase(alert_repo).execute(
+        [item.content for item in items],
+        user_id,
+        room_id,
+        [item.severity for item in items],
+        [default_ttl if item.ttl is None else item.ttl for item in items]
+    )
+
+
+@router.post(
+    "/rooms/{room_id}/alerts:batch",
+    response_model=List[Alert],
+    status_code=status.HTTP_201_CREATED
+)
+async def create_alerts_batch(
+    room_id: int,
+    request: Request,
+    user: User = Depends(get_current_user),
+    alert_repo=Depends(get_alert_repository)
+):
+    """
+    Bulk ingest endpoint for machine producers.
+    
+    Accepts a JSON array of {"content": ..., "severity": ..., "ttl": ...}
+    items (ttl defaults to the room's alert TTL), or the same items as NDJSON (Content-Type: application/x-ndjson). Everything is
+    inserted in one transaction and fanned out as a single coalesced
+    message; critical alerts skip coalescing and go out first, one each.
+    Rooms owned by another cluster node answer 307 to that node. Bodies
+    over MAX_BATCH_BYTES and batches over MAX_BATCH_SIZE items answer 413.
+    """
+    if not room_router.is_local(room_id):
+        return RedirectResponse(
+            room_router.redirect_url(room_id, request.url),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+    
+    items = _parse_batch(await _read_batch_body(request), request.headers.get("content-type", ""))
+    if len(items) > MAX_BATCH_SIZE:
+        raise _batch_too_large(f"At most {MAX_BATCH_SIZE} alerts per batch")
+    
+    alerts = await run_in_threadpool(_create_batch, alert_repo, room_id, user.id, items)
+    if not alerts:
+        return Response(content=b"[]", status_code=status.HTTP_201_CREATED, media_type="application/json")
+    
+    members = await run_in_threadpool(room_members, room_id)
+    rest = []
+    for alert in alerts:
+        if alert.severity == SEVERITY_CRITICAL:
+            message = alert_message(alert)
+            await manager.broadcast_to_room(room_id, message, event_id=alert.id, critical=True, seq=alert.seq)
+            await manager.escalate(room_id, message, members, author_id=user.id)
+        else:
+            rest.append(alert)
+    if rest:
+        await manager.broadcast_to_room(
+            room_id, alerts_message(room_id, rest), event_id=rest[-1].id, seq=rest[-1].seq
+        )
+    manager.mail_offline(room_id, [alert.id for alert in alerts], members, author_id=user.id)
+    return Response(
+        content=alerts_to_json(alerts),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
+
+
+@router.get("/rooms/{room_id}/unread", response_model=UnreadCount)
+def get_unread_count(
+    room_id: int,
+    user: User = Depends(get_current_user)
+):
+    """Number of alerts of the room the current user has not read (served from memory)."""
+    if not room_exists(room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+    last_seq = room_last_seq(room_id)
+    unread = GetReadStateUseCase(ack_states).unread(room_id, user.id, last_seq)
+    return UnreadCount(room_id=room_id, last_seq=last_seq, unread=unread)
+
+
+@router.get("/rooms/{room_id}/alerts/{seq}/unacked", response_model=UnackedUsers)
+def get_unacked_users(
+    room_id: int,
+    seq: int,
+    kind: str = Query(ACK_READ, pattern="^(delivered|read)$"),
+    user: User = Depends(get_current_user)
+):
+    """Members that have not acknowledged a critical alert of the room, by seq."""
+    user_ids = GetReadStateUseCase(ack_states).unacked(room_id, seq, kind, room_members(room_id))
+    if user_ids is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No critical alert with that seq")
+    return UnackedUsers(room_id=room_id, seq=seq, kind=kind, user_ids=user_ids)
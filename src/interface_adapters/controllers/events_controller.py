@@ -0,0 +1,116 @@
+"""Events controller - Server-Sent Events streams of room alerts."""
+import asyncio
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import RedirectResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from src.entities.user import User
+from src.interface_adapters.controllers.alerts_controller import MAX_SEQ
+from src.interface_adapters.controllers.websocket_controller import (
+    CATCH_UP_LIMIT,
+    EventStream,
+    format_sse,
+    manager
+)
+from src.interface_adapters.presenters.serializers import alert_message
+from src.interface_adapters.room_router import room_router
+from src.use_cases.alerts.get_alerts import GetAlertsUseCase
+from src.frameworks_drivers.http.dependencies import (
+    alert_repository_scope,
+    get_stream_user,
+    room_exists,
+    room_last_seq
+)
+
+router = APIRouter()
+
+# Comment line sent when idle so proxies keep the stream open
+KEEPALIVE_SECONDS = 15
+
+
+def _missed_after(room_id: int, last_seq: int) -> List:
+    """Catch-up query on a short-lived session (run in the threadpool)."""
+    with alert_repository_scope() as alert_repo:
+        return GetAlertsUseCase(alert_repo).execute_range(room_id, last_seq + 1, MAX_SEQ, CATCH_UP_LIMIT)
+
+
+async def _room_events(room_id: int, last_event_id: Optional[int]) -> AsyncIterator[str]:
+    """Replay missed alerts, then relay the room's live broadcasts."""
+    # Subscribe before the catch-up query so nothing falls in between
+    stream = EventStream()
+    manager.add_stream(room_id, stream)
+    try:
+        if last_event_id is None:
+            replayed = 0
+            position = await run_in_threadpool(room_last_seq, room_id)
+        else:
+            replayed = last_event_id
+            missed = await run_in_threadpool(_missed_after, room_id, last_event_id)
+            for alert in missed:
+                yield format_sse(alert_message(alert), alert.seq)
+                replayed = alert.seq
+            if len(missed) == CATCH_UP_LIMIT:
+                yield "event: resync\ndata: {}\n\n"
+            position = replayed
+        
+        while not stream.overflowed:
+            try:
+                frame, critical = await asyncio.wait_for(stream.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                # Closed by the server (drain)
+                break
+            if frame.startswith("id: "):
+                end = frame.index("\n")
+                seq = int(frame[4:end])
+                if seq <= replayed:
+                    # Already replayed by the catch-up query
+                    continue
+                if critical and seq > position + 1:
+                    # Ahead of alerts still queued: sent without its id so
+                    # Last-Event-ID never skips them on a reconnect
+                    frame = frame[end + 1:]
+                else:
+                    position = max(position, seq)
+            yield frame
+    finally:
+        manager.remove_stream(room_id, stream)
+
+
+@router.get("/rooms/{room_id}/events")
+async def room_events(
+    room_id: int,
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    user: User = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of a room's alerts.
+    
+    Fed by the same broadcast hub as the WebSockets. Event ids are the
+    room's alert seqs: reconnecting clients send Last-Event-ID and first
+    receive the alerts they missed. A critical alert overtaking queued
+    ones arrives without an id (it may come again after a reconnect).
+    Rooms owned by another cluster node answer 307 to that node.
+    """
+    if not room_router.is_local(room_id):
+        return RedirectResponse(
+            room_router.redirect_url(room_id, request.url),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+    if manager.draining:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service restarting",
+            headers={"Retry-After": "5"}
+        )
+    if not await run_in_threadpool(room_exists, room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+    
+    return StreamingResponse(
+        _room_events(room_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
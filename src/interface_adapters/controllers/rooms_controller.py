@@ -1,24 +1,145 @@
 """Rooms controller - HTTP routes for rooms."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List
-from sqlalchemy.orm import Session
-from src.interface_adapters.presenters.schemas import Room
+from src.entities.user import User
+from src.interface_adapters.presenters.schemas import (
+    Room,
+    RoomSummary,
+    RoomNameRequest,
+    RoomAlertTTLRequest
+)
+from src.interface_adapters.presenters.serializers import rooms_to_json
+from src.interface_adapters.repositories.repository_interfaces import RoomNameTakenError
+from src.interface_adapters.room_catalog import room_catalog
+from src.use_cases.rooms.create_room import CreateRoomUseCase
+from src.use_cases.rooms.rename_room import RenameRoomUseCase
+from src.use_cases.rooms.delete_room import DeleteRoomUseCase
 from src.use_cases.rooms.get_rooms import GetRoomsUseCase
+from src.use_cases.rooms.room_members import RoomMembersUseCase
+from src.use_cases.rooms.set_alert_ttl import SetRoomAlertTTLUseCase
 from src.frameworks_drivers.http.dependencies import (
+    get_current_user,
     get_room_repository,
-    get_db
+    require_admin
 )
-from src.frameworks_drivers.db.orm_models import RoomORM
 
 router = APIRouter()
 
 
+def _name_taken(e: RoomNameTakenError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
 @router.get("/rooms", response_model=List[Room])
-def get_rooms(
-    room_repo=Depends(get_room_repository),
-    db: Session = Depends(get_db)
+def get_rooms(room_repo=Depends(get_room_repository)):
+    """
+    Get all rooms endpoint.
+    
+    X-Catalog-Epoch / X-Catalog-Version tell catalog subscribers which
+    events this snapshot already includes.
+    """
+    # Read the version first: events published meanwhile may be applied
+    # twice by the client, which is harmless, but never missed
+    headers = {
+        "X-Catalog-Epoch": room_catalog.epoch,
+        "X-Catalog-Version": str(room_catalog.version)
+    }
+    rooms = GetRoomsUseCase(room_repo).execute_listings()
+    return Response(content=rooms_to_json(rooms), media_type="application/json", headers=headers)
+
+
+@router.post("/rooms", response_model=RoomSummary, status_code=status.HTTP_201_CREATED)
+def create_room(
+    request: RoomNameRequest,
+    user: User = Depends(get_current_user),
+    room_repo=Depends(get_room_repository)
+):
+    """Create room endpoint."""
+    try:
+        return CreateRoomUseCase(room_repo).execute(request.name)
+    except RoomNameTakenError as e:
+        raise _name_taken(e)
+
+
+@router.patch(
+    "/rooms/{room_id}",
+    response_model=RoomSummary,
+    dependencies=[Depends(require_admin)]
+)
+def rename_room(
+    room_id: int,
+    request: RoomNameRequest,
+    room_repo=Depends(get_room_repository)
+):
+    """Rename room endpoint (admin only: X-Admin-Token)."""
+    try:
+        room = RenameRoomUseCase(room_repo).execute(room_id, request.name)
+    except RoomNameTakenError as e:
+        raise _name_taken(e)
+    if room is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+    return room
+
+
+@router.delete(
+    "/rooms/{room_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin)]
+)
+def delete_room(
+    room_id: int,
+    room_repo=Depends(get_room_repository)
+):
+    """Delete room endpoint (its alerts go with it) (admin only: X-Admin-Token)."""
+    if not DeleteRoomUseCase(room_repo).execute(room_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+
+
+@router.put(
+    "/rooms/{room_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin)]
+)
+def add_room_member(
+    room_id: int,
+    user_id: int,
+    room_repo=Depends(get_room_repository)
+):
+    """Add a user to a room (admin only: X-Admin-Token)."""
+    if not RoomMembersUseCase(room_repo).add(room_id, user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room or user not found")
+
+
+@router.delete(
+    "/rooms/{room_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin)]
+)
+def remove_room_member(
+    room_id: int,
+    user_id: int,
+    room_repo=Depends(get_room_repository)
+):
+    """Remove a user from a room (admin only: X-Admin-Token)."""
+    if not RoomMembersUseCase(room_repo).remove(room_id, user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not a member")
+
+
+@router.put(
+    "/rooms/{room_id}/alert-ttl",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_admin)]
+)
+def set_room_alert_ttl(
+    room_id: int,
+    request: RoomAlertTTLRequest,
+    room_repo=Depends(get_room_repository)
 ):
-    """Get all rooms endpoint."""
-    # Use ORM directly for this endpoint to maintain relationship loading
-    # This is a pragmatic choice to avoid complex entity->schema mapping
-    return db.query(RoomORM).all()
+    """
+    Set the TTL of alerts posted to the room without one (null = never expire).
+    
+    Admin only (X-Admin-Token): a short TTL makes the expiry engine
+    delete the room's new alerts.
+    """
+    if not SetRoomAlertTTLUseCase(room_repo).execute(room_id, request.alert_ttl):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
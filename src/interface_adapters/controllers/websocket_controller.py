@@ -1,101 +1,1134 @@
 """WebSocket Controller - Handles WebSocket lifecycle and communication."""
+import asyncio
 import json
-from typing import List, Dict
+import random
+from collections import deque
+from typing import Any, Callable, ContextManager, Deque, List, Dict, Sequence, Set, Optional, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from src.entities.alert import Alert, SEVERITY_CRITICAL, SEVERITY_INFO
+from src.entities.ephemeral_event import EVENT_TYPING, EphemeralEvent
+from src.entities.read_state import ACK_DELIVERED, ACK_READ
 from src.entities.user import User
-from src.interface_adapters.repositories.repository_interfaces import (
-    RoomRepositoryInterface,
-    AlertRepositoryInterface
+from src.frameworks_drivers import settings
+from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
+from src.use_cases.alerts.ack_alerts import AckAlertsUseCase
+from src.use_cases.alerts.create_alert import CreateAlertUseCase, ClientMessageDedupe
+from src.use_cases.alerts.get_alerts import GetAlertsUseCase
+from src.interface_adapters.presenters.serializers import (
+    alert_message,
+    alerts_message,
+    alerts_range_message,
+    events_message,
+    mailbox_message
 )
-from src.use_cases.alerts.create_alert import CreateAlertUseCase
-from src.interface_adapters.presenters.schemas import Alert as AlertSchema
+from src.interface_adapters.presenters.inbound_frames import (
+    AckFrame,
+    AlertFrame,
+    FetchFrame,
+    FrameError,
+    parse_multiplex_frame,
+    parse_room_frame
+)
+from src.interface_adapters.alert_expiry import alert_expiry
+from src.interface_adapters.ephemeral_events import RateLimiter, ephemeral_events
+from src.interface_adapters.offline_mailbox import OfflineMailbox
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.interface_adapters.room_catalog import room_catalog, ROOM_DELETED
+from src.interface_adapters.room_router import room_router
+from src.interface_adapters.tracing import tracer
+
+
+# Close code for "server full, try again later"
+WS_1013_TRY_AGAIN_LATER = 1013
+# Close code for "server restarting", sent while draining
+WS_1012_SERVICE_RESTART = 1012
+# Close code after a {"redirect": url} frame: the room lives on another node
+WS_4307_REDIRECT = 4307
+# Close code after a {"deleted": room_id} frame: the room no longer exists
+WS_4404_ROOM_DELETED = 4404
+
+# Alerts replayed on (re)join; clients further behind are told to resync
+CATCH_UP_LIMIT = 1000
+# Seconds a draining socket gets to flush its queued frames
+DRAIN_FLUSH_TIMEOUT = 5.0
+
+# Opens a short-lived alert repository, e.g. dependencies.alert_repository_scope
+AlertRepositoryScope = Callable[[], ContextManager[AlertRepositoryInterface]]
+
+
+def format_sse(message: str, event_id: Optional[int] = None) -> str:
+    """Frame an already encoded message as a Server-Sent Event."""
+    if event_id is None:
+        return f"data: {message}\n\n"
+    return f"id: {event_id}\ndata: {message}\n\n"
+
+
+class DeliveryQueue:
+    """
+    Two-lane outbound queue: critical items are always taken first.
+    
+    Only the normal lane is bounded; critical items are never refused, so
+    no slow-consumer policy can drop them.
+    """
+    
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self.critical: Deque[Any] = deque()
+        self.normal: Deque[Any] = deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self.critical) + len(self.normal)
+
+    def put(self, item: Any, critical: bool = False, force: bool = False) -> bool:
+        """Enqueue an item. Returns False if the normal lane is full."""
+        if critical:
+            self.critical.append(item)
+        elif len(self.normal) < self.maxsize or force:
+            self.normal.append(item)
+        else:
+            return False
+        self._ready.set()
+        return True
+
+    async def get(self) -> Any:
+        """Wait for the next item, critical lane first."""
+        while not self.critical and not self.normal:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.critical:
+            return self.critical.popleft()
+        return self.normal.popleft()
+
+
+class EventStream:
+    """Queue-backed room subscriber used by Server-Sent Events streams."""
+    
+    def __init__(self, maxsize: int = 1000):
+        self.queue = DeliveryQueue(maxsize)
+        # Set when the consumer fell too far behind; the stream is then
+        # ended and the client resumes from its Last-Event-ID
+        self.overflowed = False
+
+    def push(self, frame: Optional[str], critical: bool = False):
+        """Enqueue an SSE frame without blocking the broadcaster."""
+        if not self.queue.put((frame, critical), critical):
+            self.overflowed = True
+    
+    async def get(self) -> Tuple[Optional[str], bool]:
+        """Wait for the next (frame, critical) pair; a None frame ends the stream."""
+        return await self.queue.get()
+
+    def close(self, frame: Optional[str] = None):
+        """Send a last frame (if any) and end the stream."""
+        if frame is not None:
+            self.push(frame, critical=True)
+        self.push(None, critical=True)
+
+
+class Outbox:
+    """
+    Per-connection sender: one task drains a DeliveryQueue into the socket.
+    
+    Broadcasts only enqueue, so a slow client never stalls the others.
+    When its backlog is full the oldest non-critical frame is shed and the
+    client is told how many it missed with {"dropped": n} (to catch up
+    with last_alert_id); critical frames jump the queue and are never shed.
+    """
+    
+    def __init__(self, websocket: WebSocket, maxsize: int = 1000):
+        self.websocket = websocket
+        self.queue = DeliveryQueue(maxsize)
+        self.dropped = 0
+        self.task = asyncio.create_task(self._run())
+
+    def push(self, message: str, critical: bool = False):
+        """Enqueue a message, shedding the oldest non-critical one when full."""
+        if not self.queue.put(message, critical):
+            if self.queue.normal:
+                self.queue.normal.popleft()
+                self.queue.normal.append(message)
+            # With no normal lane to shed from, the new message is the one dropped
+            self.dropped += 1
+
+    async def _run(self):
+        websocket = self.websocket
+        try:
+            while True:
+                message = await self.queue.get()
+                if message is None:
+                    return
+                if self.dropped:
+                    dropped, self.dropped = self.dropped, 0
+                    await websocket.send_text(json.dumps({"dropped": dropped}))
+                await websocket.send_text(message)
+        except Exception:
+            # Connection might be dead; its handler unregisters it
+            pass
+
+    async def finish(self, message: str, timeout: float):
+        """Send what is queued, then `message`, and stop (waits up to `timeout`)."""
+        self.queue.put(message, force=True)
+        self.queue.put(None, force=True)
+        try:
+            await asyncio.wait_for(self.task, timeout)
+        except Exception:
+            pass
+
+    def cancel(self):
+        """Stop sending; queued frames are discarded."""
+        self.task.cancel()
 
 
 class ConnectionManager:
     """Manages active WebSocket connections."""
     
-    def __init__(self):
-        # In a real app with rooms, this should be Dict[int, List[WebSocket]]
+    def __init__(
+        self,
+        max_connections: int = 0,
+        max_connections_per_room: int = 0,
+        max_pending_messages: int = 1000,
+        ring_size: int = 256,
+        mailbox_size: int = 64
+    ):
+        # Admission caps, 0 means unlimited
+        self.max_connections = max_connections
+        self.max_connections_per_room = max_connections_per_room
+        # Non-critical backlog per connection before shedding
+        self.max_pending_messages = max_pending_messages
         self.active_connections: List[WebSocket] = []
+        self._outboxes: Dict[WebSocket, Outbox] = {}
+        # Secondary index: user_id -> sockets of that user (one per device/tab)
+        self.user_connections: Dict[int, Set[WebSocket]] = {}
+        self._connection_users: Dict[WebSocket, int] = {}
+        # Secondary index: room_id -> sockets subscribed to that room.
+        # A socket may be in several rooms (multiplexed connections)
+        self.room_connections: Dict[int, Set[WebSocket]] = {}
+        self._connection_rooms: Dict[WebSocket, Set[int]] = {}
+        # Room a single-room socket was opened for (not set for multiplexed)
+        self._home_rooms: Dict[WebSocket, int] = {}
+        # SSE subscribers fed by the same room broadcasts
+        self.room_streams: Dict[int, Set[EventStream]] = {}
+        # Sockets subscribed to room catalog events
+        self.catalog_connections: Set[WebSocket] = set()
+        # Id of the last alert broadcast per room, handed out in reconnect hints
+        self.room_last_alert_id: Dict[int, int] = {}
+        # Ring buffer of the last `ring_size` alert frames per room as
+        # (alert id, frame): catch-up from memory, handed off with the room
+        self.ring_size = ring_size
+        self.room_recent: Dict[int, Deque[Tuple[int, str]]] = {}
+        # Alert ids posted to their rooms while members were offline
+        self.mailbox = OfflineMailbox(mailbox_size)
+        # Set once draining starts: no new sockets or streams are admitted
+        self.draining = False
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def has_capacity(self, room_id: Optional[int] = None) -> bool:
+        """Check node and room caps before accepting a new connection."""
+        if self.max_connections and len(self.active_connections) >= self.max_connections:
+            return False
+        return room_id is None or self.room_has_capacity(room_id)
 
-    async def connect(self, websocket: WebSocket):
-        """Accept connection and add to registry."""
-        await websocket.accept()
+    def room_has_capacity(self, room_id: int) -> bool:
+        """Check the per-room cap."""
+        if not self.max_connections_per_room:
+            return True
+        room = self.room_connections.get(room_id)
+        return room is None or len(room) < self.max_connections_per_room
+
+    def subscribe(self, websocket: WebSocket, room_id: int) -> bool:
+        """Add a connection to a room. Returns False if the room is full."""
+        sockets = self.room_connections.get(room_id)
+        if sockets is not None and websocket in sockets:
+            return True
+        if not self.room_has_capacity(room_id):
+            return False
+        self.room_connections.setdefault(room_id, set()).add(websocket)
+        self._connection_rooms.setdefault(websocket, set()).add(room_id)
+        return True
+
+    def unsubscribe(self, websocket: WebSocket, room_id: int):
+        """Remove a connection from a room."""
+        sockets = self.room_connections.get(room_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.room_connections[room_id]
+        rooms = self._connection_rooms.get(websocket)
+        if rooms is not None:
+            rooms.discard(room_id)
+
+    def rooms_of(self, websocket: WebSocket) -> Set[int]:
+        """Rooms a connection is subscribed to."""
+        return self._connection_rooms.get(websocket, set())
+
+    def add_stream(self, room_id: int, stream: EventStream):
+        """Register an SSE stream for a room."""
+        self.room_streams.setdefault(room_id, set()).add(stream)
+
+    def remove_stream(self, room_id: int, stream: EventStream):
+        """Unregister an SSE stream."""
+        streams = self.room_streams.get(room_id)
+        if streams is not None:
+            streams.discard(stream)
+            if not streams:
+                del self.room_streams[room_id]
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: Optional[int] = None,
+        room_id: Optional[int] = None
+    ) -> bool:
+        """
+        Admit, accept and register a connection.
+        
+        The slot is reserved before the first await so concurrent handshakes
+        cannot overshoot the caps. A full node or room gets close code 1013,
+        a draining node 1012.
+        
+        Returns:
+            True if the connection was admitted
+        """
+        if self.draining:
+            await websocket.accept()
+            await websocket.close(code=WS_1012_SERVICE_RESTART, reason="Service restarting")
+            return False
+        if not self.has_capacity(room_id):
+            await websocket.accept()
+            await websocket.close(code=WS_1013_TRY_AGAIN_LATER, reason="Try again later")
+            return False
+        
         self.active_connections.append(websocket)
+        if user_id is not None:
+            self.user_connections.setdefault(user_id, set()).add(websocket)
+            self._connection_users[websocket] = user_id
+        if room_id is not None:
+            self.subscribe(websocket, room_id)
+            self._home_rooms[websocket] = room_id
+        try:
+            await websocket.accept()
+        except Exception:
+            self.disconnect(websocket)
+            raise
+        if websocket in self.active_connections:
+            self._outboxes[websocket] = Outbox(websocket, self.max_pending_messages)
+        return True
 
     def disconnect(self, websocket: WebSocket):
         """Remove connection from registry."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None:
+            outbox.cancel()
+        self.catalog_connections.discard(websocket)
+        self._home_rooms.pop(websocket, None)
+        for room_id in self._connection_rooms.pop(websocket, ()):
+            sockets = self.room_connections.get(room_id)
+            if sockets is not None:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self.room_connections[room_id]
+        user_id = self._connection_users.pop(websocket, None)
+        if user_id is not None:
+            sockets = self.user_connections.get(user_id)
+            if sockets is not None:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self.user_connections[user_id]
+
+    def is_online(self, user_id: int, room_id: Optional[int] = None) -> bool:
+        """
+        Check whether a user has an open connection.
+        
+        Args:
+            user_id: User ID
+            room_id: Only count connections subscribed to this room
+        """
+        sockets = self.user_connections.get(user_id)
+        if not sockets:
+            return False
+        if room_id is None:
+            return True
+        room = self.room_connections.get(room_id)
+        return bool(room) and not room.isdisjoint(sockets)
+
+    def mail_offline(
+        self,
+        room_id: int,
+        alert_ids: List[int],
+        members: Sequence[int],
+        author_id: Optional[int] = None
+    ):
+        """
+        Queue new alerts of a room for its members not connected to it.
+        
+        A member connected only to other rooms got no broadcast either, so
+        presence is checked per room. `members` are the room's user ids
+        (dependencies.room_members); the author is skipped.
+        """
+        if not members:
+            return
+        self.mailbox.store(
+            [
+                user_id for user_id in members
+                if user_id != author_id and not self.is_online(user_id, room_id)
+            ],
+            alert_ids
+        )
+
+    async def send(self, websocket: WebSocket, message: str, critical: bool = False):
+        """
+        Send a message to one connection.
+        
+        Registered connections go through their outbox, so every frame of
+        a socket is written by a single task and in priority order.
+        """
+        outbox = self._outboxes.get(websocket)
+        if outbox is not None:
+            outbox.push(message, critical)
+            return
+        try:
+            await websocket.send_text(message)
+        except Exception:
+            # Connection might be dead
+            pass
+
+    async def send_to_user(self, user_id: int, message: str, critical: bool = False) -> int:
+        """
+        Send message to every connection of a user (all devices).
 
-    async def broadcast(self, message: str):
+        Args:
+            user_id: Target user ID
+            message: Already encoded message
+            critical: Deliver ahead of queued non-critical messages
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        sockets = self.user_connections.get(user_id)
+        if not sockets:
+            return 0
+        delivered = 0
+        for connection in sockets:
+            outbox = self._outboxes.get(connection)
+            if outbox is not None:
+                outbox.push(message, critical)
+                delivered += 1
+        return delivered
+
+    async def escalate(
+        self,
+        room_id: int,
+        message: str,
+        members: Sequence[int],
+        author_id: Optional[int] = None
+    ) -> int:
+        """
+        Push a critical alert to the room's members connected only elsewhere.
+        
+        Members on other rooms' sockets get no room broadcast; a critical
+        alert reaches every device of theirs as {"escalation": alert}
+        (their mailbox still replays it when they join the room).
+        
+        Args:
+            room_id: Room the alert was posted to
+            message: Encoded alert frame
+            members: User IDs of the room's members
+            author_id: User who posted it (not escalated to)
+            
+        Returns:
+            Number of connections the escalation was queued for
+        """
+        if not members:
+            return 0
+        frame = f'{{"escalation": {message}}}'
+        delivered = 0
+        for user_id in members:
+            if user_id != author_id and self.is_online(user_id) and not self.is_online(user_id, room_id):
+                delivered += await self.send_to_user(user_id, frame, critical=True)
+        return delivered
+
+    async def broadcast(self, message: str, critical: bool = False):
         """Send message to all active connections."""
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                # Connection might be dead
-                pass
+        for outbox in self._outboxes.values():
+            outbox.push(message, critical)
+
+    def push_catalog(self, message: str):
+        """Queue a room catalog event on every catalog subscriber."""
+        outboxes = self._outboxes
+        for connection in self.catalog_connections:
+            outbox = outboxes.get(connection)
+            if outbox is not None:
+                outbox.push(message)
+
+    async def broadcast_to_room(
+        self,
+        room_id: int,
+        message: str,
+        event_id: Optional[int] = None,
+        critical: bool = False,
+        seq: Optional[int] = None
+    ):
+        """
+        Send message to the connections and SSE streams of a room.
+        
+        The message is encoded once by the caller and shared by every
+        subscriber; SSE streams get it framed once with `seq` (the last
+        alert seq it carries) as event id. `event_id` (the last alert id)
+        feeds the ring buffer of socket catch-up. Sending only enqueues on
+        each connection's outbox. Critical messages jump every queue.
+        """
+        if event_id is not None:
+            if not critical:
+                self.room_last_alert_id[room_id] = event_id
+            recent = self.room_recent.get(room_id)
+            if recent is None:
+                recent = self.room_recent[room_id] = deque(maxlen=self.ring_size)
+            recent.append((event_id, message))
+        streams = self.room_streams.get(room_id)
+        sockets = self.room_connections.get(room_id)
+        with tracer.span(
+            "ws.broadcast",
+            room_id=room_id,
+            sockets=len(sockets) if sockets else 0,
+            streams=len(streams) if streams else 0,
+            critical=critical
+        ):
+            if streams:
+                frame = format_sse(message, seq)
+                for stream in streams:
+                    stream.push(frame, critical)
+            
+            if not sockets:
+                return
+            outboxes = self._outboxes
+            for connection in sockets:
+                outbox = outboxes.get(connection)
+                if outbox is not None:
+                    outbox.push(message, critical)
+
+    def recent_after(self, room_id: int, last_alert_id: int) -> Optional[List[str]]:
+        """
+        Frames of a room newer than `last_alert_id` from the ring buffer.
+        
+        None when the ring cannot prove it holds all of them (empty, or
+        its oldest frame is already newer); the caller reads the database.
+        """
+        recent = self.room_recent.get(room_id)
+        if not recent or recent[0][0] > last_alert_id:
+            return None
+        return [message for event_id, message in recent if event_id > last_alert_id]
+
+    def forget_recent(self, room_id: int):
+        """Drop a room's ring buffer (its frames may show deleted alerts)."""
+        self.room_recent.pop(room_id, None)
+
+    def held_rooms(self) -> Set[int]:
+        """Rooms with sockets, streams or buffered frames on this node."""
+        return set(self.room_connections) | set(self.room_streams) | set(self.room_recent)
+
+    def export_room(self, room_id: int) -> dict:
+        """In-memory state of a room, to hand it off to another node."""
+        return {
+            "room_id": room_id,
+            "last_alert_id": self.room_last_alert_id.get(room_id),
+            "recent": [list(entry) for entry in self.room_recent.get(room_id, ())]
+        }
+
+    def import_room(self, state: dict):
+        """
+        Take over the state exported by another node's export_room().
+        
+        Clients may reach this node before the state does, so frames
+        already buffered here are kept and merged in id order.
+        """
+        room_id = state["room_id"]
+        last_alert_id = state.get("last_alert_id")
+        if last_alert_id is not None:
+            self.room_last_alert_id[room_id] = max(last_alert_id, self.room_last_alert_id.get(room_id, 0))
+        recent = state.get("recent")
+        if recent:
+            merged = {event_id: message for event_id, message in recent}
+            merged.update(self.room_recent.get(room_id, ()))
+            self.room_recent[room_id] = deque(sorted(merged.items()), maxlen=self.ring_size)
+
+    def forget_room(self, room_id: int):
+        """Drop the in-memory state of a room handed off to another node."""
+        self.room_last_alert_id.pop(room_id, None)
+        self.room_recent.pop(room_id, None)
+
+    async def redirect_room(self, room_id: int, url_for: Callable[[Any], str]) -> int:
+        """
+        Send the clients of a room to its new node.
+        
+        Sockets opened for the room get {"redirect": url} and close code
+        4307; multiplexed sockets get the same frame and are only
+        unsubscribed. SSE streams end and reconnect (and get redirected).
+        
+        Args:
+            room_id: Room moving away
+            url_for: Maps a client's URL (websocket.url) to the same URL on the new node
+            
+        Returns:
+            Number of sockets redirected
+        """
+        sockets = list(self.room_connections.get(room_id, ()))
+        closing = []
+        for websocket in sockets:
+            frame = json.dumps({"redirect": url_for(websocket.url), "room_id": room_id})
+            if self._home_rooms.get(websocket) == room_id:
+                closing.append(self._send_last(websocket, frame, WS_4307_REDIRECT, "Room moved"))
+            else:
+                self.unsubscribe(websocket, room_id)
+                await self.send(websocket, frame)
+        await asyncio.gather(*closing)
+        for stream in list(self.room_streams.get(room_id, ())):
+            stream.close("retry: 0\nevent: redirect\ndata: {}\n\n")
+        return len(sockets)
+
+    async def close_room(self, room_id: int) -> int:
+        """
+        Disconnect the clients of a deleted room.
+        
+        Sockets opened for the room get {"deleted": room_id} and close code
+        4404; multiplexed sockets get the same frame and are unsubscribed.
+        SSE streams end with a "deleted" event. The room's in-memory state
+        is dropped.
+        
+        Returns:
+            Number of sockets told
+        """
+        frame = json.dumps({"deleted": room_id, "room_id": room_id})
+        sockets = list(self.room_connections.get(room_id, ()))
+        closing = []
+        for websocket in sockets:
+            if self._home_rooms.get(websocket) == room_id:
+                closing.append(self._send_last(websocket, frame, WS_4404_ROOM_DELETED, "Room deleted"))
+            else:
+                self.unsubscribe(websocket, room_id)
+                await self.send(websocket, frame)
+        await asyncio.gather(*closing)
+        for stream in list(self.room_streams.get(room_id, ())):
+            stream.close(f"event: deleted\ndata: {frame}\n\n")
+        self.forget_room(room_id)
+        return len(sockets)
+
+    async def _send_last(self, websocket: WebSocket, frame: str, code: int, reason: str):
+        """Unregister a socket, flush its queued frames, send `frame` and close it."""
+        # Keep the outbox out of disconnect() so queued frames are flushed
+        # before the last one
+        outbox = self._outboxes.pop(websocket, None)
+        self.disconnect(websocket)
+        try:
+            if outbox is not None:
+                await outbox.finish(frame, DRAIN_FLUSH_TIMEOUT)
+            else:
+                await websocket.send_text(frame)
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            # Connection might be dead
+            pass
+
+    def _last_alert_ids(self, rooms) -> Dict[int, Optional[int]]:
+        """Last broadcast alert id of each room (None if none seen yet)."""
+        return {room_id: self.room_last_alert_id.get(room_id) for room_id in rooms}
+
+    async def _send_reconnect(self, websocket: WebSocket, max_delay: float):
+        """Hint one client when to come back and from which alert, then close it."""
+        rooms = self.rooms_of(websocket)
+        frame = json.dumps({"reconnect": {
+            "delay_ms": random.randint(0, int(max_delay * 1000)),
+            "last_alert_ids": self._last_alert_ids(rooms)
+        }})
+        await self._send_last(websocket, frame, WS_1012_SERVICE_RESTART, "Service restarting")
+
+    def _close_streams(self, max_delay: float):
+        """End every SSE stream with a jittered `retry:` hint."""
+        for room_id, streams in list(self.room_streams.items()):
+            data = json.dumps({"last_alert_ids": self._last_alert_ids([room_id])})
+            for stream in list(streams):
+                retry = random.randint(0, int(max_delay * 1000))
+                stream.close(f"retry: {retry}\nevent: reconnect\ndata: {data}\n\n")
+
+    async def drain(self, waves: int = 10, wave_interval: float = 0.5, max_delay: float = 30.0) -> int:
+        """
+        Stop admitting clients and close the open ones in waves.
+        
+        Each socket gets a reconnect frame with a random delay in
+        [0, max_delay] seconds and the last alert id of each of its rooms
+        (to resume with `last_alert_id`), so clients come back spread out
+        instead of all at once.
+        
+        Returns:
+            Number of WebSockets closed
+        """
+        self.draining = True
+        self._close_streams(max_delay)
+        sockets = list(self.active_connections)
+        random.shuffle(sockets)
+        wave_size = max(1, -(-len(sockets) // max(1, waves)))
+        for start in range(0, len(sockets), wave_size):
+            if start:
+                await asyncio.sleep(wave_interval)
+            await asyncio.gather(*(
+                self._send_reconnect(websocket, max_delay)
+                for websocket in sockets[start:start + wave_size]
+            ))
+        return len(sockets)
+
+    def start_drain(self, waves: int = 10, wave_interval: float = 0.5, max_delay: float = 30.0) -> asyncio.Task:
+        """Start draining in the background (once) and return the task."""
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self.drain(waves, wave_interval, max_delay))
+        return self._drain_task
 
 
 # Global manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_connections=settings.WS_MAX_CONNECTIONS,
+    max_connections_per_room=settings.WS_MAX_CONNECTIONS_PER_ROOM,
+    max_pending_messages=settings.WS_MAX_PENDING_MESSAGES,
+    ring_size=settings.WS_ROOM_RING_SIZE,
+    mailbox_size=settings.WS_MAILBOX_SIZE
+)
+room_catalog.add_listener(manager.push_catalog)
+# Tasks closing deleted rooms, referenced until they finish
+_room_closers: Set[asyncio.Task] = set()
 
 
-async def websocket_handler(
+def _close_deleted_room(message: str):
+    """Catalog listener: disconnect the clients of a room once it is deleted."""
+    event = json.loads(message)
+    if event["catalog"] != ROOM_DELETED:
+        return
+    task = asyncio.get_running_loop().create_task(manager.close_room(event["room_id"]))
+    _room_closers.add(task)
+    task.add_done_callback(_room_closers.discard)
+
+
+room_catalog.add_listener(_close_deleted_room)
+
+
+async def _broadcast_expired(room_id: int, alert_ids: List[int]):
+    """Tell a room which alerts expired so clients can drop them."""
+    # Catch-up must not replay them: fall back to the database
+    manager.forget_recent(room_id)
+    await manager.broadcast_to_room(room_id, json.dumps({
+        "expired": alert_ids,
+        "room_id": room_id
+    }))
+
+
+alert_expiry.add_listener(_broadcast_expired)
+
+
+async def _broadcast_events(room_id: int, events: List[EphemeralEvent]):
+    """Fan the coalesced ephemeral events of a room out in one frame."""
+    await manager.broadcast_to_room(room_id, events_message(room_id, events))
+
+
+ephemeral_events.add_listener(_broadcast_events)
+# Recently seen client_msg_id per user, shared by every socket of the user
+client_message_dedupe = ClientMessageDedupe()
+
+
+async def redirect_handler(websocket: WebSocket, url: str, room_id: int):
+    """Answer a handshake for a room served by another node with its URL."""
+    await websocket.accept()
+    await websocket.send_text(json.dumps({"redirect": url, "room_id": room_id}))
+    await websocket.close(code=WS_4307_REDIRECT, reason="Room moved")
+
+
+def _read_alerts(
+    alert_scope: AlertRepositoryScope,
+    read: Callable[[GetAlertsUseCase], List[Alert]]
+) -> List[Alert]:
+    """Run one read on its own short-lived repository (no pooled connection held between frames)."""
+    with alert_scope() as alert_repo:
+        return read(GetAlertsUseCase(alert_repo))
+
+
+def _create_alert(alert_scope: AlertRepositoryScope, **fields) -> Tuple[Alert, bool]:
+    """Store one alert on its own short-lived repository."""
+    with alert_scope() as alert_repo:
+        return CreateAlertUseCase(alert_repo, client_message_dedupe).execute_idempotent(**fields)
+
+
+async def _submit_alert(
     websocket: WebSocket,
+    user: User,
     room_id: int,
+    frame: AlertFrame,
+    alert_scope: AlertRepositoryScope,
+    room_alert_ttl: Optional[Callable[[int], Optional[int]]] = None,
+    room_members: Optional[Callable[[int], Sequence[int]]] = None
+):
+    """Persist an inbound alert frame, ack it and fan it out to the room."""
+    client_msg_id = frame.get("client_msg_id")
+    ttl = frame.get("ttl")
+    if ttl is None and room_alert_ttl is not None:
+        ttl = await run_in_threadpool(room_alert_ttl, room_id)
+    
+    # Execute use case to save alert; the insert may wait for the writer
+    # connection, so it runs in the threadpool, never on the event loop
+    alert_entity, created = await run_in_threadpool(
+        _create_alert,
+        alert_scope,
+        content=frame["message"],
+        user_id=user.id,
+        room_id=room_id,
+        client_msg_id=client_msg_id,
+        severity=frame.get("severity", SEVERITY_INFO),
+        ttl=ttl
+    )
+    
+    if client_msg_id is not None:
+        # Ack to the sender; a resent frame gets the original ack
+        await manager.send(websocket, json.dumps({
+            "ack": client_msg_id,
+            "id": alert_entity.id
+        }))
+    if not created:
+        return
+    
+    # Encode once (tagged with its room for multiplexed connections)
+    # and broadcast to the room
+    message = alert_message(alert_entity)
+    critical = alert_entity.severity == SEVERITY_CRITICAL
+    await manager.broadcast_to_room(
+        room_id, message, event_id=alert_entity.id, critical=critical, seq=alert_entity.seq
+    )
+    if room_members is not None:
+        members = await run_in_threadpool(room_members, room_id)
+    else:
+        members = lookup_cache.room_members.get(room_id, ())
+    if critical:
+        await manager.escalate(room_id, message, members, author_id=user.id)
+    manager.mail_offline(room_id, [alert_entity.id], members, author_id=user.id)
+
+
+async def _notify_disconnect(websocket: WebSocket, user: User):
+    """Unregister a connection and tell its rooms the user left."""
+    rooms = list(manager.rooms_of(websocket))
+    manager.disconnect(websocket)
+    if manager.draining:
+        # Everyone is leaving; don't fan out N departure notices to N clients
+        return
+    for room_id in rooms:
+        await manager.broadcast_to_room(room_id, json.dumps({
+            "info": f"User {user.username} disconnected",
+            "room_id": room_id
+        }))
+
+
+async def _deliver_mailbox(websocket: WebSocket, user_id: int, alert_scope: AlertRepositoryScope):
+    """Send what a user's mailbox collected while they were offline, in one frame."""
+    alert_ids, resync = manager.mailbox.take(user_id)
+    if not alert_ids and not resync:
+        return
+    alerts = []
+    if alert_ids:
+        ids = alert_ids.tolist()
+        alerts = await run_in_threadpool(_read_alerts, alert_scope, lambda use_case: use_case.execute_ids(ids))
+    await manager.send(websocket, mailbox_message(alerts, resync))
+
+
+async def _catch_up(
+    websocket: WebSocket,
+    room_id: int,
+    last_alert_id: int,
+    alert_scope: AlertRepositoryScope
+):
+    """Send the alerts of a room newer than `last_alert_id`, ring buffer first."""
+    recent = manager.recent_after(room_id, last_alert_id)
+    if recent is not None:
+        for message in recent:
+            await manager.send(websocket, message)
+        return
+    missed = await run_in_threadpool(
+        _read_alerts, alert_scope,
+        lambda use_case: use_case.execute_after(room_id, last_alert_id, CATCH_UP_LIMIT)
+    )
+    if missed:
+        await manager.send(websocket, alerts_message(room_id, missed))
+    if len(missed) == CATCH_UP_LIMIT:
+        await manager.send(websocket, json.dumps({"resync": room_id}))
+
+
+async def _fetch_range(
+    websocket: WebSocket,
+    room_id: int,
+    frame: FetchFrame,
+    alert_scope: AlertRepositoryScope
+):
+    """Answer {"action": "fetch", "from_seq": a, "to_seq": b} with that seq range."""
+    from_seq = frame["from_seq"]
+    to_seq = frame["to_seq"]
+    if from_seq > to_seq:
+        await manager.send(websocket, json.dumps({"error": "invalid seq range", "room_id": room_id}))
+        return
+    # Longer ranges are cut at CATCH_UP_LIMIT; the client asks for the rest
+    alerts = await run_in_threadpool(
+        _read_alerts, alert_scope,
+        lambda use_case: use_case.execute_range(room_id, from_seq, to_seq, CATCH_UP_LIMIT)
+    )
+    await manager.send(websocket, alerts_range_message(room_id, from_seq, to_seq, alerts))
+
+
+async def _ack(
+    websocket: WebSocket,
     user: User,
-    room_repo: RoomRepositoryInterface,
-    alert_repo: AlertRepositoryInterface
+    room_id: int,
+    frame: AckFrame,
+    room_last_seq: Optional[Callable[[int], int]] = None
+):
+    """Record {"action": "ack" | "read", "seqs": [...], "up_to": n}; nothing is sent back."""
+    if room_last_seq is not None:
+        last_seq = await run_in_threadpool(room_last_seq, room_id)
+    else:
+        last_seq = room_sequences.last(room_id) or 0
+    kind = ACK_READ if frame["action"] == "read" else ACK_DELIVERED
+    AckAlertsUseCase(ack_states).execute(
+        room_id, user.id, kind, frame.get("seqs", ()), frame.get("up_to"), last_seq
+    )
+
+
+def _publish_event(user: User, room_id: int, frame: dict, limiter: Optional[RateLimiter] = None):
+    """Fan out {"action": "event", "type": ..., "data": {...}} without storing it."""
+    if frame["type"] == EVENT_TYPING:
+        data = {"active": frame.get("data", {}).get("active", True)}
+    else:
+        data = frame["data"]
+    # Over the rate the event is dropped silently: the next one supersedes it
+    ephemeral_events.publish(EphemeralEvent(frame["type"], room_id, user.id, data), limiter)
+
+
+async def websocket_handler(
+    websocket: WebSocket,
+    room_id: int,
+    user: Optional[User],
+    alert_scope: AlertRepositoryScope,
+    last_alert_id: Optional[int] = None,
+    room_alert_ttl: Optional[Callable[[int], Optional[int]]] = None,
+    room_last_seq: Optional[Callable[[int], int]] = None,
+    room_members: Optional[Callable[[int], Sequence[int]]] = None
 ):
     """
     Handles WebSocket communication for a specific room.
+    
+    `user` comes from the handshake check (token and room validated
+    together); None rejects the handshake before accepting it. Alerts
+    posted to the user's rooms while they were offline come first as
+    {"mailbox": [...], "resync": bool} (resync: too many to keep, re-read
+    the rooms). With `last_alert_id` the alerts missed since then follow.
+    Alert frames may carry "ttl" (seconds); otherwise `room_alert_ttl`
+    gives the room default. Alerts carry a per-room "seq"; a client that
+    sees a gap sends {"action": "fetch", "from_seq": a, "to_seq": b}.
+    Receipt and reading are acknowledged with {"action": "ack", "seqs": [...]}
+    and {"action": "read", "seqs": [...]} (or "up_to": n for every seq up
+    to n); seqs past `room_last_seq(room_id)` are ignored.
+    Typing indicators and metric ticks, {"action": "event", "type":
+    "typing" | "metric", "data": {...}}, are never stored: they are
+    rate-limited per connection and reach the room coalesced, as
+    {"events": [...], "room_id": ...}.
+    Frames are checked against the inbound schema (presenters.inbound_frames);
+    a refused one gets {"error": "frame too large" | "invalid json" |
+    "invalid frame", "fields": [...], "room_id": ...} and the socket stays open.
+    A frame may carry "room_id" only if it is this socket's room.
+    Every read and write opens its own repository from `alert_scope`, so an
+    idle socket holds no pooled connection.
     """
-    # Verify room exists
-    room = room_repo.get_by_id(room_id)
-    if not room:
-        await websocket.accept()
-        # Using 1008 Policy Violation for "Room not found"
+    if user is None:
+        # Closing before accept() answers the upgrade with HTTP 403,
+        # no WebSocket session is ever set up. 1008 = Policy Violation
         await websocket.close(code=1008)
         return
 
-    await manager.connect(websocket)
+    if not await manager.connect(websocket, user_id=user.id, room_id=room_id):
+        return
     
-    create_alert_use_case = CreateAlertUseCase(alert_repo)
+    event_limiter = RateLimiter(settings.EPHEMERAL_RATE, settings.EPHEMERAL_BURST)
     
     try:
+        await _deliver_mailbox(websocket, user.id, alert_scope)
+        if last_alert_id is not None:
+            await _catch_up(websocket, room_id, last_alert_id, alert_scope)
         while True:
             data = await websocket.receive_text()
-            try:
-                data_json = json.loads(data)
-                message_content = data_json.get("message", "")
-                
-                if message_content:
-                    # Execute use case to save alert
-                    alert_entity = create_alert_use_case.execute(
-                        content=message_content,
-                        user_id=user.id,
-                        room_id=room_id
+            with tracer.start_trace("ws.message", room_id=room_id, user_id=user.id):
+                try:
+                    frame = parse_room_frame(data, settings.WS_MAX_FRAME_SIZE, room_id)
+                except FrameError as e:
+                    await manager.send(websocket, e.message(room_id))
+                    continue
+                action = frame.get("action")
+                if action == "fetch":
+                    await _fetch_range(websocket, room_id, frame, alert_scope)
+                elif action in ("ack", "read"):
+                    await _ack(websocket, user, room_id, frame, room_last_seq)
+                elif action == "event":
+                    _publish_event(user, room_id, frame, event_limiter)
+                else:
+                    await _submit_alert(
+                        websocket, user, room_id, frame, alert_scope, room_alert_ttl, room_members
                     )
-                    
-                    # Prepare response using schema
-                    alert_data = {
-                        "id": alert_entity.id,
-                        "content": alert_entity.content,
-                        "created_at": alert_entity.created_at.isoformat() if alert_entity.created_at else None,
-                        "user_id": alert_entity.user_id
-                    }
-                    
-                    # Broadcast to all
-                    await manager.broadcast(json.dumps(alert_data))
-            except json.JSONDecodeError:
-                # Ignore invalid JSON
-                pass
                 
+    except WebSocketDisconnect:
+        await _notify_disconnect(websocket, user)
+    except Exception as e:
+        manager.disconnect(websocket)
+        print(f"WS Error: {e}")
+
+
+async def _multiplex_frame(
+    websocket: WebSocket,
+    user: User,
+    data: str,
+    room_exists: Callable[[int], bool],
+    alert_scope: AlertRepositoryScope,
+    room_alert_ttl: Optional[Callable[[int], Optional[int]]] = None,
+    room_last_seq: Optional[Callable[[int], int]] = None,
+    room_members: Optional[Callable[[int], Sequence[int]]] = None,
+    event_limiter: Optional[RateLimiter] = None
+):
+    """Handle one frame of a multiplexed connection."""
+    try:
+        frame = parse_multiplex_frame(data, settings.WS_MAX_FRAME_SIZE)
+    except FrameError as e:
+        await manager.send(websocket, e.message())
+        return
+    
+    action = frame.get("action")
+    room_id = frame.get("room_id")
+    if room_id is None:
+        await manager.send(websocket, json.dumps({"error": "room_id required"}))
+        return
+    
+    if action == "subscribe":
+        if not await run_in_threadpool(room_exists, room_id):
+            reply = {"error": "room not found", "room_id": room_id}
+        elif not room_router.is_local(room_id):
+            # Served by another node: subscribe there
+            reply = {"redirect": room_router.redirect_url(room_id, websocket.url), "room_id": room_id}
+        elif not manager.subscribe(websocket, room_id):
+            reply = {"error": "room full", "room_id": room_id}
+        else:
+            reply = {"subscribed": room_id}
+        await manager.send(websocket, json.dumps(reply))
+        last_alert_id = frame.get("last_alert_id")
+        if "subscribed" in reply and last_alert_id is not None:
+            await _catch_up(websocket, room_id, last_alert_id, alert_scope)
+    elif action == "unsubscribe":
+        manager.unsubscribe(websocket, room_id)
+        await manager.send(websocket, json.dumps({"unsubscribed": room_id}))
+    elif room_id not in manager.rooms_of(websocket):
+        await manager.send(websocket, json.dumps({"error": "not subscribed", "room_id": room_id}))
+    elif action == "fetch":
+        await _fetch_range(websocket, room_id, frame, alert_scope)
+    elif action in ("ack", "read"):
+        await _ack(websocket, user, room_id, frame, room_last_seq)
+    elif action == "event":
+        _publish_event(user, room_id, frame, event_limiter)
+    else:
+        await _submit_alert(websocket, user, room_id, frame, alert_scope, room_alert_ttl, room_members)
+
+
+async def multiplex_handler(
+    websocket: WebSocket,
+    user: Optional[User],
+    room_exists: Callable[[int], bool],
+    alert_scope: AlertRepositoryScope,
+    room_alert_ttl: Optional[Callable[[int], Optional[int]]] = None,
+    room_last_seq: Optional[Callable[[int], int]] = None,
+    room_members: Optional[Callable[[int], Sequence[int]]] = None
+):
+    """
+    Handles one WebSocket subscribed to any number of rooms.
+    
+    Control frames:
+        {"action": "subscribe", "room_id": 1}
+        {"action": "subscribe", "room_id": 1, "last_alert_id": 42}
+        {"action": "unsubscribe", "room_id": 1}
+        {"action": "fetch", "room_id": 1, "from_seq": 10, "to_seq": 20}
+        {"action": "ack" | "read", "room_id": 1, "seqs": [21], "up_to": 20}
+        {"action": "event", "room_id": 1, "type": "typing", "data": {"active": true}}
+    Alert frames name their room: {"room_id": 1, "message": "..."}
+    (optionally "severity": "info" | "warning" | "critical" and "ttl").
+    Outbound alerts carry "room_id" so the client can route them. The
+    offline mailbox frame is sent first, as on single-room sockets.
+    Refused frames are answered with typed errors, as on single-room
+    sockets (without "room_id").
+    """
+    if user is None:
+        await websocket.close(code=1008)
+        return
+
+    if not await manager.connect(websocket, user_id=user.id):
+        return
+    
+    # One bucket for every room of the connection
+    event_limiter = RateLimiter(settings.EPHEMERAL_RATE, settings.EPHEMERAL_BURST)
+    
+    try:
+        await _deliver_mailbox(websocket, user.id, alert_scope)
+        while True:
+            data = await websocket.receive_text()
+            with tracer.start_trace("ws.multiplex_message", user_id=user.id):
+                await _multiplex_frame(
+                    websocket, user, data, room_exists, alert_scope,
+                    room_alert_ttl, room_last_seq, room_members, event_limiter
+                )
+                
+    except WebSocketDisconnect:
+        await _notify_disconnect(websocket, user)
+    except Exception as e:
+        manager.disconnect(websocket)
+        print(f"WS Error: {e}")
+
+
+async def catalog_handler(
+    websocket: WebSocket,
+    user: Optional[User],
+    epoch: Optional[str] = None,
+    version: Optional[int] = None
+):
+    """
+    Push room catalog events instead of clients polling /api/rooms.
+    
+    Frames: {"catalog": "room.created" | "room.renamed" | "room.deleted" |
+    "room.member_added" | "room.member_removed", "epoch", "version", ...}.
+    A client resuming at (epoch, version) first gets the events it missed;
+    if they are no longer available it gets {"catalog": "resync", ...} and
+    re-reads /api/rooms, whose X-Catalog-Version it then continues from.
+    """
+    if user is None:
+        await websocket.close(code=1008)
+        return
+
+    if not await manager.connect(websocket, user_id=user.id):
+        return
+    
+    # No await between reading the backlog and subscribing, so no event
+    # falls in between
+    backlog = room_catalog.since(epoch, version)
+    manager.catalog_connections.add(websocket)
+    if backlog is None:
+        await manager.send(websocket, room_catalog.resync_message())
+    else:
+        for message in backlog:
+            await manager.send(websocket, message)
+    
+    try:
+        while True:
+            # Nothing is expected from the client; keep reading to notice close
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
-        await manager.broadcast(json.dumps({"info": f"User {user.username} disconnected"}))
     except Exception as e:
         manager.disconnect(websocket)
         print(f"WS Error: {e}")
@@ -0,0 +1,118 @@
+"""Ephemeral events - Rate-limited, coalesced fan-out of disposable signals.
+
+Typing indicators and metric ticks share the alert sockets but never
+reach the repositories: they are validated, checked against the sender's
+token bucket and parked per (room, key). The first event parked for a
+room schedules one flush `interval` seconds later; events arriving in
+between overwrite their key (latest value wins), so a room gets at most
+one events frame per interval however fast its members send.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from src.entities.ephemeral_event import EphemeralEvent
+from src.frameworks_drivers import settings
+
+
+class RateLimiter:
+    """Token bucket: `rate` events per second, bursts of up to `burst`."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        """Take one token. Returns False if the bucket is empty (or rate is 0: unlimited)."""
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if tokens < 1:
+            self._tokens = tokens
+            return False
+        self._tokens = tokens - 1
+        return True
+
+
+class EphemeralEvents:
+    """Per-room latest-value-wins buffer flushed to async listeners."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._pending: Dict[int, Dict[Tuple[str, Any], EphemeralEvent]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._listeners: List[Callable[[int, List[EphemeralEvent]], object]] = []
+        self.received = 0
+        self.coalesced = 0
+        self.limited = 0
+
+    def add_listener(self, listener: Callable[[int, List[EphemeralEvent]], object]):
+        """Register an async callback(room_id, events) for each flush."""
+        self._listeners.append(listener)
+
+    def publish(self, event: EphemeralEvent, limiter: Optional[RateLimiter] = None) -> bool:
+        """
+        Park an event for its room's next flush (must run on the event loop).
+
+        Args:
+            event: Validated event
+            limiter: Sender's token bucket
+
+        Returns:
+            False if the sender is over its rate and the event was dropped
+        """
+        if limiter is not None and not limiter.allow():
+            self.limited += 1
+            return False
+        self.received += 1
+        room = self._pending.get(event.room_id)
+        if room is None:
+            room = self._pending[event.room_id] = {}
+            task = asyncio.create_task(self._flush_later(event.room_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif event.key in room:
+            self.coalesced += 1
+        room[event.key] = event
+        return True
+
+    def forget_room(self, room_id: int):
+        """Drop what a room has pending (the flush then sends nothing)."""
+        self._pending.pop(room_id, None)
+
+    def clear(self):
+        """Drop everything pending and cancel the scheduled flushes."""
+        self._pending.clear()
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        """Counters since startup plus rooms currently waiting for a flush."""
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "limited": self.limited,
+            "pending_rooms": len(self._pending)
+        }
+
+    async def _flush_later(self, room_id: int):
+        await asyncio.sleep(self.interval)
+        room = self._pending.pop(room_id, None)
+        if not room:
+            return
+        events = list(room.values())
+        try:
+            for listener in self._listeners:
+                await listener(room_id, events)
+        except Exception as e:
+            print(f"Ephemeral event flush error: {e}")
+
+
+# Global buffer, configured from settings; the WebSocket controller fans
+# its flushes out to rooms
+ephemeral_events = EphemeralEvents(interval=settings.EPHEMERAL_FLUSH_INTERVAL)
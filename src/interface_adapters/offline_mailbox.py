@@ -0,0 +1,86 @@
+"""Offline mailbox - Bounded per-user backlog of alerts posted while away.
+
+When an alert is fanned out to a room, members of the room with no open
+connection get its id queued in their mailbox; their next connection
+receives every queued alert in one frame instead of re-reading each room
+through GET /api/alerts.
+
+Only ids are kept, in one unsigned 32-bit array per user (widened to
+64 bits only once ids pass 2**32), so a mailbox costs at most
+`capacity` * 4 bytes plus the array header. A mailbox that would
+overflow is dropped and replaced by a "resync needed" flag: a user that
+far behind re-reads the rooms anyway.
+"""
+from array import array
+from typing import Dict, Iterable, Sequence, Set, Tuple
+
+# Id array type codes: 4 bytes while ids fit, 8 bytes after that
+_SMALL_IDS = "I"
+_LARGE_IDS = "q"
+
+
+def _id_array(alert_ids: Iterable[int]) -> array:
+    try:
+        return array(_SMALL_IDS, alert_ids)
+    except OverflowError:
+        return array(_LARGE_IDS, alert_ids)
+
+
+class OfflineMailbox:
+    """Per-user alert id queues, bounded, collapsing to a resync flag on overflow."""
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self._boxes: Dict[int, array] = {}
+        self._resync: Set[int] = set()
+
+    def store(self, user_ids: Iterable[int], alert_ids: Sequence[int]):
+        """Queue `alert_ids` for every user of `user_ids`."""
+        if not self.capacity or not alert_ids:
+            return
+        ids = _id_array(alert_ids)
+        large = ids.typecode == _LARGE_IDS
+        # A box already holding more than this would overflow
+        limit = self.capacity - len(ids)
+        boxes, resync = self._boxes, self._resync
+        for user_id in user_ids:
+            box = boxes.get(user_id)
+            if box is None:
+                if user_id in resync:
+                    continue
+                box = boxes[user_id] = array(ids.typecode)
+            if len(box) > limit:
+                del boxes[user_id]
+                resync.add(user_id)
+                continue
+            if box.typecode != ids.typecode:
+                if not large:
+                    box.fromlist(ids.tolist())
+                    continue
+                box = boxes[user_id] = array(_LARGE_IDS, box)
+            box.extend(ids)
+
+    def take(self, user_id: int) -> Tuple[array, bool]:
+        """Empty a user's mailbox: (queued alert ids, whether a resync is needed)."""
+        if user_id in self._resync:
+            self._resync.discard(user_id)
+            return array(_SMALL_IDS), True
+        return self._boxes.pop(user_id, array(_SMALL_IDS)), False
+
+    def __len__(self) -> int:
+        """Number of users with something waiting."""
+        return len(self._boxes) + len(self._resync)
+
+    def stats(self) -> dict:
+        """Mailboxes, queued ids, flagged users and bytes of queued ids."""
+        return {
+            "mailboxes": len(self._boxes),
+            "alert_ids": sum(len(box) for box in self._boxes.values()),
+            "resync": len(self._resync),
+            "bytes": sum(box.buffer_info()[1] * box.itemsize for box in self._boxes.values())
+        }
+
+    def clear(self):
+        """Drop every mailbox."""
+        self._boxes.clear()
+        self._resync.clear()
@@ -0,0 +1,207 @@
+"""Inbound frames - Precompiled schema of the frames clients send over WebSockets.
+
+Every frame is decoded and validated by one TypeAdapter.validate_json
+call: pydantic-core parses the JSON and checks it against the TypedDict
+of its action in the same pass, so no intermediate dict is walked in
+Python. Frames longer than the configured size are refused before any
+parsing. A rejected frame raises FrameError, which the controller sends
+back as {"error": ..., "fields": [{"loc": ..., "type": ...}]} ("type" is
+the pydantic error type, e.g. "string_too_long").
+
+Fields are strict (no "5" for 5, no true for 1) and unknown keys are
+ignored. On a single-room socket a frame may repeat the socket's room_id;
+any other room_id is refused ("type": "room_mismatch").
+"""
+import json
+from typing import Any, List, Literal, Optional, Union
+from typing_extensions import Annotated, NotRequired, TypedDict
+from pydantic import ConfigDict, Discriminator, Field, Tag, TypeAdapter, ValidationError
+from src.entities.ephemeral_event import EVENT_METRIC, EVENT_TYPING, MAX_METRIC_NAME_LENGTH
+from src.frameworks_drivers import settings
+
+# AlertORM.content is String(200), AlertORM.client_msg_id String(64)
+MAX_CONTENT_LENGTH = 200
+MAX_CLIENT_MSG_ID_LENGTH = 64
+# Seqs accepted in one ack frame
+MAX_ACK_SEQS = 1000
+
+# FrameError kinds
+FRAME_TOO_LARGE = "frame too large"
+INVALID_JSON = "invalid json"
+INVALID_FRAME = "invalid frame"
+# Field error type of a room_id other than the socket's
+ROOM_MISMATCH = "room_mismatch"
+
+_STRICT = ConfigDict(strict=True)
+
+RoomId = Annotated[int, Field(gt=0)]
+Seq = Annotated[int, Field(gt=0)]
+
+
+class AlertFrame(TypedDict):
+    """{"message": "..."}: an alert to store and fan out (no "action")."""
+    __pydantic_config__ = _STRICT
+    message: Annotated[str, Field(min_length=1, max_length=MAX_CONTENT_LENGTH)]
+    room_id: NotRequired[RoomId]
+    client_msg_id: NotRequired[Annotated[str, Field(max_length=MAX_CLIENT_MSG_ID_LENGTH)]]
+    severity: NotRequired[Literal["info", "warning", "critical"]]
+    ttl: NotRequired[Annotated[int, Field(gt=0, le=settings.ALERT_MAX_TTL)]]
+
+
+class FetchFrame(TypedDict):
+    """{"action": "fetch", "from_seq": a, "to_seq": b}."""
+    __pydantic_config__ = _STRICT
+    action: Literal["fetch"]
+    room_id: NotRequired[RoomId]
+    from_seq: Seq
+    to_seq: Seq
+
+
+class AckFrame(TypedDict):
+    """{"action": "ack" | "read", "seqs": [...], "up_to": n}."""
+    __pydantic_config__ = _STRICT
+    action: Literal["ack", "read"]
+    room_id: NotRequired[RoomId]
+    seqs: NotRequired[Annotated[List[int], Field(max_length=MAX_ACK_SEQS)]]
+    up_to: NotRequired[int]
+
+
+class TypingData(TypedDict):
+    __pydantic_config__ = _STRICT
+    active: NotRequired[bool]
+
+
+class MetricData(TypedDict):
+    __pydantic_config__ = _STRICT
+    name: Annotated[str, Field(min_length=1, max_length=MAX_METRIC_NAME_LENGTH)]
+    value: Annotated[float, Field(allow_inf_nan=False)]
+
+
+class TypingFrame(TypedDict):
+    """{"action": "event", "type": "typing", "data": {"active": bool}}."""
+    __pydantic_config__ = _STRICT
+    action: Literal["event"]
+    type: Literal["typing"]
+    room_id: NotRequired[RoomId]
+    data: NotRequired[TypingData]
+
+
+class MetricFrame(TypedDict):
+    """{"action": "event", "type": "metric", "data": {"name": str, "value": number}}."""
+    __pydantic_config__ = _STRICT
+    action: Literal["event"]
+    type: Literal["metric"]
+    room_id: NotRequired[RoomId]
+    data: MetricData
+
+
+class SubscribeFrame(TypedDict):
+    """{"action": "subscribe", "room_id": 1, "last_alert_id": 42} (multiplexed only)."""
+    __pydantic_config__ = _STRICT
+    action: Literal["subscribe"]
+    room_id: RoomId
+    last_alert_id: NotRequired[int]
+
+
+class UnsubscribeFrame(TypedDict):
+    """{"action": "unsubscribe", "room_id": 1} (multiplexed only)."""
+    __pydantic_config__ = _STRICT
+    action: Literal["unsubscribe"]
+    room_id: RoomId
+
+
+def _frame_tag(value: Any) -> Optional[str]:
+    """Union tag of a decoded frame: its action, or its event type for events."""
+    if not isinstance(value, dict):
+        return None
+    action = value.get("action", "message")
+    if action == "read":
+        return "ack"
+    if action == "event":
+        return f"event:{value.get('type')}"
+    return action if isinstance(action, str) else None
+
+
+_ROOM_FRAMES = (
+    Annotated[AlertFrame, Tag("message")],
+    Annotated[FetchFrame, Tag("fetch")],
+    Annotated[AckFrame, Tag("ack")],
+    Annotated[TypingFrame, Tag(f"event:{EVENT_TYPING}")],
+    Annotated[MetricFrame, Tag(f"event:{EVENT_METRIC}")]
+)
+_MULTIPLEX_FRAMES = _ROOM_FRAMES + (
+    Annotated[SubscribeFrame, Tag("subscribe")],
+    Annotated[UnsubscribeFrame, Tag("unsubscribe")]
+)
+# Built once at import
+_room_frame = TypeAdapter(Annotated[Union[_ROOM_FRAMES], Discriminator(_frame_tag)])
+_multiplex_frame = TypeAdapter(Annotated[Union[_MULTIPLEX_FRAMES], Discriminator(_frame_tag)])
+
+
+class FrameError(Exception):
+    """Inbound frame refused before reaching a handler."""
+
+    def __init__(self, error: str, fields: Optional[List[dict]] = None, limit: Optional[int] = None):
+        super().__init__(error)
+        self.error = error
+        self.fields = fields or []
+        self.limit = limit
+
+    def message(self, room_id: Optional[int] = None) -> str:
+        """Encode the error frame sent back to the client."""
+        reply = {"error": self.error}
+        if self.fields:
+            reply["fields"] = self.fields
+        if self.limit is not None:
+            reply["limit"] = self.limit
+        if room_id is not None:
+            reply["room_id"] = room_id
+        return json.dumps(reply)
+
+
+def _fields(error: ValidationError) -> List[dict]:
+    fields = []
+    for detail in error.errors(include_url=False, include_context=False, include_input=False):
+        # The first loc item is the union tag; tag errors are about the action
+        loc = ".".join(str(part) for part in detail["loc"][1:]) or "action"
+        fields.append({"loc": loc, "type": detail["type"]})
+    return fields
+
+
+def _parse(adapter: TypeAdapter, data: str, max_size: int) -> dict:
+    if max_size and len(data) > max_size:
+        raise FrameError(FRAME_TOO_LARGE, limit=max_size)
+    try:
+        return adapter.validate_json(data)
+    except ValidationError as e:
+        fields = _fields(e)
+        if any(field["type"] == "json_invalid" for field in fields):
+            raise FrameError(INVALID_JSON) from None
+        raise FrameError(INVALID_FRAME, fields) from None
+
+
+def parse_room_frame(data: str, max_size: int = 0, room_id: Optional[int] = None) -> dict:
+    """
+    Decode and validate a frame of a single-room connection.
+
+    Args:
+        data: Text frame as received
+        max_size: Longest frame accepted, in characters (0 = no limit)
+        room_id: Room of the socket; a frame naming another room is refused
+
+    Returns:
+        One of the frame TypedDicts above
+
+    Raises:
+        FrameError: The frame is too large, not JSON, not a valid frame
+            or for another room
+    """
+    frame = _parse(_room_frame, data, max_size)
+    if room_id is not None and frame.get("room_id", room_id) != room_id:
+        raise FrameError(INVALID_FRAME, [{"loc": "room_id", "type": ROOM_MISMATCH}])
+    return frame
+
+
+def parse_multiplex_frame(data: str, max_size: int = 0) -> dict:
+    """Like parse_room_frame(), also accepting subscribe/unsubscribe frames."""
+    return _parse(_multiplex_frame, data, max_size)
@@ -1,7 +1,8 @@
 """Pydantic schemas for API request/response."""
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Tuple
 from datetime import datetime
+from src.frameworks_drivers import settings
 
 
 class UserBase(BaseModel):
@@ -27,6 +28,9 @@ class Alert(AlertBase):
     id: int
     created_at: datetime
     user_id: int
+    severity: str = "info"
+    expires_at: Optional[datetime] = None
+    seq: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -41,12 +45,73 @@ class Room(RoomBase):
     """Room response schema."""
     id: int
     users: List[User] = []
+    alert_ttl: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class RoomSummary(RoomBase):
+    """Room response schema for create/rename (member ids only)."""
+    id: int
+    user_ids: List[int] = []
+    alert_ttl: Optional[int] = None
     
     class Config:
         from_attributes = True
 
 
 # Schemas for Request Body
+class AlertCreateRequest(BaseModel):
+    """Alert item of a batch ingest request."""
+    # AlertORM.content is String(200)
+    content: str = Field(min_length=1, max_length=200)
+    severity: Literal["info", "warning", "critical"] = "info"
+    # Seconds until the alert expires; the room default applies if omitted
+    ttl: Optional[int] = Field(None, gt=0, le=settings.ALERT_MAX_TTL)
+
+
+class RoomNameRequest(BaseModel):
+    """Create or rename room request schema."""
+    # RoomORM.name is String(60)
+    name: str = Field(min_length=1, max_length=60)
+
+
+class RoomAlertTTLRequest(BaseModel):
+    """Room default alert TTL request schema (null = alerts never expire)."""
+    alert_ttl: Optional[int] = Field(None, gt=0, le=settings.ALERT_MAX_TTL)
+
+
+class ClusterNodesRequest(BaseModel):
+    """New cluster node list (base URLs such as http://10.0.0.5:8000)."""
+    nodes: List[str]
+
+
+class RoomHandoff(BaseModel):
+    """In-memory state of a room moving to another node."""
+    room_id: int
+    last_alert_id: Optional[int] = None
+    # Last allocated per-room seq
+    seq: Optional[int] = None
+    # Ring buffer of (alert id, encoded frame), oldest first
+    recent: List[Tuple[int, str]] = []
+
+
+class UnreadCount(BaseModel):
+    """Alerts of a room the current user has not read."""
+    room_id: int
+    last_seq: int
+    unread: int
+
+
+class UnackedUsers(BaseModel):
+    """Members that have not acknowledged a critical alert."""
+    room_id: int
+    seq: int
+    kind: Literal["delivered", "read"]
+    user_ids: List[int]
+
+
 class LoginRequest(BaseModel):
     """Login request schema."""
     username: str
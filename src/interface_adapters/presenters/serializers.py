@@ -0,0 +1,165 @@
+"""Precompiled JSON serializers for list endpoints.
+
+Entities are dumped straight to JSON bytes by pydantic-core serializers
+built once at import. Nothing is validated per request: the output shape
+is the one of the response schemas, which benchmarks/bench_list_serialization.py
+checks against the response_model path.
+"""
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional
+from typing_extensions import TypedDict
+from pydantic import TypeAdapter
+from src.entities.alert import Alert as AlertEntity
+from src.entities.alert_batch import AlertBatch
+from src.entities.ephemeral_event import EphemeralEvent
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+
+class AlertPayload(TypedDict):
+    """Serialized form of schemas.Alert."""
+    id: int
+    content: str
+    created_at: Optional[datetime]
+    user_id: int
+    severity: str
+    expires_at: Optional[datetime]
+    seq: Optional[int]
+
+
+class UserPayload(TypedDict):
+    """Serialized form of schemas.User."""
+    username: str
+    id: int
+
+
+class RoomPayload(TypedDict):
+    """Serialized form of schemas.Room."""
+    name: str
+    id: int
+    users: List[UserPayload]
+    alert_ttl: Optional[int]
+
+
+# Flat TypedDict rows serialize about twice as fast as dumping the
+# dataclasses with an include filter
+_alert_list = TypeAdapter(List[AlertPayload])
+_room_list = TypeAdapter(List[RoomPayload])
+
+
+def alerts_to_json(alerts: List[AlertEntity]) -> bytes:
+    """Serialize alert entities to the JSON of List[schemas.Alert]."""
+    payload = [
+        {
+            "id": alert.id,
+            "content": alert.content,
+            "created_at": alert.created_at,
+            "user_id": alert.user_id,
+            "severity": alert.severity,
+            "expires_at": alert.expires_at,
+            "seq": alert.seq
+        }
+        for alert in alerts
+    ]
+    return _alert_list.dump_json(payload)
+
+
+def rooms_to_json(rooms: Iterable) -> bytes:
+    """Serialize rooms (with loaded users) to the JSON of List[schemas.Room]."""
+    payload = [
+        {
+            "name": room.name,
+            "id": room.id,
+            "users": [{"username": user.username, "id": user.id} for user in room.users],
+            "alert_ttl": room.alert_ttl
+        }
+        for room in rooms
+    ]
+    return _room_list.dump_json(payload)
+
+
+def _alert_batch_columns(batch: AlertBatch) -> dict:
+    """Columnar payload: one list per column, created_at in epoch microseconds."""
+    return {
+        "room_id": batch.room_id,
+        "count": len(batch),
+        "id": batch.ids.tolist(),
+        "user_id": batch.user_ids.tolist(),
+        "created_at": batch.created_at.tolist(),
+        "content": list(batch.contents()),
+        "severity": list(batch.severities()),
+        "seq": batch.seqs.tolist()
+    }
+
+
+def alert_batch_to_json(batch: AlertBatch) -> bytes:
+    """Serialize a columnar alert batch to JSON."""
+    return json.dumps(
+        _alert_batch_columns(batch), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def alert_batch_to_msgpack(batch: AlertBatch) -> bytes:
+    """Serialize a columnar alert batch to MessagePack (requires msgpack)."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(_alert_batch_columns(batch))
+
+
+def _alert_dict(alert: AlertEntity) -> dict:
+    """Real-time representation of an alert."""
+    return {
+        "id": alert.id,
+        "content": alert.content,
+        "created_at": alert.created_at.isoformat() if alert.created_at else None,
+        "user_id": alert.user_id,
+        "room_id": alert.room_id,
+        "severity": alert.severity,
+        "expires_at": alert.expires_at.isoformat() if alert.expires_at else None,
+        "seq": alert.seq
+    }
+
+
+def alert_message(alert: AlertEntity) -> str:
+    """Encode one alert as the real-time message pushed to subscribers."""
+    return json.dumps(_alert_dict(alert))
+
+
+def alerts_message(room_id: int, alerts: List[AlertEntity]) -> str:
+    """Encode many alerts of a room as one coalesced real-time message."""
+    return json.dumps({
+        "room_id": room_id,
+        "alerts": [_alert_dict(alert) for alert in alerts]
+    })
+
+
+def alerts_range_message(room_id: int, from_seq: int, to_seq: int, alerts: List[AlertEntity]) -> str:
+    """Encode the reply to a seq range request."""
+    return json.dumps({
+        "room_id": room_id,
+        "range": [from_seq, to_seq],
+        "alerts": [_alert_dict(alert) for alert in alerts]
+    })
+
+
+def mailbox_message(alerts: List[AlertEntity], resync: bool) -> str:
+    """Encode the alerts queued for a user while offline (any rooms)."""
+    return json.dumps({
+        "mailbox": [_alert_dict(alert) for alert in alerts],
+        "resync": resync
+    })
+
+
+def events_message(room_id: int, events: List[EphemeralEvent]) -> str:
+    """Encode the coalesced ephemeral events of a room as one message."""
+    return json.dumps({
+        "room_id": room_id,
+        "events": [
+            {"type": event.type, "user_id": event.user_id, "data": event.data}
+            for event in events
+        ]
+    })
@@ -0,0 +1,262 @@
+"""Ack states - Per-room delivery and read state held as compressed bitmaps.
+
+Clients acknowledge alerts by seq. Every (room, user, kind) keeps a
+ReadState (a floor plus a SeqBitmap of out-of-order seqs), so the unread
+count of a user in a room is one subtraction. Critical alerts are also
+indexed the other way around, (room, seq, kind) -> SeqBitmap of the user
+ids that acknowledged them, which answers "who has not acked alert X"
+with one bit test per member.
+
+State lives in memory and is written back periodically: only entries
+changed since the last flush are rewritten, one row each with the
+encoded bitmap.
+"""
+import asyncio
+import threading
+from bisect import bisect_right, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from src.entities.read_state import ACK_DELIVERED, ACK_KINDS, ACK_READ, ReadState
+from src.entities.seq_bitmap import SeqBitmap
+from src.frameworks_drivers.db.orm_models import AckStateORM, AlertAckORM
+from src.interface_adapters.repositories.repository_interfaces import AckStateInterface
+
+# (room_id, user_id, kind)
+StateKey = Tuple[int, int, str]
+# (room_id, seq, kind)
+AlertKey = Tuple[int, int, str]
+
+# Rows per DELETE/INSERT statement when flushing
+_FLUSH_CHUNK = 500
+
+
+class AckStates(AckStateInterface):
+    """Thread-safe store of acknowledgements, flushed to the database in the background."""
+
+    def __init__(self):
+        self._states: Dict[StateKey, ReadState] = {}
+        self._alert_acks: Dict[AlertKey, SeqBitmap] = {}
+        # Seqs of the tracked (critical) alerts per room, sorted
+        self._tracked: Dict[int, List[int]] = {}
+        self._dirty_states: Set[StateKey] = set()
+        self._dirty_alerts: Set[AlertKey] = set()
+        self._lock = threading.Lock()
+        self._flush: Optional[Callable[[], int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def track(self, room_id: int, seq: int):
+        """Record who acknowledges an alert (done for critical alerts)."""
+        with self._lock:
+            tracked = self._tracked.setdefault(room_id, [])
+            if (room_id, seq, ACK_READ) in self._alert_acks:
+                return
+            if not tracked or tracked[-1] < seq:
+                tracked.append(seq)
+            else:
+                insort(tracked, seq)
+            for kind in ACK_KINDS:
+                key = (room_id, seq, kind)
+                self._alert_acks[key] = SeqBitmap()
+                self._dirty_alerts.add(key)
+
+    def ack(
+        self,
+        room_id: int,
+        user_id: int,
+        kind: str,
+        seqs: Iterable[int] = (),
+        up_to: Optional[int] = None
+    ) -> int:
+        """
+        Record acknowledgements of a user in a room.
+
+        Args:
+            room_id: Room ID
+            user_id: User ID
+            kind: ACK_DELIVERED, or ACK_READ (which implies delivery)
+            seqs: Acknowledged seqs
+            up_to: Also acknowledge every seq up to this one
+
+        Returns:
+            Number of seqs newly acknowledged for `kind`
+        """
+        seqs = list(seqs)
+        kinds = (ACK_DELIVERED, ACK_READ) if kind == ACK_READ else (ACK_DELIVERED,)
+        newly_acked = 0
+        with self._lock:
+            tracked = self._tracked.get(room_id, ())
+            for each_kind in kinds:
+                key = (room_id, user_id, each_kind)
+                state = self._states.get(key)
+                if state is None:
+                    state = self._states[key] = ReadState()
+                count = 0
+                # Tracked seqs this call acknowledges
+                reached: List[int] = []
+                if up_to is not None and up_to > state.floor:
+                    window = tracked[bisect_right(tracked, state.floor):bisect_right(tracked, up_to)]
+                    reached.extend(seq for seq in window if seq not in state.above)
+                    before = len(state)
+                    state.add_up_to(up_to)
+                    count += len(state) - before
+                for seq in seqs:
+                    if state.add(seq):
+                        count += 1
+                        reached.append(seq)
+                for seq in reached:
+                    alert_key = (room_id, seq, each_kind)
+                    users = self._alert_acks.get(alert_key)
+                    if users is not None and users.add(user_id):
+                        self._dirty_alerts.add(alert_key)
+                if count:
+                    self._dirty_states.add(key)
+                if each_kind == kind:
+                    newly_acked = count
+        return newly_acked
+
+    def unread(self, room_id: int, user_id: int, last_seq: int) -> int:
+        """Seqs up to `last_seq` the user has not read."""
+        state = self._states.get((room_id, user_id, ACK_READ))
+        if state is None:
+            return last_seq
+        return max(0, last_seq - len(state))
+
+    def unacked(self, room_id: int, seq: int, kind: str, members: Iterable[int]) -> Optional[List[int]]:
+        """Members that have not acknowledged a tracked alert, None if it is not tracked."""
+        users = self._alert_acks.get((room_id, seq, kind))
+        if users is None:
+            return None
+        return [user_id for user_id in members if user_id not in users]
+
+    def forget_room(self, room_id: int):
+        """Drop the state of a deleted room (its rows go with the room)."""
+        with self._lock:
+            self._tracked.pop(room_id, None)
+            for store, dirty in ((self._states, self._dirty_states), (self._alert_acks, self._dirty_alerts)):
+                for key in [key for key in store if key[0] == room_id]:
+                    del store[key]
+                    dirty.discard(key)
+
+    def clear(self):
+        """Drop every state (nothing is flushed)."""
+        with self._lock:
+            self._states.clear()
+            self._alert_acks.clear()
+            self._tracked.clear()
+            self._dirty_states.clear()
+            self._dirty_alerts.clear()
+
+    def load(self, db: Session) -> int:
+        """
+        Load every stored state, e.g. at startup.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rows loaded
+        """
+        rows = 0
+        states = db.execute(select(
+            AckStateORM.room_id, AckStateORM.user_id, AckStateORM.kind, AckStateORM.floor, AckStateORM.above
+        )).all()
+        alert_acks = db.execute(select(
+            AlertAckORM.room_id, AlertAckORM.seq, AlertAckORM.kind, AlertAckORM.users
+        )).all()
+        with self._lock:
+            for room_id, user_id, kind, floor, above in states:
+                self._states[(room_id, user_id, kind)] = ReadState(floor, SeqBitmap.from_bytes(above))
+                rows += 1
+            for room_id, seq, kind, users in alert_acks:
+                self._alert_acks[(room_id, seq, kind)] = SeqBitmap.from_bytes(users)
+                if kind == ACK_READ:
+                    self._tracked.setdefault(room_id, []).append(seq)
+                rows += 1
+            for tracked in self._tracked.values():
+                tracked.sort()
+        return rows
+
+    def flush(self, db: Session) -> int:
+        """
+        Write the entries changed since the last flush.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            states = [
+                (key, self._states[key].floor, self._states[key].above.to_bytes())
+                for key in self._dirty_states if key in self._states
+            ]
+            alert_acks = [
+                (key, self._alert_acks[key].to_bytes())
+                for key in self._dirty_alerts if key in self._alert_acks
+            ]
+            self._dirty_states.clear()
+            self._dirty_alerts.clear()
+        if not states and not alert_acks:
+            return 0
+        state_columns = (AckStateORM.room_id, AckStateORM.user_id, AckStateORM.kind)
+        alert_columns = (AlertAckORM.room_id, AlertAckORM.seq, AlertAckORM.kind)
+        try:
+            for start in range(0, len(states), _FLUSH_CHUNK):
+                chunk = states[start:start + _FLUSH_CHUNK]
+                db.execute(delete(AckStateORM).where(tuple_(*state_columns).in_([key for key, _, _ in chunk])))
+                db.execute(insert(AckStateORM.__table__), [
+                    {"room_id": room_id, "user_id": user_id, "kind": kind, "floor": floor, "above": above}
+                    for (room_id, user_id, kind), floor, above in chunk
+                ])
+            for start in range(0, len(alert_acks), _FLUSH_CHUNK):
+                chunk = alert_acks[start:start + _FLUSH_CHUNK]
+                db.execute(delete(AlertAckORM).where(tuple_(*alert_columns).in_([key for key, _ in chunk])))
+                db.execute(insert(AlertAckORM.__table__), [
+                    {"room_id": room_id, "seq": seq, "kind": kind, "users": users}
+                    for (room_id, seq, kind), users in chunk
+                ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Write them again next time
+            with self._lock:
+                self._dirty_states.update(key for key, _, _ in states)
+                self._dirty_alerts.update(key for key, _ in alert_acks)
+            raise
+        return len(states) + len(alert_acks)
+
+    def start(self, flush: Callable[[], int], interval: float):
+        """Run `flush()` (in a thread) every `interval` seconds and on stop()."""
+        self._flush = flush
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the periodic flush and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flush is not None:
+            await self._flush_once()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self._flush_once()
+
+    async def _flush_once(self):
+        try:
+            await run_in_threadpool(self._flush)
+        except Exception as e:
+            print(f"Ack state flush error: {e}")
+
+
+# Global store, loaded and flushed by the application lifespan
+ack_states = AckStates()
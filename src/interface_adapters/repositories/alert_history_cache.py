@@ -0,0 +1,166 @@
+"""Alert history cache - Serialized alert lists per room, keyed by room version.
+
+A room's alert list only changes when an alert is created, expires or the
+room is deleted; each of those bumps the room's version. GET /api/alerts
+responses are kept as the bytes already sent, keyed by (room, cursor)
+and tagged with the version they were built at, so until the next bump
+a reload is a dictionary lookup. The ETag is a hash of those bytes:
+identical on every worker, and a client revalidating with If-None-Match
+gets a 304 without the body being rebuilt.
+
+Writes done by another process (uvicorn workers sharing the database,
+or a node that does not own the room) do not bump this process's
+versions; `max_age` bounds how long such an entry can be served.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+from src.frameworks_drivers import settings
+from src.interface_adapters.alert_expiry import alert_expiry
+
+# Cursors (seq ranges) cached per room; the oldest is dropped past that
+_MAX_CURSORS_PER_ROOM = 16
+
+
+class CachedResponse(NamedTuple):
+    """Response body built at `version` of its room."""
+    version: int
+    etag: str
+    body: bytes
+    # time.monotonic() after which it is rebuilt even without a bump
+    expires: float
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+class AlertHistoryCache:
+    """Thread-safe per-room version counters plus an LRU of response bodies."""
+
+    def __init__(self, max_bytes: int = 64 << 20, max_age: float = 60.0):
+        # 0 disables caching (versions are still counted)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._versions: Dict[int, int] = {}
+        # room_id -> cursor -> response, least recently used room first
+        self._rooms: "OrderedDict[int, Dict[Hashable, CachedResponse]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, room_id: int) -> int:
+        """Current version of a room (0 until its first bump)."""
+        with self._lock:
+            return self._versions.get(room_id, 0)
+
+    def bump(self, room_id: int):
+        """Record a change to a room's alerts; its cached responses are dropped."""
+        with self._lock:
+            self._versions[room_id] = self._versions.get(room_id, 0) + 1
+            self._drop(room_id)
+
+    def bump_many(self, room_ids: List[int]):
+        """bump() every room of `room_ids`."""
+        for room_id in set(room_ids):
+            self.bump(room_id)
+
+    def get(self, room_id: int, cursor: Hashable) -> Optional[CachedResponse]:
+        """Cached response of (room, cursor) if it is still current."""
+        with self._lock:
+            cursors = self._rooms.get(room_id)
+            entry = cursors.get(cursor) if cursors is not None else None
+            if (
+                entry is None
+                or entry.version != self._versions.get(room_id, 0)
+                or entry.expires < time.monotonic()
+            ):
+                self.misses += 1
+                return None
+            self._rooms.move_to_end(room_id)
+            self.hits += 1
+            return entry
+
+    def put(self, room_id: int, cursor: Hashable, version: int, body: bytes) -> CachedResponse:
+        """
+        Cache a response built at `version` (read before the query).
+
+        Args:
+            room_id: Room ID
+            cursor: What the request selected within the room
+            version: Room version read before the alerts were queried
+            body: Serialized response
+
+        Returns:
+            The response with its ETag; it is not stored if the room
+            changed meanwhile or it does not fit the cache
+        """
+        entry = CachedResponse(version, make_etag(body), body, time.monotonic() + self.max_age)
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if version != self._versions.get(room_id, 0):
+                return entry
+            cursors = self._rooms.get(room_id)
+            if cursors is None:
+                cursors = self._rooms[room_id] = {}
+            else:
+                self._rooms.move_to_end(room_id)
+            old = cursors.pop(cursor, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            elif len(cursors) >= _MAX_CURSORS_PER_ROOM:
+                oldest = next(iter(cursors))
+                self._bytes -= len(cursors.pop(oldest).body)
+            cursors[cursor] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                oldest_room = next(iter(self._rooms))
+                self._drop(oldest_room)
+        return entry
+
+    def forget_room(self, room_id: int):
+        """Drop a deleted room (its version keeps counting, so no stale put lands)."""
+        self.bump(room_id)
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._rooms.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses and what is held."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rooms": len(self._rooms),
+                "responses": sum(len(cursors) for cursors in self._rooms.values()),
+                "bytes": self._bytes
+            }
+
+    def _drop(self, room_id: int):
+        """Remove the responses of a room (lock held)."""
+        cursors = self._rooms.pop(room_id, None)
+        if cursors:
+            self._bytes -= sum(len(entry.body) for entry in cursors.values())
+
+
+# Global cache, configured from settings; bumped by the alert and room
+# repositories and by expiry
+alert_history_cache = AlertHistoryCache(
+    max_bytes=settings.ALERT_CACHE_MAX_BYTES,
+    max_age=settings.ALERT_CACHE_MAX_AGE
+)
+
+
+async def _expired(room_id: int, alert_ids: List[int]):
+    alert_history_cache.bump(room_id)
+
+
+alert_expiry.add_listener(_expired)
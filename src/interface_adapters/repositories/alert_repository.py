@@ -1,10 +1,36 @@
 """Alert Repository implementation with SQLAlchemy."""
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+from sqlalchemy import String, delete, func, insert, or_, select, type_coerce
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from src.entities.alert import Alert
-from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
+from src.entities.alert import Alert, SEVERITY_CRITICAL, utcnow
+from src.entities.alert_batch import AlertBatch, SEVERITY_CODES, epoch_micros
+from src.interface_adapters.alert_expiry import alert_expiry
+from src.interface_adapters.tracing import tracer
+from src.interface_adapters.repositories.repository_interfaces import (
+    AlertRepositoryInterface,
+    DuplicateAlertError
+)
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.alert_history_cache import alert_history_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
 from src.frameworks_drivers.db.orm_models import AlertORM
 
+# Inserts retried after another worker took the same (room_id, seq)
+_SEQ_ATTEMPTS = 3
+
+
+def _not_expired():
+    """Filter hiding expired alerts the expiry engine has not deleted yet."""
+    return or_(AlertORM.expires_at.is_(None), AlertORM.expires_at > utcnow())
+
+
+def _is_seq_conflict(error: IntegrityError) -> bool:
+    """Whether an insert failed on uq_alerts_room_seq."""
+    return "alerts.seq" in str(error.orig)
+
 
 class SQLAlertRepository(AlertRepositoryInterface):
     """SQLAlchemy implementation of AlertRepositoryInterface."""
@@ -12,25 +38,212 @@ class SQLAlertRepository(AlertRepositoryInterface):
     def __init__(self, db: Session):
         self.db = db
     
+    @tracer.traced("db.alerts.get_all")
     def get_all(self, room_id: Optional[int] = None) -> List[Alert]:
         """Get all alerts, optionally filtered by room_id."""
-        query = self.db.query(AlertORM)
+        query = self.db.query(AlertORM).filter(_not_expired())
         if room_id:
-            query = query.filter(AlertORM.room_id == room_id)
-        alert_orms = query.order_by(AlertORM.created_at).all()
+            query = query.filter(AlertORM.room_id == room_id).order_by(AlertORM.seq)
+        else:
+            query = query.order_by(AlertORM.created_at)
+        return [self._to_entity(alert_orm) for alert_orm in query.all()]
+    
+    @tracer.traced("db.alerts.get_after")
+    def get_after(self, room_id: int, after_id: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with id > after_id, oldest first."""
+        alert_orms = self.db.query(AlertORM).filter(
+            AlertORM.room_id == room_id,
+            AlertORM.id > after_id,
+            _not_expired()
+        ).order_by(AlertORM.id).limit(limit).all()
         return [self._to_entity(alert_orm) for alert_orm in alert_orms]
     
+    @tracer.traced("db.alerts.get_range")
+    def get_range(self, room_id: int, from_seq: int, to_seq: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with from_seq <= seq <= to_seq, in seq order."""
+        alert_orms = self.db.query(AlertORM).filter(
+            AlertORM.room_id == room_id,
+            AlertORM.seq.between(from_seq, to_seq),
+            _not_expired()
+        ).order_by(AlertORM.seq).limit(limit).all()
+        return [self._to_entity(alert_orm) for alert_orm in alert_orms]
+    
+    @tracer.traced("db.alerts.get_many")
+    def get_many(self, alert_ids: List[int]) -> List[Alert]:
+        """Get the alerts with the given ids that still exist, in id order."""
+        if not alert_ids:
+            return []
+        alert_orms = self.db.query(AlertORM).filter(
+            AlertORM.id.in_(alert_ids),
+            _not_expired()
+        ).order_by(AlertORM.id).all()
+        return [self._to_entity(alert_orm) for alert_orm in alert_orms]
+    
+    @tracer.traced("db.alerts.get_batch")
+    def get_batch(self, room_id: Optional[int] = None) -> AlertBatch:
+        """Get all alerts as a columnar batch, optionally filtered by room_id."""
+        # Core select of plain columns: no ORM identity map, no entities.
+        # created_at is read raw to skip the DateTime result processor, and
+        # executing on the connection streams rows from the cursor instead
+        # of buffering them all in an ORM result
+        query = select(
+            AlertORM.id,
+            AlertORM.user_id,
+            type_coerce(AlertORM.created_at, String),
+            AlertORM.content,
+            AlertORM.severity,
+            AlertORM.seq
+        ).where(_not_expired())
+        if room_id:
+            query = query.where(AlertORM.room_id == room_id).order_by(AlertORM.seq)
+        else:
+            query = query.order_by(AlertORM.created_at)
+        rows = self.db.connection().execute(query)
+        
+        batch = AlertBatch(room_id=room_id)
+        to_micros = self._to_epoch_micros
+        codes = SEVERITY_CODES
+        for alert_id, user_id, created_at, content, severity, seq in rows:
+            batch.append(
+                alert_id, user_id or 0, to_micros(created_at), content or "", codes.get(severity, 0), seq or 0
+            )
+        return batch
+    
+    @tracer.traced("db.alerts.get_by_client_msg_id")
+    def get_by_client_msg_id(self, user_id: int, client_msg_id: str) -> Optional[Alert]:
+        """Get the alert a user submitted with a given client message ID."""
+        alert_orm = self.db.query(AlertORM).filter(
+            AlertORM.user_id == user_id,
+            AlertORM.client_msg_id == client_msg_id
+        ).first()
+        if not alert_orm:
+            return None
+        return self._to_entity(alert_orm)
+    
+    @tracer.traced("db.alerts.create")
     def create(self, alert: Alert) -> Alert:
         """Create a new alert."""
-        alert_orm = AlertORM(
-            content=alert.content,
-            user_id=alert.user_id,
-            room_id=alert.room_id
-        )
-        self.db.add(alert_orm)
+        # created_at and seq are set here and the id comes back through
+        # RETURNING, so no refresh() SELECT follows the insert
+        created_at = alert.created_at or utcnow()
+        table = AlertORM.__table__
+        for attempt in range(_SEQ_ATTEMPTS):
+            seq = room_sequences.next(alert.room_id, self._max_seq)
+            try:
+                alert_id = self.db.execute(
+                    insert(table).values(
+                        content=alert.content,
+                        user_id=alert.user_id,
+                        room_id=alert.room_id,
+                        created_at=created_at,
+                        client_msg_id=alert.client_msg_id,
+                        severity=alert.severity,
+                        expires_at=alert.expires_at,
+                        seq=seq
+                    ).returning(table.c.id)
+                ).scalar_one()
+                self.db.commit()
+                break
+            except IntegrityError as e:
+                self.db.rollback()
+                if _is_seq_conflict(e) and attempt + 1 < _SEQ_ATTEMPTS:
+                    # Another worker took it: catch up with the table
+                    room_sequences.reseed(alert.room_id, self._max_seq(alert.room_id))
+                    continue
+                room_sequences.release(alert.room_id, seq)
+                existing = None
+                if alert.client_msg_id is not None:
+                    existing = self.get_by_client_msg_id(alert.user_id, alert.client_msg_id)
+                if existing is None:
+                    raise
+                raise DuplicateAlertError(existing)
+        alert_history_cache.bump(alert.room_id)
+        alert_expiry.schedule(alert_id, alert.room_id, alert.expires_at)
+        if alert.severity == SEVERITY_CRITICAL:
+            ack_states.track(alert.room_id, seq)
+        return replace(alert, id=alert_id, created_at=created_at, seq=seq)
+    
+    @tracer.traced("db.alerts.create_many")
+    def create_many(self, alerts: List[Alert]) -> List[Alert]:
+        """Create many alerts in a single transaction, in order."""
+        if not alerts:
+            return []
+        # One executemany-style INSERT ... RETURNING: ids come back without
+        # a SELECT per row. Core insert on the table, the ORM bulk path
+        # adds nothing here
+        created_at = utcnow()
+        table = AlertORM.__table__
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        for attempt in range(_SEQ_ATTEMPTS):
+            seqs = [room_sequences.next(alert.room_id, self._max_seq) for alert in alerts]
+            try:
+                rows = self.db.execute(stmt, [
+                    {
+                        "content": alert.content,
+                        "user_id": alert.user_id,
+                        "room_id": alert.room_id,
+                        "created_at": alert.created_at or created_at,
+                        "client_msg_id": alert.client_msg_id,
+                        "severity": alert.severity,
+                        "expires_at": alert.expires_at,
+                        "seq": seq
+                    }
+                    for alert, seq in zip(alerts, seqs)
+                ]).all()
+                self.db.commit()
+                break
+            except IntegrityError as e:
+                self.db.rollback()
+                if not _is_seq_conflict(e) or attempt + 1 == _SEQ_ATTEMPTS:
+                    raise
+                for room_id in {alert.room_id for alert in alerts}:
+                    room_sequences.reseed(room_id, self._max_seq(room_id))
+        created = [
+            replace(alert, id=alert_id, created_at=alert.created_at or created_at, seq=seq)
+            for alert, seq, (alert_id,) in zip(alerts, seqs, rows)
+        ]
+        alert_history_cache.bump_many([alert.room_id for alert in created])
+        for alert in created:
+            alert_expiry.schedule(alert.id, alert.room_id, alert.expires_at)
+            if alert.severity == SEVERITY_CRITICAL:
+                ack_states.track(alert.room_id, alert.seq)
+        return created
+    
+    @tracer.traced("db.alerts.delete_many")
+    def delete_many(self, alert_ids: List[int]) -> int:
+        """Delete alerts by id in one statement. Returns the rows deleted."""
+        if not alert_ids:
+            return 0
+        result = self.db.execute(delete(AlertORM).where(AlertORM.id.in_(alert_ids)))
         self.db.commit()
-        self.db.refresh(alert_orm)
-        return self._to_entity(alert_orm)
+        return result.rowcount
+    
+    @tracer.traced("db.alerts.get_expiring")
+    def get_expiring(self) -> List[Tuple[int, int, datetime]]:
+        """Get (id, room_id, expires_at) of every alert with an expiry."""
+        rows = self.db.execute(
+            select(AlertORM.id, AlertORM.room_id, AlertORM.expires_at).where(
+                AlertORM.expires_at.is_not(None)
+            )
+        )
+        return [tuple(row) for row in rows]
+    
+    def _max_seq(self, room_id: int) -> int:
+        """Highest stored seq of a room, 0 if it has no alerts."""
+        return self.db.execute(
+            select(func.max(AlertORM.seq)).where(AlertORM.room_id == room_id)
+        ).scalar() or 0
+    
+    @staticmethod
+    def _to_epoch_micros(value: Union[str, datetime, None]) -> int:
+        """Convert a stored timestamp (naive UTC) to epoch microseconds, -1 if NULL."""
+        if value is None:
+            return -1
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return epoch_micros(value)
     
     @staticmethod
     def _to_entity(alert_orm: AlertORM) -> Alert:
@@ -40,5 +253,9 @@ class SQLAlertRepository(AlertRepositoryInterface):
             content=alert_orm.content,
             user_id=alert_orm.user_id,
             room_id=alert_orm.room_id,
-            created_at=alert_orm.created_at
+            created_at=alert_orm.created_at,
+            client_msg_id=alert_orm.client_msg_id,
+            severity=alert_orm.severity,
+            expires_at=alert_orm.expires_at,
+            seq=alert_orm.seq
         )
@@ -0,0 +1,114 @@
+"""Lookup cache - Process-local cache for hot auth and room lookups."""
+import time
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.entities.user import User
+from src.frameworks_drivers import settings
+from src.frameworks_drivers.db.orm_models import RoomORM, TokenORM, UserORM, room_users
+
+
+class LookupCache:
+    """Caches token -> user and known rooms so lookups skip the database."""
+
+    def __init__(self, token_ttl: float = 60.0, max_tokens: int = 100_000):
+        self.token_ttl = token_ttl
+        self.max_tokens = max_tokens
+        self.rooms: Dict[int, str] = {}
+        # Default alert TTL per room; a missing key means "not loaded yet"
+        self.room_ttls: Dict[int, Optional[int]] = {}
+        # Member user ids per room; a missing key means "not loaded yet"
+        self.room_members: Dict[int, array] = {}
+        self._tokens: Dict[str, Tuple[User, float]] = {}
+
+    def get_user(self, key: str) -> Optional[User]:
+        """Get the user owning a token key, None on miss or expiry."""
+        entry = self._tokens.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at < time.monotonic():
+            self._tokens.pop(key, None)
+            return None
+        return user
+
+    def put_token(self, key: str, user: User):
+        """Cache the user owning a token key."""
+        if len(self._tokens) >= self.max_tokens and key not in self._tokens:
+            return
+        self._tokens[key] = (user, time.monotonic() + self.token_ttl)
+
+    def invalidate_token(self, key: str):
+        """Forget a token (logout)."""
+        self._tokens.pop(key, None)
+
+    def has_room(self, room_id: int) -> bool:
+        """Check whether a room is known."""
+        return room_id in self.rooms
+
+    def put_room(self, room_id: int, name: str):
+        """Cache a room."""
+        self.rooms[room_id] = name
+
+    def put_room_ttl(self, room_id: int, alert_ttl: Optional[int]):
+        """Cache a room's default alert TTL."""
+        self.room_ttls[room_id] = alert_ttl
+
+    def put_room_members(self, room_id: int, user_ids: Iterable[int]):
+        """Cache the full member list of a room."""
+        self.room_members[room_id] = array("q", user_ids)
+
+    def add_room_member(self, room_id: int, user_id: int):
+        """Cache a room membership (rooms not loaded yet load it on their first lookup)."""
+        members = self.room_members.get(room_id)
+        if members is not None and user_id not in members:
+            members.append(user_id)
+
+    def remove_room_member(self, room_id: int, user_id: int):
+        """Forget a room membership."""
+        members = self.room_members.get(room_id)
+        if members is not None and user_id in members:
+            members.remove(user_id)
+
+    def remove_room(self, room_id: int):
+        """Forget a deleted room."""
+        self.rooms.pop(room_id, None)
+        self.room_ttls.pop(room_id, None)
+        self.room_members.pop(room_id, None)
+
+    def clear(self):
+        """Drop every cached entry."""
+        self.rooms.clear()
+        self.room_ttls.clear()
+        self.room_members.clear()
+        self._tokens.clear()
+
+    def warm_up(self, db: Session) -> Tuple[int, int]:
+        """
+        Preload every room (with its alert TTL and members) and token with three queries.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rooms and tokens loaded
+        """
+        for room_id, name, alert_ttl in db.query(RoomORM.id, RoomORM.name, RoomORM.alert_ttl):
+            self.put_room(room_id, name)
+            self.put_room_ttl(room_id, alert_ttl)
+            self.put_room_members(room_id, ())
+        for room_id, user_id in db.execute(room_users.select()):
+            self.add_room_member(room_id, user_id)
+
+        tokens = 0
+        rows = db.query(
+            TokenORM.key, UserORM.id, UserORM.username, UserORM.password
+        ).join(UserORM, TokenORM.user_id == UserORM.id)
+        for key, user_id, username, password in rows:
+            self.put_token(key, User(id=user_id, username=username, password=password))
+            tokens += 1
+        return len(self.rooms), tokens
+
+
+# Global cache instance
+lookup_cache = LookupCache(token_ttl=settings.TOKEN_CACHE_TTL)
@@ -0,0 +1,649 @@
+"""Memory repositories - In-process implementations of the repository interfaces.
+
+The four repositories are views over one MemoryStore: plain dicts with
+the indexes the SQL schema has (username, token key and token per user,
+room name, alerts per room in seq order, client_msg_id per user, alerts
+with an expiry), all behind one lock. Nothing is durable: a restart
+starts empty.
+
+Used for everything with REPOSITORY_BACKEND=memory (no database at all,
+a baseline for benchmarking the layers above the repositories), or only
+for the alerts of the rooms listed in MEMORY_ROOMS through
+RoomRoutedAlertRepository: pure real-time feeds whose history does not
+have to survive a restart. Side effects match the SQL repositories, so
+room sequences, expiry, ack tracking, the history cache, the lookup
+cache and the room catalog see the same calls.
+"""
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import replace
+from datetime import datetime
+from operator import attrgetter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from src.entities.alert import Alert, SEVERITY_CRITICAL, utcnow
+from src.entities.alert_batch import AlertBatch, SEVERITY_CODES, epoch_micros
+from src.entities.room import Room
+from src.entities.token import Token
+from src.entities.user import User
+from src.frameworks_drivers import settings
+from src.interface_adapters.alert_expiry import alert_expiry
+from src.interface_adapters.tracing import tracer
+from src.interface_adapters.room_catalog import (
+    room_catalog,
+    ROOM_CREATED,
+    ROOM_RENAMED,
+    ROOM_DELETED,
+    MEMBER_ADDED,
+    MEMBER_REMOVED
+)
+from src.interface_adapters.repositories.repository_interfaces import (
+    AlertRepositoryInterface,
+    DuplicateAlertError,
+    RoomListing,
+    RoomNameTakenError,
+    RoomRepositoryInterface,
+    TokenRepositoryInterface,
+    UserRepositoryInterface
+)
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.alert_history_cache import alert_history_cache
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
+
+# First alert id next to a database: far above any SQL autoincrement id,
+# well below 2**53 so JavaScript clients read it exactly
+EPHEMERAL_ALERT_ID_BASE = 1 << 40
+
+_alert_id = attrgetter("id")
+_alert_seq = attrgetter("seq")
+
+
+def _visible(alert: Alert, now: datetime) -> bool:
+    """Whether an alert is not expired yet (the expiry engine may lag)."""
+    return alert.expires_at is None or alert.expires_at > now
+
+
+class MemoryStore:
+    """
+    Thread-safe in-process tables shared by the memory repositories.
+
+    Alert ids and seqs are both allocated under the lock, so within a
+    room the alert list is in id and seq order at once and every room
+    read is a bisection.
+    """
+
+    def __init__(self, first_alert_id: int = 1, max_alerts_per_room: int = 0):
+        # 0 = unbounded; past it a room's oldest alerts are dropped
+        self.first_alert_id = first_alert_id
+        self.max_alerts_per_room = max_alerts_per_room
+        self.lock = threading.RLock()
+        self.users: Dict[int, User] = {}
+        self.user_ids_by_name: Dict[str, int] = {}
+        self.tokens: Dict[str, Token] = {}
+        self.token_keys_by_user: Dict[int, str] = {}
+        self.rooms: Dict[int, Room] = {}
+        self.room_ids_by_name: Dict[str, int] = {}
+        # Members per room, in join order (dict as an ordered set)
+        self.members: Dict[int, Dict[int, None]] = {}
+        self.alerts: Dict[int, Alert] = {}
+        self.room_alerts: Dict[int, List[Alert]] = {}
+        self.client_msg_ids: Dict[Tuple[int, str], int] = {}
+        self.expiring: Dict[int, Alert] = {}
+        self.clear()
+
+    def clear(self):
+        """Drop everything and restart the id counters."""
+        with self.lock:
+            for table in (
+                self.users, self.user_ids_by_name, self.tokens, self.token_keys_by_user,
+                self.rooms, self.room_ids_by_name, self.members, self.alerts,
+                self.room_alerts, self.client_msg_ids, self.expiring
+            ):
+                table.clear()
+            self._next_user_id = 1
+            self._next_room_id = 1
+            self._next_alert_id = self.first_alert_id
+
+    def next_user_id(self) -> int:
+        user_id = self._next_user_id
+        self._next_user_id += 1
+        return user_id
+
+    def next_room_id(self) -> int:
+        room_id = self._next_room_id
+        self._next_room_id += 1
+        return room_id
+
+    def next_alert_id(self) -> int:
+        alert_id = self._next_alert_id
+        self._next_alert_id += 1
+        return alert_id
+
+    def max_seq(self, room_id: int) -> int:
+        """Highest stored seq of a room, 0 if it has no alerts."""
+        with self.lock:
+            alerts = self.room_alerts.get(room_id)
+            return alerts[-1].seq if alerts else 0
+
+    def add_alert(self, alert: Alert):
+        """Index a new alert, dropping the room's oldest past max_alerts_per_room (lock held)."""
+        self.alerts[alert.id] = alert
+        room_alerts = self.room_alerts.setdefault(alert.room_id, [])
+        if not room_alerts or room_alerts[-1].seq < alert.seq:
+            room_alerts.append(alert)
+        else:
+            # Reseeded counter (room handed over): keep the seq order
+            insort(room_alerts, alert, key=_alert_seq)
+        if alert.client_msg_id is not None:
+            self.client_msg_ids[(alert.user_id, alert.client_msg_id)] = alert.id
+        if alert.expires_at is not None:
+            self.expiring[alert.id] = alert
+        if self.max_alerts_per_room and len(room_alerts) > self.max_alerts_per_room:
+            # Pending expiries of the dropped alerts become no-op deletes
+            excess = len(room_alerts) - self.max_alerts_per_room
+            for old in room_alerts[:excess]:
+                self._unindex(old)
+            del room_alerts[:excess]
+
+    def remove_alert(self, alert_id: int) -> bool:
+        """Remove an alert from every index (lock held)."""
+        alert = self.alerts.get(alert_id)
+        if alert is None:
+            return False
+        self._unindex(alert)
+        room_alerts = self.room_alerts[alert.room_id]
+        index = bisect_left(room_alerts, alert.seq, key=_alert_seq)
+        while room_alerts[index] is not alert:
+            index += 1
+        del room_alerts[index]
+        if not room_alerts:
+            del self.room_alerts[alert.room_id]
+        return True
+
+    def forget_room(self, room_id: int):
+        """Drop the alerts of a deleted room."""
+        with self.lock:
+            for alert in self.room_alerts.pop(room_id, ()):
+                self._unindex(alert)
+
+    def room_listings(self) -> List[RoomListing]:
+        """Every room with its member users."""
+        with self.lock:
+            return [
+                RoomListing(
+                    room.id,
+                    room.name,
+                    [self.users[user_id] for user_id in self.members[room.id] if user_id in self.users],
+                    room.alert_ttl
+                )
+                for room in self.rooms.values()
+            ]
+
+    def _unindex(self, alert: Alert):
+        """Remove an alert from the id, client_msg_id and expiry indexes."""
+        del self.alerts[alert.id]
+        if alert.client_msg_id is not None:
+            self.client_msg_ids.pop((alert.user_id, alert.client_msg_id), None)
+        self.expiring.pop(alert.id, None)
+
+
+class MemoryUserRepository(UserRepositoryInterface):
+    """In-memory implementation of UserRepositoryInterface."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    @tracer.traced("memory.users.get_by_id")
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return self.store.users.get(user_id)
+
+    @tracer.traced("memory.users.get_by_username")
+    def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        with self.store.lock:
+            user_id = self.store.user_ids_by_name.get(username)
+            return self.store.users.get(user_id) if user_id is not None else None
+
+    @tracer.traced("memory.users.create")
+    def create(self, user: User) -> User:
+        """Create a new user. Raises ValueError if the username is taken."""
+        with self.store.lock:
+            if user.username in self.store.user_ids_by_name:
+                raise ValueError(f"Username {user.username!r} already exists")
+            created = replace(user, id=self.store.next_user_id())
+            self.store.users[created.id] = created
+            self.store.user_ids_by_name[created.username] = created.id
+        return created
+
+    @tracer.traced("memory.users.update")
+    def update(self, user: User) -> User:
+        """Update an existing user."""
+        with self.store.lock:
+            current = self.store.users.get(user.id)
+            if current is None:
+                return user
+            if user.username != current.username:
+                del self.store.user_ids_by_name[current.username]
+                self.store.user_ids_by_name[user.username] = user.id
+            updated = replace(user)
+            self.store.users[user.id] = updated
+        return updated
+
+
+class MemoryTokenRepository(TokenRepositoryInterface):
+    """In-memory implementation of TokenRepositoryInterface."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    @tracer.traced("memory.tokens.get_by_key")
+    def get_by_key(self, key: str) -> Optional[Token]:
+        """Get token by key."""
+        return self.store.tokens.get(key)
+
+    @tracer.traced("memory.tokens.get_by_user_id")
+    def get_by_user_id(self, user_id: int) -> Optional[Token]:
+        """Get token by user ID."""
+        with self.store.lock:
+            key = self.store.token_keys_by_user.get(user_id)
+            return self.store.tokens.get(key) if key is not None else None
+
+    @tracer.traced("memory.tokens.create")
+    def create(self, token: Token) -> Token:
+        """Create a new token."""
+        created = replace(token)
+        with self.store.lock:
+            self.store.tokens[created.key] = created
+            self.store.token_keys_by_user[created.user_id] = created.key
+        return created
+
+    @tracer.traced("memory.tokens.delete")
+    def delete(self, key: str) -> bool:
+        """Delete a token by key."""
+        lookup_cache.invalidate_token(key)
+        with self.store.lock:
+            token = self.store.tokens.pop(key, None)
+            if token is None:
+                return False
+            if self.store.token_keys_by_user.get(token.user_id) == key:
+                del self.store.token_keys_by_user[token.user_id]
+        return True
+
+
+class MemoryRoomRepository(RoomRepositoryInterface):
+    """
+    In-memory implementation of RoomRepositoryInterface.
+
+    Every change is published to the room catalog.
+    """
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    @tracer.traced("memory.rooms.get_all")
+    def get_all(self) -> List[Room]:
+        """Get all rooms."""
+        with self.store.lock:
+            return [self._to_entity(room) for room in self.store.rooms.values()]
+
+    @tracer.traced("memory.rooms.get_listings")
+    def get_listings(self) -> List[RoomListing]:
+        """Get all rooms with their member users."""
+        return self.store.room_listings()
+
+    @tracer.traced("memory.rooms.get_by_id")
+    def get_by_id(self, room_id: int) -> Optional[Room]:
+        """Get room by ID."""
+        with self.store.lock:
+            room = self.store.rooms.get(room_id)
+            return self._to_entity(room) if room is not None else None
+
+    @tracer.traced("memory.rooms.create")
+    def create(self, room: Room) -> Room:
+        """Create a new room."""
+        with self.store.lock:
+            if room.name in self.store.room_ids_by_name:
+                raise RoomNameTakenError(room.name)
+            created = Room(id=self.store.next_room_id(), name=room.name, alert_ttl=room.alert_ttl)
+            self.store.rooms[created.id] = created
+            self.store.room_ids_by_name[created.name] = created.id
+            self.store.members[created.id] = {}
+        lookup_cache.put_room(created.id, created.name)
+        room_catalog.publish(ROOM_CREATED, room={"id": created.id, "name": created.name})
+        return replace(created, user_ids=[])
+
+    @tracer.traced("memory.rooms.rename")
+    def rename(self, room_id: int, name: str) -> Optional[Room]:
+        """Rename a room. Returns None if it does not exist."""
+        with self.store.lock:
+            room = self.store.rooms.get(room_id)
+            if room is None:
+                return None
+            owner = self.store.room_ids_by_name.get(name)
+            if owner is not None and owner != room_id:
+                raise RoomNameTakenError(name)
+            del self.store.room_ids_by_name[room.name]
+            self.store.room_ids_by_name[name] = room_id
+            room.name = name
+        lookup_cache.put_room(room_id, name)
+        room_catalog.publish(ROOM_RENAMED, room={"id": room_id, "name": name})
+        return self.get_by_id(room_id)
+
+    @tracer.traced("memory.rooms.delete")
+    def delete(self, room_id: int) -> bool:
+        """Delete a room with its memberships and alerts."""
+        with self.store.lock:
+            room = self.store.rooms.pop(room_id, None)
+            if room is None:
+                return False
+            del self.store.room_ids_by_name[room.name]
+            del self.store.members[room_id]
+            self.store.forget_room(room_id)
+        lookup_cache.remove_room(room_id)
+        room_sequences.forget(room_id)
+        ack_states.forget_room(room_id)
+        alert_history_cache.forget_room(room_id)
+        room_catalog.publish(ROOM_DELETED, room_id=room_id)
+        return True
+
+    @tracer.traced("memory.rooms.add_member")
+    def add_member(self, room_id: int, user_id: int) -> bool:
+        """Add a user to a room. Returns False if either does not exist."""
+        with self.store.lock:
+            user = self.store.users.get(user_id)
+            members = self.store.members.get(room_id)
+            if user is None or members is None:
+                return False
+            if user_id in members:
+                return True
+            members[user_id] = None
+        lookup_cache.add_room_member(room_id, user_id)
+        room_catalog.publish(MEMBER_ADDED, room_id=room_id, user={"id": user_id, "username": user.username})
+        return True
+
+    @tracer.traced("memory.rooms.remove_member")
+    def remove_member(self, room_id: int, user_id: int) -> bool:
+        """Remove a user from a room. Returns False if not a member."""
+        with self.store.lock:
+            members = self.store.members.get(room_id)
+            if members is None or user_id not in members:
+                return False
+            del members[user_id]
+        lookup_cache.remove_room_member(room_id, user_id)
+        room_catalog.publish(MEMBER_REMOVED, room_id=room_id, user_id=user_id)
+        return True
+
+    @tracer.traced("memory.rooms.set_alert_ttl")
+    def set_alert_ttl(self, room_id: int, alert_ttl: Optional[int]) -> bool:
+        """Set a room's default alert TTL (None clears it). Returns False if missing."""
+        with self.store.lock:
+            room = self.store.rooms.get(room_id)
+            if room is None:
+                return False
+            room.alert_ttl = alert_ttl
+        lookup_cache.put_room_ttl(room_id, alert_ttl)
+        return True
+
+    def _to_entity(self, room: Room) -> Room:
+        """Copy of a stored room with its current members (lock held)."""
+        return Room(
+            id=room.id,
+            name=room.name,
+            user_ids=list(self.store.members.get(room.id, ())),
+            alert_ttl=room.alert_ttl
+        )
+
+
+class MemoryAlertRepository(AlertRepositoryInterface):
+    """In-memory implementation of AlertRepositoryInterface."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    @tracer.traced("memory.alerts.get_all")
+    def get_all(self, room_id: Optional[int] = None) -> List[Alert]:
+        """Get all alerts, optionally filtered by room_id."""
+        now = utcnow()
+        with self.store.lock:
+            if room_id:
+                alerts = self.store.room_alerts.get(room_id, ())
+                return [alert for alert in alerts if _visible(alert, now)]
+            alerts = [alert for alert in self.store.alerts.values() if _visible(alert, now)]
+        alerts.sort(key=attrgetter("created_at"))
+        return alerts
+
+    @tracer.traced("memory.alerts.get_after")
+    def get_after(self, room_id: int, after_id: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with id > after_id, oldest first."""
+        now = utcnow()
+        with self.store.lock:
+            alerts = self.store.room_alerts.get(room_id, [])
+            start = bisect_right(alerts, after_id, key=_alert_id)
+            return self._take(alerts, start, limit, now)
+
+    @tracer.traced("memory.alerts.get_range")
+    def get_range(self, room_id: int, from_seq: int, to_seq: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with from_seq <= seq <= to_seq, in seq order."""
+        now = utcnow()
+        with self.store.lock:
+            alerts = self.store.room_alerts.get(room_id, [])
+            start = bisect_left(alerts, from_seq, key=_alert_seq)
+            end = bisect_right(alerts, to_seq, lo=start, key=_alert_seq)
+            return self._take(alerts[start:end], 0, limit, now)
+
+    @tracer.traced("memory.alerts.get_many")
+    def get_many(self, alert_ids: List[int]) -> List[Alert]:
+        """Get the alerts with the given ids that still exist, in id order."""
+        now = utcnow()
+        with self.store.lock:
+            found = [self.store.alerts.get(alert_id) for alert_id in sorted(set(alert_ids))]
+        return [alert for alert in found if alert is not None and _visible(alert, now)]
+
+    @tracer.traced("memory.alerts.get_batch")
+    def get_batch(self, room_id: Optional[int] = None) -> AlertBatch:
+        """Get all alerts as a columnar batch, optionally filtered by room_id."""
+        batch = AlertBatch(room_id=room_id)
+        codes = SEVERITY_CODES
+        for alert in self.get_all(room_id):
+            batch.append(
+                alert.id,
+                alert.user_id or 0,
+                epoch_micros(alert.created_at),
+                alert.content or "",
+                codes.get(alert.severity, 0),
+                alert.seq or 0
+            )
+        return batch
+
+    @tracer.traced("memory.alerts.get_by_client_msg_id")
+    def get_by_client_msg_id(self, user_id: int, client_msg_id: str) -> Optional[Alert]:
+        """Get the alert a user submitted with a given client message ID."""
+        with self.store.lock:
+            alert_id = self.store.client_msg_ids.get((user_id, client_msg_id))
+            return self.store.alerts.get(alert_id) if alert_id is not None else None
+
+    @tracer.traced("memory.alerts.create")
+    def create(self, alert: Alert) -> Alert:
+        """Create a new alert. Raises DuplicateAlertError on a resent client_msg_id."""
+        with self.store.lock:
+            self._check_duplicate(alert)
+            created = self._add(alert, alert.created_at or utcnow())
+        self._after_create([created])
+        return created
+
+    @tracer.traced("memory.alerts.create_many")
+    def create_many(self, alerts: List[Alert]) -> List[Alert]:
+        """Create many alerts at once, in order: all of them or none."""
+        if not alerts:
+            return []
+        created_at = utcnow()
+        with self.store.lock:
+            for alert in alerts:
+                self._check_duplicate(alert)
+            created = [self._add(alert, alert.created_at or created_at) for alert in alerts]
+        self._after_create(created)
+        return created
+
+    @tracer.traced("memory.alerts.delete_many")
+    def delete_many(self, alert_ids: List[int]) -> int:
+        """Delete alerts by id. Returns the number deleted."""
+        with self.store.lock:
+            return sum(self.store.remove_alert(alert_id) for alert_id in set(alert_ids))
+
+    @tracer.traced("memory.alerts.get_expiring")
+    def get_expiring(self) -> List[Tuple[int, int, datetime]]:
+        """Get (id, room_id, expires_at) of every alert with an expiry."""
+        with self.store.lock:
+            return [(alert.id, alert.room_id, alert.expires_at) for alert in self.store.expiring.values()]
+
+    def _check_duplicate(self, alert: Alert):
+        """Raise DuplicateAlertError if the client_msg_id was already used (lock held)."""
+        if alert.client_msg_id is None:
+            return
+        existing_id = self.store.client_msg_ids.get((alert.user_id, alert.client_msg_id))
+        if existing_id is not None:
+            raise DuplicateAlertError(self.store.alerts[existing_id])
+
+    def _add(self, alert: Alert, created_at: datetime) -> Alert:
+        """Allocate id and seq and store an alert (lock held)."""
+        seq = room_sequences.next(alert.room_id, self.store.max_seq)
+        created = replace(alert, id=self.store.next_alert_id(), created_at=created_at, seq=seq)
+        self.store.add_alert(created)
+        return created
+
+    @staticmethod
+    def _after_create(created: List[Alert]):
+        """Same side effects as the SQL repository, once the lock is released."""
+        alert_history_cache.bump_many([alert.room_id for alert in created])
+        for alert in created:
+            alert_expiry.schedule(alert.id, alert.room_id, alert.expires_at)
+            if alert.severity == SEVERITY_CRITICAL:
+                ack_states.track(alert.room_id, alert.seq)
+
+    @staticmethod
+    def _take(alerts: List[Alert], start: int, limit: int, now: datetime) -> List[Alert]:
+        """Up to `limit` visible alerts of `alerts` from `start` on."""
+        taken: List[Alert] = []
+        for index in range(start, len(alerts)):
+            if len(taken) >= limit:
+                break
+            alert = alerts[index]
+            if _visible(alert, now):
+                taken.append(alert)
+        return taken
+
+
+class RoomRoutedAlertRepository(AlertRepositoryInterface):
+    """
+    Alerts of some rooms in memory, the rest in another repository.
+
+    Memory alert ids start at the store's first_alert_id, above every id
+    of the durable repository, so reads and deletes by id are split by
+    id alone. A create_many() spanning both kinds of rooms is two
+    separate writes.
+    """
+
+    def __init__(
+        self,
+        durable: AlertRepositoryInterface,
+        memory: MemoryAlertRepository,
+        memory_rooms: FrozenSet[int]
+    ):
+        self.durable = durable
+        self.memory = memory
+        self.memory_rooms = memory_rooms
+
+    def _for_room(self, room_id: int) -> AlertRepositoryInterface:
+        return self.memory if room_id in self.memory_rooms else self.durable
+
+    def _split_ids(self, alert_ids: List[int]) -> Tuple[List[int], List[int]]:
+        """(durable ids, memory ids)."""
+        first = self.memory.store.first_alert_id
+        durable = [alert_id for alert_id in alert_ids if alert_id < first]
+        memory = [alert_id for alert_id in alert_ids if alert_id >= first]
+        return durable, memory
+
+    def get_all(self, room_id: Optional[int] = None) -> List[Alert]:
+        """Get all alerts, optionally filtered by room_id."""
+        if room_id:
+            return self._for_room(room_id).get_all(room_id)
+        return list(heapq.merge(
+            self.durable.get_all(), self.memory.get_all(), key=attrgetter("created_at")
+        ))
+
+    def get_after(self, room_id: int, after_id: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with id > after_id, oldest first."""
+        return self._for_room(room_id).get_after(room_id, after_id, limit)
+
+    def get_range(self, room_id: int, from_seq: int, to_seq: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with from_seq <= seq <= to_seq, in seq order."""
+        return self._for_room(room_id).get_range(room_id, from_seq, to_seq, limit)
+
+    def get_many(self, alert_ids: List[int]) -> List[Alert]:
+        """Get the alerts with the given ids that still exist, in id order."""
+        durable_ids, memory_ids = self._split_ids(alert_ids)
+        return self.durable.get_many(durable_ids) + self.memory.get_many(memory_ids)
+
+    def get_batch(self, room_id: Optional[int] = None) -> AlertBatch:
+        """Get all alerts as a columnar batch, optionally filtered by room_id."""
+        if room_id:
+            return self._for_room(room_id).get_batch(room_id)
+        # Both batches are in created_at order: merge their rows
+        batches = (self.durable.get_batch(), self.memory.get_batch())
+        rows = heapq.merge(*(
+            [(created_at, part, index) for index, created_at in enumerate(batch.created_at)]
+            for part, batch in enumerate(batches)
+        ))
+        merged = AlertBatch()
+        for created_at, part, index in rows:
+            batch = batches[part]
+            merged.append(
+                batch.ids[index],
+                batch.user_ids[index],
+                created_at,
+                batch.content_at(index),
+                batch.severity_codes[index],
+                batch.seqs[index]
+            )
+        return merged
+
+    def get_by_client_msg_id(self, user_id: int, client_msg_id: str) -> Optional[Alert]:
+        """Get the alert a user submitted with a given client message ID."""
+        alert = self.memory.get_by_client_msg_id(user_id, client_msg_id)
+        if alert is None:
+            alert = self.durable.get_by_client_msg_id(user_id, client_msg_id)
+        return alert
+
+    def create(self, alert: Alert) -> Alert:
+        """Create a new alert in the repository of its room."""
+        return self._for_room(alert.room_id).create(alert)
+
+    def create_many(self, alerts: List[Alert]) -> List[Alert]:
+        """Create many alerts, in order: one write per repository involved."""
+        in_memory = [alert.room_id in self.memory_rooms for alert in alerts]
+        durable = iter(self.durable.create_many([a for a, m in zip(alerts, in_memory) if not m]))
+        memory = iter(self.memory.create_many([a for a, m in zip(alerts, in_memory) if m]))
+        return [next(memory) if m else next(durable) for m in in_memory]
+
+    def delete_many(self, alert_ids: List[int]) -> int:
+        """Delete alerts by id. Returns the number deleted."""
+        durable_ids, memory_ids = self._split_ids(alert_ids)
+        return self.durable.delete_many(durable_ids) + self.memory.delete_many(memory_ids)
+
+    def get_expiring(self) -> List[Tuple[int, int, datetime]]:
+        """Get (id, room_id, expires_at) of every alert with an expiry."""
+        return self.durable.get_expiring() + self.memory.get_expiring()
+
+
+# Global store: every table with REPOSITORY_BACKEND=memory (unbounded, like
+# the database), otherwise the alerts of the MEMORY_ROOMS rooms (ids above
+# the database's, capped at MEMORY_ROOM_MAX_ALERTS per room)
+if settings.REPOSITORY_BACKEND == "memory":
+    memory_store = MemoryStore()
+else:
+    memory_store = MemoryStore(
+        first_alert_id=EPHEMERAL_ALERT_ID_BASE,
+        max_alerts_per_room=settings.MEMORY_ROOM_MAX_ALERTS
+    )
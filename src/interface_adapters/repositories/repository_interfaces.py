@@ -1,8 +1,10 @@
 """Repository interfaces - Abstract contracts for data access."""
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional, List, Tuple
 from src.entities.user import User
 from src.entities.alert import Alert
+from src.entities.alert_batch import AlertBatch
 from src.entities.room import Room
 from src.entities.token import Token
 
@@ -31,6 +33,14 @@ class UserRepositoryInterface(ABC):
         pass
 
 
+class DuplicateAlertError(Exception):
+    """Raised when an alert with the same (user_id, client_msg_id) exists."""
+
+    def __init__(self, existing: Alert):
+        super().__init__(f"Duplicate client_msg_id {existing.client_msg_id!r}")
+        self.existing = existing
+
+
 class AlertRepositoryInterface(ABC):
     """Abstract interface for Alert repository."""
     
@@ -39,10 +49,66 @@ class AlertRepositoryInterface(ABC):
         """Get all alerts, optionally filtered by room_id."""
         pass
     
+    @abstractmethod
+    def get_after(self, room_id: int, after_id: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with id > after_id, oldest first."""
+        pass
+    
+    @abstractmethod
+    def get_range(self, room_id: int, from_seq: int, to_seq: int, limit: int) -> List[Alert]:
+        """Get up to `limit` alerts of a room with from_seq <= seq <= to_seq, in seq order."""
+        pass
+    
+    @abstractmethod
+    def get_many(self, alert_ids: List[int]) -> List[Alert]:
+        """Get the alerts with the given ids that still exist, in id order."""
+        pass
+    
+    @abstractmethod
+    def get_batch(self, room_id: Optional[int] = None) -> AlertBatch:
+        """Get all alerts as a columnar batch, optionally filtered by room_id."""
+        pass
+    
+    @abstractmethod
+    def get_by_client_msg_id(self, user_id: int, client_msg_id: str) -> Optional[Alert]:
+        """Get the alert a user submitted with a given client message ID."""
+        pass
+    
     @abstractmethod
     def create(self, alert: Alert) -> Alert:
-        """Create a new alert."""
+        """Create a new alert. Raises DuplicateAlertError on a resent client_msg_id."""
+        pass
+    
+    @abstractmethod
+    def create_many(self, alerts: List[Alert]) -> List[Alert]:
+        """Create many alerts in a single transaction, in order."""
+        pass
+    
+    @abstractmethod
+    def delete_many(self, alert_ids: List[int]) -> int:
+        """Delete alerts by id. Returns the number deleted."""
         pass
+    
+    @abstractmethod
+    def get_expiring(self) -> List[Tuple[int, int, datetime]]:
+        """Get (id, room_id, expires_at) of every alert with an expiry."""
+        pass
+
+
+class RoomNameTakenError(Exception):
+    """Raised when creating or renaming a room to a name already in use."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Room name {name!r} already exists")
+        self.name = name
+
+
+class RoomListing(NamedTuple):
+    """Room with its member users, the shape rooms_to_json() reads."""
+    id: int
+    name: str
+    users: List[User]
+    alert_ttl: Optional[int]
 
 
 class RoomRepositoryInterface(ABC):
@@ -53,6 +119,11 @@ class RoomRepositoryInterface(ABC):
         """Get all rooms."""
         pass
     
+    @abstractmethod
+    def get_listings(self) -> List[RoomListing]:
+        """Get all rooms with their member users."""
+        pass
+    
     @abstractmethod
     def get_by_id(self, room_id: int) -> Optional[Room]:
         """Get room by ID."""
@@ -62,6 +133,31 @@ class RoomRepositoryInterface(ABC):
     def create(self, room: Room) -> Room:
         """Create a new room."""
         pass
+    
+    @abstractmethod
+    def rename(self, room_id: int, name: str) -> Optional[Room]:
+        """Rename a room. Returns None if it does not exist."""
+        pass
+    
+    @abstractmethod
+    def delete(self, room_id: int) -> bool:
+        """Delete a room with its memberships, alerts and acknowledgements."""
+        pass
+    
+    @abstractmethod
+    def add_member(self, room_id: int, user_id: int) -> bool:
+        """Add a user to a room. Returns False if either does not exist."""
+        pass
+    
+    @abstractmethod
+    def remove_member(self, room_id: int, user_id: int) -> bool:
+        """Remove a user from a room. Returns False if not a member."""
+        pass
+    
+    @abstractmethod
+    def set_alert_ttl(self, room_id: int, alert_ttl: Optional[int]) -> bool:
+        """Set a room's default alert TTL (None clears it). Returns False if missing."""
+        pass
 
 
 class TokenRepositoryInterface(ABC):
@@ -86,3 +182,29 @@ class TokenRepositoryInterface(ABC):
     def delete(self, key: str) -> bool:
         """Delete a token by key."""
         pass
+
+
+class AckStateInterface(ABC):
+    """Abstract interface for the store of delivery and read acknowledgements."""
+    
+    @abstractmethod
+    def ack(
+        self,
+        room_id: int,
+        user_id: int,
+        kind: str,
+        seqs: Iterable[int] = (),
+        up_to: Optional[int] = None
+    ) -> int:
+        """Acknowledge seqs (and every seq up to `up_to`). Returns how many were new."""
+        pass
+    
+    @abstractmethod
+    def unread(self, room_id: int, user_id: int, last_seq: int) -> int:
+        """Count the seqs up to `last_seq` the user has not read."""
+        pass
+    
+    @abstractmethod
+    def unacked(self, room_id: int, seq: int, kind: str, members: Iterable[int]) -> Optional[List[int]]:
+        """Members that have not acknowledged a tracked alert, None if it is not tracked."""
+        pass
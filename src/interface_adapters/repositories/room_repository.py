@@ -1,22 +1,71 @@
 """Room Repository implementation with SQLAlchemy."""
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from src.entities.room import Room
-from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
-from src.frameworks_drivers.db.orm_models import RoomORM
+from src.entities.user import User
+from src.interface_adapters.tracing import tracer
+from src.interface_adapters.room_catalog import (
+    room_catalog,
+    ROOM_CREATED,
+    ROOM_RENAMED,
+    ROOM_DELETED,
+    MEMBER_ADDED,
+    MEMBER_REMOVED
+)
+from src.interface_adapters.repositories.repository_interfaces import (
+    RoomListing,
+    RoomRepositoryInterface,
+    RoomNameTakenError
+)
+from src.interface_adapters.repositories.ack_states import ack_states
+from src.interface_adapters.repositories.alert_history_cache import alert_history_cache
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.frameworks_drivers.db.orm_models import (
+    AckStateORM,
+    AlertAckORM,
+    AlertORM,
+    RoomORM,
+    UserORM,
+    room_users
+)
 
 
 class SQLRoomRepository(RoomRepositoryInterface):
-    """SQLAlchemy implementation of RoomRepositoryInterface."""
+    """
+    SQLAlchemy implementation of RoomRepositoryInterface.
+    
+    Every committed change is published to the room catalog.
+    """
     
     def __init__(self, db: Session):
         self.db = db
     
+    @tracer.traced("db.rooms.get_all")
     def get_all(self) -> List[Room]:
         """Get all rooms."""
         room_orms = self.db.query(RoomORM).all()
         return [self._to_entity(room_orm) for room_orm in room_orms]
     
+    @tracer.traced("db.rooms.get_listings")
+    def get_listings(self) -> List[RoomListing]:
+        """Get all rooms with their member users."""
+        # selectinload fetches every room's users in one extra query (no N+1)
+        room_orms = self.db.query(RoomORM).options(selectinload(RoomORM.users)).all()
+        return [
+            RoomListing(
+                room_orm.id,
+                room_orm.name,
+                [User(id=user.id, username=user.username, password=user.password) for user in room_orm.users],
+                room_orm.alert_ttl
+            )
+            for room_orm in room_orms
+        ]
+    
+    @tracer.traced("db.rooms.get_by_id")
     def get_by_id(self, room_id: int) -> Optional[Room]:
         """Get room by ID."""
         room_orm = self.db.query(RoomORM).filter(RoomORM.id == room_id).first()
@@ -24,14 +73,106 @@ class SQLRoomRepository(RoomRepositoryInterface):
             return None
         return self._to_entity(room_orm)
     
+    @tracer.traced("db.rooms.create")
     def create(self, room: Room) -> Room:
         """Create a new room."""
         room_orm = RoomORM(name=room.name)
         self.db.add(room_orm)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise RoomNameTakenError(room.name)
         self.db.refresh(room_orm)
+        lookup_cache.put_room(room_orm.id, room_orm.name)
+        room_catalog.publish(ROOM_CREATED, room={"id": room_orm.id, "name": room_orm.name})
         return self._to_entity(room_orm)
     
+    @tracer.traced("db.rooms.rename")
+    def rename(self, room_id: int, name: str) -> Optional[Room]:
+        """Rename a room. Returns None if it does not exist."""
+        try:
+            result = self.db.execute(
+                update(RoomORM).where(RoomORM.id == room_id).values(name=name)
+            )
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise RoomNameTakenError(name)
+        if not result.rowcount:
+            return None
+        lookup_cache.put_room(room_id, name)
+        room_catalog.publish(ROOM_RENAMED, room={"id": room_id, "name": name})
+        return self.get_by_id(room_id)
+    
+    @tracer.traced("db.rooms.delete")
+    def delete(self, room_id: int) -> bool:
+        """Delete a room with its memberships, alerts and acknowledgements."""
+        self.db.execute(delete(room_users).where(room_users.c.room_id == room_id))
+        self.db.execute(delete(AlertORM).where(AlertORM.room_id == room_id))
+        self.db.execute(delete(AckStateORM).where(AckStateORM.room_id == room_id))
+        self.db.execute(delete(AlertAckORM).where(AlertAckORM.room_id == room_id))
+        result = self.db.execute(delete(RoomORM).where(RoomORM.id == room_id))
+        if not result.rowcount:
+            self.db.rollback()
+            return False
+        self.db.commit()
+        lookup_cache.remove_room(room_id)
+        room_sequences.forget(room_id)
+        ack_states.forget_room(room_id)
+        alert_history_cache.forget_room(room_id)
+        room_catalog.publish(ROOM_DELETED, room_id=room_id)
+        return True
+    
+    @tracer.traced("db.rooms.add_member")
+    def add_member(self, room_id: int, user_id: int) -> bool:
+        """Add a user to a room. Returns False if either does not exist."""
+        username = self.db.execute(
+            select(UserORM.username).where(UserORM.id == user_id)
+        ).scalar()
+        if username is None or not self.db.execute(
+            select(RoomORM.id).where(RoomORM.id == room_id)
+        ).first():
+            return False
+        # The unique (room_id, user_id) index makes a concurrent add a no-op
+        result = self.db.execute(
+            sqlite_insert(room_users).values(room_id=room_id, user_id=user_id).on_conflict_do_nothing()
+        )
+        self.db.commit()
+        if not result.rowcount:
+            return True
+        lookup_cache.add_room_member(room_id, user_id)
+        room_catalog.publish(MEMBER_ADDED, room_id=room_id, user={"id": user_id, "username": username})
+        return True
+    
+    @tracer.traced("db.rooms.remove_member")
+    def remove_member(self, room_id: int, user_id: int) -> bool:
+        """Remove a user from a room. Returns False if not a member."""
+        result = self.db.execute(
+            delete(room_users).where(
+                room_users.c.room_id == room_id,
+                room_users.c.user_id == user_id
+            )
+        )
+        self.db.commit()
+        if not result.rowcount:
+            return False
+        lookup_cache.remove_room_member(room_id, user_id)
+        room_catalog.publish(MEMBER_REMOVED, room_id=room_id, user_id=user_id)
+        return True
+    
+    @tracer.traced("db.rooms.set_alert_ttl")
+    def set_alert_ttl(self, room_id: int, alert_ttl: Optional[int]) -> bool:
+        """Set a room's default alert TTL (None clears it). Returns False if missing."""
+        result = self.db.execute(
+            update(RoomORM).where(RoomORM.id == room_id).values(alert_ttl=alert_ttl)
+        )
+        self.db.commit()
+        if not result.rowcount:
+            return False
+        lookup_cache.put_room_ttl(room_id, alert_ttl)
+        return True
+    
     @staticmethod
     def _to_entity(room_orm: RoomORM) -> Room:
         """Convert ORM model to entity."""
@@ -39,5 +180,6 @@ class SQLRoomRepository(RoomRepositoryInterface):
         return Room(
             id=room_orm.id,
             name=room_orm.name,
-            user_ids=user_ids
+            user_ids=user_ids,
+            alert_ttl=room_orm.alert_ttl
         )
@@ -0,0 +1,90 @@
+"""Room sequences - Per-room alert sequence numbers allocated in memory."""
+import threading
+from typing import Callable, Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.frameworks_drivers.db.orm_models import AlertORM
+
+
+class RoomSequences:
+    """
+    Hands out 1, 2, 3... per room without touching the database.
+
+    Each room's counter is seeded once from MAX(alerts.seq), at startup
+    or on the room's first alert. Another worker allocating from the same
+    room makes an insert hit the (room_id, seq) unique index; the
+    repository then reseeds the room and retries.
+    """
+
+    def __init__(self):
+        self._last: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, room_id: int, seed: Callable[[int], int]) -> int:
+        """
+        Allocate the next sequence number of a room.
+
+        Args:
+            room_id: Room ID
+            seed: Returns the highest stored seq of a room (0 if none),
+                called only when the room has no counter yet
+
+        Returns:
+            The allocated sequence number
+        """
+        with self._lock:
+            if room_id in self._last:
+                self._last[room_id] += 1
+                return self._last[room_id]
+        # Query outside the lock; a concurrent seed of the same room wins
+        current = seed(room_id)
+        with self._lock:
+            self._last[room_id] = self._last.get(room_id, current) + 1
+            return self._last[room_id]
+
+    def last(self, room_id: int) -> Optional[int]:
+        """Last seq allocated in a room, None if it has no counter here."""
+        with self._lock:
+            return self._last.get(room_id)
+
+    def release(self, room_id: int, seq: int):
+        """Give back a seq whose insert failed, if nothing was allocated after it."""
+        with self._lock:
+            if self._last.get(room_id) == seq:
+                self._last[room_id] = seq - 1
+
+    def reseed(self, room_id: int, last: int):
+        """Move a room's counter forward to `last` (never backwards)."""
+        with self._lock:
+            self._last[room_id] = max(self._last.get(room_id, 0), last)
+
+    def forget(self, room_id: int):
+        """Drop a deleted room's counter."""
+        with self._lock:
+            self._last.pop(room_id, None)
+
+    def clear(self):
+        """Drop every counter."""
+        with self._lock:
+            self._last.clear()
+
+    def warm_up(self, db: Session) -> int:
+        """
+        Seed every room that has alerts with one grouped query.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rooms seeded
+        """
+        rows = db.query(AlertORM.room_id, func.max(AlertORM.seq)).group_by(AlertORM.room_id)
+        count = 0
+        for room_id, last in rows:
+            self.reseed(room_id, last or 0)
+            count += 1
+        return count
+
+
+# Global allocator instance
+room_sequences = RoomSequences()
@@ -2,7 +2,9 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from src.entities.token import Token
+from src.interface_adapters.tracing import tracer
 from src.interface_adapters.repositories.repository_interfaces import TokenRepositoryInterface
+from src.interface_adapters.repositories.lookup_cache import lookup_cache
 from src.frameworks_drivers.db.orm_models import TokenORM
 
 
@@ -12,6 +14,7 @@ class SQLTokenRepository(TokenRepositoryInterface):
     def __init__(self, db: Session):
         self.db = db
     
+    @tracer.traced("db.tokens.get_by_key")
     def get_by_key(self, key: str) -> Optional[Token]:
         """Get token by key."""
         token_orm = self.db.query(TokenORM).filter(TokenORM.key == key).first()
@@ -19,6 +22,7 @@ class SQLTokenRepository(TokenRepositoryInterface):
             return None
         return self._to_entity(token_orm)
     
+    @tracer.traced("db.tokens.get_by_user_id")
     def get_by_user_id(self, user_id: int) -> Optional[Token]:
         """Get token by user ID."""
         token_orm = self.db.query(TokenORM).filter(TokenORM.user_id == user_id).first()
@@ -26,6 +30,7 @@ class SQLTokenRepository(TokenRepositoryInterface):
             return None
         return self._to_entity(token_orm)
     
+    @tracer.traced("db.tokens.create")
     def create(self, token: Token) -> Token:
         """Create a new token."""
         token_orm = TokenORM(
@@ -37,8 +42,10 @@ class SQLTokenRepository(TokenRepositoryInterface):
         self.db.refresh(token_orm)
         return self._to_entity(token_orm)
     
+    @tracer.traced("db.tokens.delete")
     def delete(self, key: str) -> bool:
         """Delete a token by key."""
+        lookup_cache.invalidate_token(key)
         token_orm = self.db.query(TokenORM).filter(TokenORM.key == key).first()
         if token_orm:
             self.db.delete(token_orm)
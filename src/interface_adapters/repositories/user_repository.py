@@ -2,6 +2,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from src.entities.user import User
+from src.interface_adapters.tracing import tracer
 from src.interface_adapters.repositories.repository_interfaces import UserRepositoryInterface
 from src.frameworks_drivers.db.orm_models import UserORM
 
@@ -12,6 +13,7 @@ class SQLUserRepository(UserRepositoryInterface):
     def __init__(self, db: Session):
         self.db = db
     
+    @tracer.traced("db.users.get_by_id")
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
         user_orm = self.db.query(UserORM).filter(UserORM.id == user_id).first()
@@ -19,6 +21,7 @@ class SQLUserRepository(UserRepositoryInterface):
             return None
         return self._to_entity(user_orm)
     
+    @tracer.traced("db.users.get_by_username")
     def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         user_orm = self.db.query(UserORM).filter(UserORM.username == username).first()
@@ -26,6 +29,7 @@ class SQLUserRepository(UserRepositoryInterface):
             return None
         return self._to_entity(user_orm)
     
+    @tracer.traced("db.users.create")
     def create(self, user: User) -> User:
         """Create a new user."""
         user_orm = UserORM(
@@ -37,6 +41,7 @@ class SQLUserRepository(UserRepositoryInterface):
         self.db.refresh(user_orm)
         return self._to_entity(user_orm)
     
+    @tracer.traced("db.users.update")
     def update(self, user: User) -> User:
         """Update an existing user."""
         user_orm = self.db.query(UserORM).filter(UserORM.id == user.id).first()
@@ -0,0 +1,109 @@
+"""Room catalog - Versioned feed of room and membership changes.
+
+Repositories publish an event after each committed change; WebSocket
+subscribers of the catalog channel receive it instead of polling
+GET /api/rooms. Every event carries a version that grows by one, so a
+client applies version N + 1 after N and only resyncs (re-reads
+/api/rooms) when it sees a gap or the epoch changes.
+
+Versions are process-local: `epoch` is random per process so clients
+notice a restart (or a different worker) and resync.
+"""
+import asyncio
+import json
+import secrets
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+# Event names
+ROOM_CREATED = "room.created"
+ROOM_RENAMED = "room.renamed"
+ROOM_DELETED = "room.deleted"
+MEMBER_ADDED = "room.member_added"
+MEMBER_REMOVED = "room.member_removed"
+RESYNC = "resync"
+
+
+class RoomCatalog:
+    """Versioned, thread-safe publisher of catalog events."""
+
+    def __init__(self, history: int = 1000):
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        # Recent (version, message) pairs replayed to reconnecting clients
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=history)
+        self._listeners: List[Callable[[str], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Deliver events on this loop (the one owning the sockets)."""
+        self._loop = loop
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Register a callback run on the bound loop for every event."""
+        self._listeners.append(listener)
+
+    def message(self, event: str, version: int, **data) -> str:
+        """Encode one catalog frame."""
+        return json.dumps({"catalog": event, "epoch": self.epoch, "version": version, **data})
+
+    def publish(self, event: str, **data) -> int:
+        """
+        Record an event and deliver it to the listeners.
+
+        Safe to call from worker threads (sync endpoints): delivery is
+        scheduled on the bound loop in version order.
+
+        Returns:
+            The event's version
+        """
+        with self._lock:
+            self.version += 1
+            version = self.version
+            message = self.message(event, version, **data)
+            self._history.append((version, message))
+            self._deliver(message)
+        return version
+
+    def _deliver(self, message: str):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._notify(message)
+        else:
+            loop.call_soon_threadsafe(self._notify, message)
+
+    def _notify(self, message: str):
+        for listener in self._listeners:
+            listener(message)
+
+    def since(self, epoch: Optional[str], version: Optional[int]) -> Optional[List[str]]:
+        """
+        Events after `version`, or None if the client must resync.
+
+        Resync is needed when the client has no position, comes from
+        another epoch or is older than the kept history.
+        """
+        if epoch != self.epoch or version is None or version > self.version:
+            return None
+        with self._lock:
+            if version == self.version:
+                return []
+            if not self._history or self._history[0][0] > version + 1:
+                return None
+            return [message for v, message in self._history if v > version]
+
+    def resync_message(self) -> str:
+        """Frame telling a client to re-read /api/rooms."""
+        return self.message(RESYNC, self.version)
+
+
+# Global catalog instance
+room_catalog = RoomCatalog()
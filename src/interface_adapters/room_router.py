@@ -0,0 +1,111 @@
+"""Room router - Consistent-hash placement of rooms on cluster nodes.
+
+Every node of a cluster is configured with the same node list and its
+own base URL. A room belongs to the node its id hashes to on the ring;
+clients reaching another node are redirected to the owner, so a room's
+sockets, ring buffer and seq counter all live in one process and no
+backplane has to copy every message to every node.
+
+Changing the node list only moves the rooms whose arc changed owner
+(about 1/N of them); those are handed off to their new owner.
+"""
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from starlette.datastructures import URL
+from src.frameworks_drivers import settings
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with `vnodes` points per node."""
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = 64):
+        self.nodes: List[str] = sorted(set(nodes))
+        self.vnodes = vnodes
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self._keys = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, room_id: int) -> Optional[str]:
+        """Node owning a room (None on an empty ring)."""
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, _hash(f"room:{room_id}")) % len(self._keys)
+        return self._owners[index]
+
+
+class RoomRouter:
+    """Decides whether this node serves a room and where to send clients otherwise."""
+
+    def __init__(self, node: str = "", nodes: Iterable[str] = (), vnodes: int = 64):
+        self.node = node.rstrip("/")
+        self.vnodes = vnodes
+        self.ring = HashRing([n.rstrip("/") for n in nodes], vnodes)
+        # Rooms handed to this node before its own node list was updated
+        self._adopted: Set[int] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Routing is on once this node knows its own URL and the ring."""
+        return bool(self.node) and bool(self.ring.nodes)
+
+    def owner(self, room_id: int) -> str:
+        """Base URL of the node serving a room."""
+        if not self.enabled or room_id in self._adopted:
+            return self.node
+        return self.ring.owner(room_id)
+
+    def is_local(self, room_id: int) -> bool:
+        """Check whether this node serves a room."""
+        return self.owner(room_id) == self.node
+
+    def redirect_url(self, room_id: int, url: URL) -> str:
+        """`url` (HTTP or WebSocket) rebased on the owner of a room."""
+        owner = urlsplit(self.owner(room_id))
+        scheme = owner.scheme
+        if url.scheme in ("ws", "wss"):
+            scheme = "wss" if owner.scheme == "https" else "ws"
+        return str(url.replace(scheme=scheme, netloc=owner.netloc))
+
+    def set_nodes(self, nodes: Iterable[str], held_rooms: Iterable[int]) -> Dict[str, List[int]]:
+        """
+        Replace the node list.
+
+        A node left out of `nodes` hands off every room it holds.
+
+        Args:
+            nodes: Base URLs of every node of the new ring
+            held_rooms: Rooms with state on this node
+
+        Returns:
+            New owner -> rooms of `held_rooms` this node must hand off
+        """
+        self.ring = HashRing([n.rstrip("/") for n in nodes], self.vnodes)
+        self._adopted.clear()
+        moving: Dict[str, List[int]] = {}
+        if not self.enabled:
+            return moving
+        for room_id in held_rooms:
+            owner = self.ring.owner(room_id)
+            if owner != self.node:
+                moving.setdefault(owner, []).append(room_id)
+        return moving
+
+    def adopt(self, room_id: int):
+        """Serve a room handed off by another node, whatever the ring says."""
+        self._adopted.add(room_id)
+
+
+# Global router, configured from settings
+room_router = RoomRouter(
+    node=settings.CLUSTER_NODE,
+    nodes=[node.strip() for node in settings.CLUSTER_NODES.split(",") if node.strip()],
+    vnodes=settings.CLUSTER_VNODES
+)
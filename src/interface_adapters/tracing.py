@@ -0,0 +1,230 @@
+"""Tracing - Sampled, low-overhead spans exported as OpenTelemetry JSON.
+
+Traces start only at entry points (`start_trace`: handshake, inbound
+frame...), where the sampling decision is made once. Inner layers use
+`span`/`traced`, which do nothing unless a sampled trace is active, so
+with sampling off a decorated call costs one context variable lookup.
+
+Finished traces are exported in the OTLP/JSON layout (one
+`{"resourceSpans": [...]}` object per line), readable by an OpenTelemetry
+collector's file receiver or any JSON tooling.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class _NoopSpan:
+    """Shared span returned when nothing is recorded."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A recorded span; the root one collects its trace for export."""
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent", "attributes",
+        "start_ns", "end_ns", "status", "trace_spans", "_token"
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else "%032x" % random.getrandbits(128)
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = STATUS_OK
+        # Spans of the whole trace, kept on the root only
+        self.trace_spans: Optional[List["Span"]] = None if parent else []
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.status = STATUS_ERROR
+            self.attributes["exception.type"] = exc_type.__name__
+        _current_span.reset(self._token)
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        root.trace_spans.append(self)
+        if root is self:
+            self.tracer._export(self.trace_spans)
+        return False
+
+    def to_otlp(self) -> dict:
+        """OTLP/JSON representation."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status}
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    """Encode one attribute as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class InMemorySpanExporter:
+    """Keeps exported traces in memory (collector stand-in for benchmarks)."""
+
+    def __init__(self):
+        self.traces: List[List[dict]] = []
+
+    def export(self, spans: List[dict], service_name: str):
+        self.traces.append(spans)
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON `resourceSpans` object per trace to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, spans: List[dict], service_name: str):
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": "src.interface_adapters.tracing"}, "spans": spans}]
+        }]})
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Head-sampled tracer."""
+
+    def __init__(self, sample_rate: float = 0.0, exporter=None, service_name: str = "fastapi-websockets"):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.service_name = service_name
+
+    def configure(self, sample_rate: float, exporter=None):
+        """Set sampling rate (0..1) and exporter; 0 turns tracing off."""
+        if self.exporter is not None and self.exporter is not exporter:
+            self.exporter.shutdown()
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.exporter = exporter
+
+    def shutdown(self):
+        """Flush and close the exporter."""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def start_trace(self, name: str, **attributes):
+        """Entry point span: starts a new trace if sampled (or nests in the current one)."""
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(self, name, parent, attributes)
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        return Span(self, name, None, attributes)
+
+    def span(self, name: str, **attributes):
+        """Child span, recorded only inside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent, attributes)
+
+    def traced(self, name: str) -> Callable:
+        """Decorator recording a child span around a sync or async function."""
+        def decorator(fn: Callable) -> Callable:
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if _current_span.get() is None:
+                        return await fn(*args, **kwargs)
+                    with self.span(name):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return fn(*args, **kwargs)
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _export(self, spans: List[Span]):
+        exporter = self.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export([span.to_otlp() for span in spans], self.service_name)
+        except Exception as e:
+            print(f"Trace export error: {e}")
+
+
+# Global tracer instance, configured at startup
+tracer = Tracer()
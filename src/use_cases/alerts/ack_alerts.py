@@ -0,0 +1,38 @@
+"""Ack Alerts Use Case - Records delivery and read acknowledgements."""
+from typing import List, Optional
+from src.interface_adapters.repositories.repository_interfaces import AckStateInterface
+
+
+class AckAlertsUseCase:
+    """Use case for acknowledging alerts of a room."""
+    
+    def __init__(self, ack_states: AckStateInterface):
+        self.ack_states = ack_states
+    
+    def execute(
+        self,
+        room_id: int,
+        user_id: int,
+        kind: str,
+        seqs: List[int],
+        up_to: Optional[int],
+        last_seq: int
+    ) -> int:
+        """
+        Execute ack alerts use case.
+        
+        Args:
+            room_id: Room ID
+            user_id: User acknowledging
+            kind: ACK_DELIVERED or ACK_READ
+            seqs: Acknowledged seqs
+            up_to: Acknowledge every seq up to this one as well (optional)
+            last_seq: Last seq of the room; later seqs are ignored
+            
+        Returns:
+            Number of seqs newly acknowledged
+        """
+        seqs = [seq for seq in seqs if 0 < seq <= last_seq]
+        if up_to is not None:
+            up_to = min(up_to, last_seq)
+        return self.ack_states.ack(room_id, user_id, kind, seqs, up_to)
@@ -1,15 +1,77 @@
 """Create Alert Use Case - Handles saving a new alert via WebSocket."""
-from src.entities.alert import Alert
-from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from src.entities.alert import Alert, SEVERITY_INFO
+from src.interface_adapters.repositories.repository_interfaces import (
+    AlertRepositoryInterface,
+    DuplicateAlertError
+)
+
+
+def expires_at_for(ttl: Optional[int]) -> Optional[datetime]:
+    """Naive UTC expiry instant for a TTL in seconds (None = never)."""
+    if ttl is None:
+        return None
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=ttl)
+
+
+class ClientMessageDedupe:
+    """
+    Bounded per-user cache of recently persisted client message IDs.
+    
+    Thread-safe: alerts are created from threadpool threads.
+    """
+    
+    def __init__(self, per_user: int = 256, max_users: int = 100_000):
+        self.per_user = per_user
+        self.max_users = max_users
+        self._seen: Dict[int, "OrderedDict[str, Alert]"] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user_id: int, client_msg_id: str) -> Optional[Alert]:
+        """Get the alert stored for a client message ID, if still cached."""
+        with self._lock:
+            seen = self._seen.get(user_id)
+            if seen is None:
+                return None
+            return seen.get(client_msg_id)
+    
+    def put(self, user_id: int, client_msg_id: str, alert: Alert):
+        """Remember an alert, evicting the user's oldest entry when full."""
+        with self._lock:
+            seen = self._seen.get(user_id)
+            if seen is None:
+                if len(self._seen) >= self.max_users:
+                    # Drop the user cached first; the unique index still guards them
+                    self._seen.pop(next(iter(self._seen)))
+                seen = self._seen[user_id] = OrderedDict()
+            seen[client_msg_id] = alert
+            if len(seen) > self.per_user:
+                seen.popitem(last=False)
 
 
 class CreateAlertUseCase:
     """Use case for creating a new alert."""
     
-    def __init__(self, alert_repository: AlertRepositoryInterface):
+    def __init__(
+        self,
+        alert_repository: AlertRepositoryInterface,
+        dedupe: Optional[ClientMessageDedupe] = None
+    ):
         self.alert_repository = alert_repository
+        self.dedupe = dedupe
     
-    def execute(self, content: str, user_id: int, room_id: int) -> Alert:
+    def execute(
+        self,
+        content: str,
+        user_id: int,
+        room_id: int,
+        client_msg_id: Optional[str] = None,
+        severity: str = SEVERITY_INFO,
+        ttl: Optional[int] = None
+    ) -> Alert:
         """
         Execute create alert use case.
         
@@ -17,14 +79,61 @@ class CreateAlertUseCase:
             content: Message content
             user_id: User ID who sent the message
             room_id: Room ID where message was sent
+            client_msg_id: Optional client message ID for idempotency
+            severity: Alert severity (see entities.alert.SEVERITIES)
+            ttl: Seconds until the alert expires (None = never)
+            
+        Returns:
+            The created Alert entity (or the original one for a resent ID)
+        """
+        alert, _ = self.execute_idempotent(content, user_id, room_id, client_msg_id, severity, ttl)
+        return alert
+    
+    def execute_idempotent(
+        self,
+        content: str,
+        user_id: int,
+        room_id: int,
+        client_msg_id: Optional[str] = None,
+        severity: str = SEVERITY_INFO,
+        ttl: Optional[int] = None
+    ) -> Tuple[Alert, bool]:
+        """
+        Create an alert unless the user already submitted client_msg_id.
+        
+        Args:
+            content: Message content
+            user_id: User ID who sent the message
+            room_id: Room ID where message was sent
+            client_msg_id: Optional client message ID for idempotency
+            severity: Alert severity (see entities.alert.SEVERITIES)
+            ttl: Seconds until the alert expires (None = never)
             
         Returns:
-            The created Alert entity
+            The alert and True if it was created, False if it was a duplicate
         """
+        if client_msg_id is not None and self.dedupe is not None:
+            cached = self.dedupe.get(user_id, client_msg_id)
+            if cached is not None:
+                return cached, False
+        
         alert = Alert(
             id=None,
             content=content,
             user_id=user_id,
-            room_id=room_id
+            room_id=room_id,
+            client_msg_id=client_msg_id,
+            severity=severity,
+            expires_at=expires_at_for(ttl)
         )
-        return self.alert_repository.create(alert)
+        created = True
+        try:
+            alert = self.alert_repository.create(alert)
+        except DuplicateAlertError as e:
+            # Cache miss (evicted or other worker), the unique index caught it
+            alert = e.existing
+            created = False
+        
+        if client_msg_id is not None and self.dedupe is not None:
+            self.dedupe.put(user_id, client_msg_id, alert)
+        return alert, created
@@ -0,0 +1,50 @@
+"""Create Alerts Batch Use Case - Handles bulk ingest from machine producers."""
+from typing import List, Optional
+from src.entities.alert import Alert, SEVERITY_INFO
+from src.use_cases.alerts.create_alert import expires_at_for
+from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
+
+
+class CreateAlertsBatchUseCase:
+    """Use case for creating many alerts at once."""
+    
+    def __init__(self, alert_repository: AlertRepositoryInterface):
+        self.alert_repository = alert_repository
+    
+    def execute(
+        self,
+        contents: List[str],
+        user_id: int,
+        room_id: int,
+        severities: Optional[List[str]] = None,
+        ttls: Optional[List[Optional[int]]] = None
+    ) -> List[Alert]:
+        """
+        Execute create alerts batch use case.
+        
+        Args:
+            contents: Message contents, in order
+            user_id: User ID who sent the messages
+            room_id: Room ID where messages were sent
+            severities: Severity of each message (all info if omitted)
+            ttls: Seconds until each message expires (None = never)
+            
+        Returns:
+            The created Alert entities, in the same order
+        """
+        if severities is None:
+            severities = [SEVERITY_INFO] * len(contents)
+        if ttls is None:
+            ttls = [None] * len(contents)
+        alerts = [
+            Alert(
+                id=None,
+                content=content,
+                user_id=user_id,
+                room_id=room_id,
+                severity=severity,
+                expires_at=expires_at_for(ttl)
+            )
+            for content, severity, ttl in zip(contents, severities, ttls)
+        ]
+        return self.alert_repository.create_many(alerts)
@@ -0,0 +1,32 @@
+"""Expire Alerts Use Case - Removes alerts whose TTL elapsed."""
+from datetime import datetime
+from typing import List, Tuple
+from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
+
+
+class ExpireAlertsUseCase:
+    """Use case for deleting expired alerts and listing pending expiries."""
+    
+    def __init__(self, alert_repository: AlertRepositoryInterface):
+        self.alert_repository = alert_repository
+    
+    def execute(self, alert_ids: List[int]) -> int:
+        """
+        Execute expire alerts use case.
+        
+        Args:
+            alert_ids: IDs of the alerts that expired
+            
+        Returns:
+            Number of alerts deleted
+        """
+        return self.alert_repository.delete_many(alert_ids)
+    
+    def pending(self) -> List[Tuple[int, int, datetime]]:
+        """
+        List the alerts that will expire, to schedule them at startup.
+        
+        Returns:
+            (alert_id, room_id, expires_at) tuples
+        """
+        return self.alert_repository.get_expiring()
@@ -1,6 +1,7 @@
 """Get Alerts Use Case - Retrieves alerts."""
 from typing import List, Optional
 from src.entities.alert import Alert
+from src.entities.alert_batch import AlertBatch
 from src.interface_adapters.repositories.repository_interfaces import AlertRepositoryInterface
 
 
@@ -21,3 +22,58 @@ class GetAlertsUseCase:
             List of alerts
         """
         return self.alert_repository.get_all(room_id=room_id)
+    
+    def execute_batch(self, room_id: Optional[int] = None) -> AlertBatch:
+        """
+        Execute get alerts use case returning a columnar batch.
+        
+        Args:
+            room_id: Optional room ID to filter alerts
+            
+        Returns:
+            Columnar batch of alerts
+        """
+        return self.alert_repository.get_batch(room_id=room_id)
+    
+    def execute_after(self, room_id: int, after_id: int, limit: int = 1000) -> List[Alert]:
+        """
+        Execute get alerts use case for a resuming client.
+        
+        Args:
+            room_id: Room ID
+            after_id: Last alert ID the client has seen
+            limit: Maximum number of alerts to return
+            
+        Returns:
+            Alerts newer than after_id, oldest first
+        """
+        return self.alert_repository.get_after(room_id, after_id, limit)
+    
+    def execute_range(self, room_id: int, from_seq: int, to_seq: int, limit: int = 1000) -> List[Alert]:
+        """
+        Execute get alerts use case for a client filling a gap.
+        
+        Args:
+            room_id: Room ID
+            from_seq: First sequence number wanted
+            to_seq: Last sequence number wanted (inclusive)
+            limit: Maximum number of alerts to return
+            
+        Returns:
+            Alerts of the range in seq order; a seq missing from a
+            complete (shorter than limit) reply was deleted or expired
+        """
+        return self.alert_repository.get_range(room_id, from_seq, to_seq, limit)
+    
+    def execute_ids(self, alert_ids: List[int]) -> List[Alert]:
+        """
+        Execute get alerts use case for specific alerts, e.g. a mailbox.
+        
+        Args:
+            alert_ids: Alert IDs (any rooms)
+            
+        Returns:
+            The alerts still stored, oldest first; deleted or expired
+            ones are left out
+        """
+        return self.alert_repository.get_many(alert_ids)
@@ -0,0 +1,41 @@
+"""Get Read State Use Case - Unread counts and pending acknowledgements."""
+from typing import Iterable, List, Optional
+from src.interface_adapters.repositories.repository_interfaces import AckStateInterface
+
+
+class GetReadStateUseCase:
+    """Use case for querying acknowledgement state."""
+    
+    def __init__(self, ack_states: AckStateInterface):
+        self.ack_states = ack_states
+    
+    def unread(self, room_id: int, user_id: int, last_seq: int) -> int:
+        """
+        Count the alerts of a room a user has not read.
+        
+        Args:
+            room_id: Room ID
+            user_id: User ID
+            last_seq: Last seq of the room
+            
+        Returns:
+            Seqs up to last_seq without a read ack (deleted or expired
+            alerts still count until read past)
+        """
+        return self.ack_states.unread(room_id, user_id, last_seq)
+    
+    def unacked(self, room_id: int, seq: int, kind: str, members: Iterable[int]) -> Optional[List[int]]:
+        """
+        List the members that have not acknowledged a critical alert.
+        
+        Args:
+            room_id: Room ID
+            seq: Seq of the alert
+            kind: ACK_DELIVERED or ACK_READ
+            members: User IDs of the room's members
+            
+        Returns:
+            User IDs in members order, None if the alert is not tracked
+            (not critical, or unknown)
+        """
+        return self.ack_states.unacked(room_id, seq, kind, members)
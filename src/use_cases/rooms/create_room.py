@@ -0,0 +1,25 @@
+"""Create Room Use Case - Creates a new room."""
+from src.entities.room import Room
+from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+
+
+class CreateRoomUseCase:
+    """Use case for creating a room."""
+    
+    def __init__(self, room_repository: RoomRepositoryInterface):
+        self.room_repository = room_repository
+    
+    def execute(self, name: str) -> Room:
+        """
+        Execute create room use case.
+        
+        Args:
+            name: Room name (unique)
+            
+        Returns:
+            The created Room entity
+            
+        Raises:
+            RoomNameTakenError: If the name is already in use
+        """
+        return self.room_repository.create(Room(id=None, name=name))
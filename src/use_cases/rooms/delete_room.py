@@ -0,0 +1,21 @@
+"""Delete Room Use Case - Removes a room and its history."""
+from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+
+
+class DeleteRoomUseCase:
+    """Use case for deleting a room."""
+    
+    def __init__(self, room_repository: RoomRepositoryInterface):
+        self.room_repository = room_repository
+    
+    def execute(self, room_id: int) -> bool:
+        """
+        Execute delete room use case.
+        
+        Args:
+            room_id: Room ID
+            
+        Returns:
+            True if the room existed and was deleted
+        """
+        return self.room_repository.delete(room_id)
@@ -1,7 +1,7 @@
 """Get Rooms Use Case - Retrieves all rooms."""
 from typing import List
 from src.entities.room import Room
-from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+from src.interface_adapters.repositories.repository_interfaces import RoomListing, RoomRepositoryInterface
 
 
 class GetRoomsUseCase:
@@ -18,3 +18,12 @@ class GetRoomsUseCase:
             List of all rooms
         """
         return self.room_repository.get_all()
+    
+    def execute_listings(self) -> List[RoomListing]:
+        """
+        Get every room with its member users, for room listings.
+        
+        Returns:
+            List of rooms with their users
+        """
+        return self.room_repository.get_listings()
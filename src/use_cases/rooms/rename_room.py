@@ -0,0 +1,27 @@
+"""Rename Room Use Case - Changes the name of a room."""
+from typing import Optional
+from src.entities.room import Room
+from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+
+
+class RenameRoomUseCase:
+    """Use case for renaming a room."""
+    
+    def __init__(self, room_repository: RoomRepositoryInterface):
+        self.room_repository = room_repository
+    
+    def execute(self, room_id: int, name: str) -> Optional[Room]:
+        """
+        Execute rename room use case.
+        
+        Args:
+            room_id: Room ID
+            name: New room name (unique)
+            
+        Returns:
+            The renamed Room entity, None if the room does not exist
+            
+        Raises:
+            RoomNameTakenError: If the name is already in use
+        """
+        return self.room_repository.rename(room_id, name)
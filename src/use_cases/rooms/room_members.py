@@ -0,0 +1,35 @@
+"""Room Members Use Case - Adds and removes users from rooms."""
+from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+
+
+class RoomMembersUseCase:
+    """Use case for managing room membership."""
+    
+    def __init__(self, room_repository: RoomRepositoryInterface):
+        self.room_repository = room_repository
+    
+    def add(self, room_id: int, user_id: int) -> bool:
+        """
+        Add a user to a room (no-op if already a member).
+        
+        Args:
+            room_id: Room ID
+            user_id: User ID
+            
+        Returns:
+            False if the room or the user does not exist
+        """
+        return self.room_repository.add_member(room_id, user_id)
+    
+    def remove(self, room_id: int, user_id: int) -> bool:
+        """
+        Remove a user from a room.
+        
+        Args:
+            room_id: Room ID
+            user_id: User ID
+            
+        Returns:
+            False if the user was not a member
+        """
+        return self.room_repository.remove_member(room_id, user_id)
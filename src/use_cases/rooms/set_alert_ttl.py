@@ -0,0 +1,23 @@
+"""Set Room Alert TTL Use Case - Default expiry for alerts of a room."""
+from typing import Optional
+from src.interface_adapters.repositories.repository_interfaces import RoomRepositoryInterface
+
+
+class SetRoomAlertTTLUseCase:
+    """Use case for setting the default alert TTL of a room."""
+    
+    def __init__(self, room_repository: RoomRepositoryInterface):
+        self.room_repository = room_repository
+    
+    def execute(self, room_id: int, alert_ttl: Optional[int]) -> bool:
+        """
+        Execute set room alert TTL use case.
+        
+        Args:
+            room_id: Room ID
+            alert_ttl: Seconds alerts posted without a TTL live (None = forever)
+            
+        Returns:
+            True if the room exists
+        """
+        return self.room_repository.set_alert_ttl(room_id, alert_ttl)
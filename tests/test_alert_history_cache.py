@@ -0,0 +1,115 @@
+"""AlertHistoryCache versions and LRU accounting, and If-None-Match matching."""
+import pytest
+
+from src.interface_adapters.controllers.alerts_controller import _alerts_response, _etag_matches
+from src.interface_adapters.repositories.alert_history_cache import (
+    _MAX_CURSORS_PER_ROOM,
+    AlertHistoryCache,
+    make_etag
+)
+
+
+def test_hit_until_bump():
+    cache = AlertHistoryCache()
+    version = cache.version(1)
+    entry = cache.put(1, "all", version, b"[1]")
+    assert cache.get(1, "all") == entry
+    cache.bump(1)
+    assert cache.get(1, "all") is None
+    assert cache.stats()["bytes"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_put_after_bump_is_not_stored():
+    cache = AlertHistoryCache()
+    # A reader takes the version, then an insert lands before it puts
+    version = cache.version(1)
+    cache.bump(1)
+    entry = cache.put(1, "all", version, b"[old]")
+    assert entry.etag == make_etag(b"[old]")
+    assert cache.get(1, "all") is None
+    assert cache.stats()["responses"] == 0
+
+
+def test_forgotten_room_refuses_puts_built_before():
+    cache = AlertHistoryCache()
+    version = cache.version(1)
+    cache.forget_room(1)
+    cache.put(1, "all", version, b"[x]")
+    assert cache.get(1, "all") is None
+
+
+def test_expired_entry_is_rebuilt():
+    cache = AlertHistoryCache(max_age=-1)
+    cache.put(1, "all", 0, b"[1]")
+    assert cache.get(1, "all") is None
+
+
+def test_byte_accounting_follows_replacements_and_drops():
+    cache = AlertHistoryCache()
+    cache.put(1, "a", 0, b"12345")
+    cache.put(1, "b", 0, b"123")
+    cache.put(1, "a", 0, b"12")
+    cache.put(2, "a", 0, b"1234")
+    assert cache.stats()["bytes"] == 3 + 2 + 4
+    cache.bump(1)
+    assert cache.stats()["bytes"] == 4
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "rooms": 0, "responses": 0, "bytes": 0}
+
+
+def test_cursors_per_room_are_bounded():
+    cache = AlertHistoryCache()
+    for cursor in range(_MAX_CURSORS_PER_ROOM + 3):
+        cache.put(1, cursor, 0, b"xx")
+    stats = cache.stats()
+    assert stats["responses"] == _MAX_CURSORS_PER_ROOM
+    assert stats["bytes"] == 2 * _MAX_CURSORS_PER_ROOM
+    # The oldest cursors went first
+    assert cache.get(1, 0) is None
+    assert cache.get(1, _MAX_CURSORS_PER_ROOM + 2) is not None
+
+
+def test_least_recently_used_room_is_dropped_past_max_bytes():
+    cache = AlertHistoryCache(max_bytes=10)
+    cache.put(1, "all", 0, b"1111")
+    cache.put(2, "all", 0, b"2222")
+    assert cache.get(1, "all") is not None
+    cache.put(3, "all", 0, b"3333")
+    assert cache.get(2, "all") is None
+    assert cache.get(1, "all") is not None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_body_larger_than_the_cache_is_not_stored():
+    cache = AlertHistoryCache(max_bytes=4)
+    entry = cache.put(1, "all", 0, b"too large")
+    assert entry.body == b"too large"
+    assert cache.stats()["bytes"] == 0
+
+
+ETAG = make_etag(b"[]")
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    (ETAG, True),
+    ("*", True),
+    (" * ", True),
+    (f"W/{ETAG}", True),
+    (f'"other", {ETAG}', True),
+    (f'"other",W/{ETAG} , "more"', True),
+    ('"other"', False),
+    (ETAG.strip('"'), False),
+    (f"w/{ETAG}", False),
+    (f'"other", *', False),
+])
+def test_etag_matches(header, matches):
+    assert _etag_matches(header, ETAG) is matches
+
+
+def test_matching_etag_answers_not_modified():
+    assert _alerts_response(b"[]", ETAG, f'"x", {ETAG}').status_code == 304
+    response = _alerts_response(b"[]", ETAG, '"x"')
+    assert (response.status_code, response.body, response.headers["etag"]) == (200, b"[]", ETAG)
@@ -0,0 +1,90 @@
+"""CreateAlertUseCase idempotency: the client_msg_id cache and the unique-index fallback."""
+import threading
+
+import pytest
+
+from src.interface_adapters.repositories.memory_repositories import MemoryAlertRepository, MemoryStore
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.use_cases.alerts.create_alert import ClientMessageDedupe, CreateAlertUseCase
+
+
+class CountingRepository(MemoryAlertRepository):
+    """Memory repository counting the create() calls that reach it."""
+
+    def __init__(self):
+        super().__init__(MemoryStore())
+        self.creates = 0
+
+    def create(self, alert):
+        self.creates += 1
+        return super().create(alert)
+
+
+@pytest.fixture(autouse=True)
+def fresh_sequences():
+    room_sequences.clear()
+    yield
+    room_sequences.clear()
+
+
+def test_resend_is_answered_from_the_cache():
+    repo = CountingRepository()
+    use_case = CreateAlertUseCase(repo, ClientMessageDedupe())
+    first, created = use_case.execute_idempotent("hi", user_id=1, room_id=1, client_msg_id="m1")
+    again, created_again = use_case.execute_idempotent("hi", user_id=1, room_id=1, client_msg_id="m1")
+    assert (created, created_again) == (True, False)
+    assert again is first
+    assert repo.creates == 1
+
+
+def test_resend_after_eviction_falls_back_to_the_stored_alert():
+    repo = CountingRepository()
+    dedupe = ClientMessageDedupe(per_user=1)
+    use_case = CreateAlertUseCase(repo, dedupe)
+    first, _ = use_case.execute_idempotent("one", user_id=1, room_id=1, client_msg_id="m1")
+    use_case.execute_idempotent("two", user_id=1, room_id=1, client_msg_id="m2")
+    assert dedupe.get(1, "m1") is None
+    again, created = use_case.execute_idempotent("one", user_id=1, room_id=1, client_msg_id="m1")
+    assert not created
+    assert again.id == first.id
+    assert repo.creates == 3
+    assert len(repo.get_all(1)) == 2
+    # The fallback result is cached again
+    assert dedupe.get(1, "m1").id == first.id
+
+
+def test_without_client_msg_id_every_frame_is_new():
+    repo = CountingRepository()
+    use_case = CreateAlertUseCase(repo, ClientMessageDedupe())
+    for _ in range(3):
+        assert use_case.execute_idempotent("hi", user_id=1, room_id=1)[1]
+    assert repo.creates == 3
+
+
+def test_oldest_user_is_evicted_past_max_users():
+    dedupe = ClientMessageDedupe(max_users=2)
+    for user_id in (1, 2, 3):
+        dedupe.put(user_id, "m", user_id)
+    assert [dedupe.get(user_id, "m") for user_id in (1, 2, 3)] == [None, 2, 3]
+
+
+def test_concurrent_puts_stay_bounded():
+    dedupe = ClientMessageDedupe(per_user=8, max_users=16)
+    errors = []
+
+    def hammer(worker: int):
+        try:
+            for i in range(2000):
+                dedupe.put(i % 40, f"{worker}-{i}", i)
+                dedupe.get(i % 40, f"{worker}-{i}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(dedupe._seen) <= 16
+    assert all(len(seen) <= 8 for seen in dedupe._seen.values())
@@ -0,0 +1,77 @@
+"""DeliveryQueue priority and Outbox shedding of non-critical frames."""
+import asyncio
+import json
+
+import pytest
+
+from src.interface_adapters.controllers.websocket_controller import DeliveryQueue, Outbox
+
+
+class RecordingSocket:
+    """Stands in for a WebSocket; keeps what was sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def drain(queue):
+    async def take_all():
+        return [await queue.get() for _ in range(len(queue))]
+    return asyncio.run(take_all())
+
+
+def test_critical_lane_first():
+    queue = DeliveryQueue(maxsize=10)
+    queue.put("a")
+    queue.put("b")
+    queue.put("c1", critical=True)
+    queue.put("d")
+    queue.put("c2", critical=True)
+    assert drain(queue) == ["c1", "c2", "a", "b", "d"]
+
+
+def test_only_the_normal_lane_is_bounded():
+    queue = DeliveryQueue(maxsize=2)
+    assert queue.put("a") and queue.put("b")
+    assert not queue.put("c")
+    assert queue.put("c", force=True)
+    for i in range(5):
+        assert queue.put(f"x{i}", critical=True)
+    assert len(queue.normal) == 3
+    assert len(queue.critical) == 5
+
+
+def run_outbox(maxsize, pushes):
+    """Push (message, critical) pairs before the sender runs, then let it drain."""
+    async def scenario():
+        socket = RecordingSocket()
+        outbox = Outbox(socket, maxsize)
+        for message, critical in pushes:
+            outbox.push(message, critical)
+        await outbox.finish("bye", timeout=1)
+        return socket.sent
+    return asyncio.run(scenario())
+
+
+def test_outbox_sheds_oldest_and_reports_dropped():
+    sent = run_outbox(2, [("a", False), ("b", False), ("c", False), ("d", False)])
+    assert sent == [json.dumps({"dropped": 2}), "c", "d", "bye"]
+
+
+def test_outbox_never_sheds_critical():
+    sent = run_outbox(1, [("a", False), ("!1", True), ("b", False), ("!2", True), ("c", False)])
+    assert sent == [json.dumps({"dropped": 2}), "!1", "!2", "c", "bye"]
+
+
+@pytest.mark.parametrize("pushes", [
+    [("a", False), ("b", False)],
+    [("!1", True), ("a", False)],
+])
+def test_outbox_with_no_normal_room_drops_the_new_frame(pushes):
+    sent = run_outbox(0, pushes)
+    critical = [message for message, is_critical in pushes if is_critical]
+    dropped = len(pushes) - len(critical)
+    assert sent == [json.dumps({"dropped": dropped})] + critical + ["bye"]
@@ -0,0 +1,150 @@
+"""Inbound frame schema: which frames are accepted, and how the others are refused."""
+import json
+
+import pytest
+
+from src.interface_adapters.presenters.inbound_frames import (
+    FRAME_TOO_LARGE,
+    INVALID_FRAME,
+    INVALID_JSON,
+    MAX_ACK_SEQS,
+    MAX_CLIENT_MSG_ID_LENGTH,
+    MAX_CONTENT_LENGTH,
+    ROOM_MISMATCH,
+    FrameError,
+    parse_multiplex_frame,
+    parse_room_frame
+)
+
+ROOM_ACCEPTED = [
+    {"message": "disk full"},
+    {"message": "m" * MAX_CONTENT_LENGTH, "client_msg_id": "c" * MAX_CLIENT_MSG_ID_LENGTH},
+    {"message": "x", "severity": "critical", "ttl": 60, "room_id": 3},
+    {"action": "fetch", "from_seq": 1, "to_seq": 20},
+    {"action": "ack", "seqs": [1, 2, 3]},
+    {"action": "read", "up_to": 10},
+    {"action": "ack", "seqs": list(range(1, MAX_ACK_SEQS + 1))},
+    {"action": "event", "type": "typing"},
+    {"action": "event", "type": "typing", "data": {"active": False}},
+    {"action": "event", "type": "metric", "data": {"name": "cpu", "value": 0.5}}
+]
+
+MULTIPLEX_ONLY = [
+    {"action": "subscribe", "room_id": 1},
+    {"action": "subscribe", "room_id": 1, "last_alert_id": 42},
+    {"action": "unsubscribe", "room_id": 1}
+]
+
+# (frame, loc, pydantic error type)
+REJECTED = [
+    ({"message": ""}, "message", "string_too_short"),
+    ({"message": "m" * (MAX_CONTENT_LENGTH + 1)}, "message", "string_too_long"),
+    ({"message": 5}, "message", "string_type"),
+    ({"message": "x", "client_msg_id": "c" * (MAX_CLIENT_MSG_ID_LENGTH + 1)}, "client_msg_id", "string_too_long"),
+    ({"message": "x", "severity": "fatal"}, "severity", "literal_error"),
+    # Strict: no coercion from strings
+    ({"message": "x", "ttl": "5"}, "ttl", "int_type"),
+    ({"message": "x", "ttl": 0}, "ttl", "greater_than"),
+    ({"message": "x", "room_id": 0}, "room_id", "greater_than"),
+    ({}, "message", "missing"),
+    ([], "action", "union_tag_not_found"),
+    ({"action": 5}, "action", "union_tag_not_found"),
+    ({"action": "nope"}, "action", "union_tag_invalid"),
+    ({"action": "fetch", "from_seq": 0, "to_seq": 2}, "from_seq", "greater_than"),
+    ({"action": "fetch", "from_seq": 1}, "to_seq", "missing"),
+    ({"action": "ack", "seqs": [1, "2"]}, "seqs.1", "int_type"),
+    ({"action": "ack", "seqs": list(range(1, MAX_ACK_SEQS + 2))}, "seqs", "too_long"),
+    ({"action": "ack", "up_to": True}, "up_to", "int_type"),
+    ({"action": "event", "type": "typing", "data": {"active": 1}}, "data.active", "bool_type"),
+    ({"action": "event", "type": "metric", "data": {"name": "cpu"}}, "data.value", "missing"),
+    ({"action": "event", "type": "other"}, "action", "union_tag_invalid")
+]
+
+
+def _refusal(parse, data: str, **kwargs) -> FrameError:
+    with pytest.raises(FrameError) as info:
+        parse(data, **kwargs)
+    return info.value
+
+
+@pytest.mark.parametrize("frame", ROOM_ACCEPTED)
+def test_room_frames_accepted(frame):
+    assert parse_room_frame(json.dumps(frame)) == frame
+    assert parse_multiplex_frame(json.dumps(frame)) == frame
+
+
+@pytest.mark.parametrize("frame", MULTIPLEX_ONLY)
+def test_subscriptions_only_on_multiplexed_sockets(frame):
+    assert parse_multiplex_frame(json.dumps(frame)) == frame
+    error = _refusal(parse_room_frame, json.dumps(frame))
+    assert error.error == INVALID_FRAME
+    assert error.fields == [{"loc": "action", "type": "union_tag_invalid"}]
+
+
+@pytest.mark.parametrize("parse", [parse_room_frame, parse_multiplex_frame])
+@pytest.mark.parametrize("frame,loc,error_type", REJECTED)
+def test_invalid_frames_name_the_field(parse, frame, loc, error_type):
+    error = _refusal(parse, json.dumps(frame))
+    assert error.error == INVALID_FRAME
+    assert error.fields == [{"loc": loc, "type": error_type}]
+
+
+@pytest.mark.parametrize("frame,loc,error_type", [
+    ({"action": "subscribe"}, "room_id", "missing"),
+    ({"action": "subscribe", "room_id": -1}, "room_id", "greater_than"),
+    ({"action": "unsubscribe", "room_id": "1"}, "room_id", "int_type")
+])
+def test_invalid_subscriptions(frame, loc, error_type):
+    error = _refusal(parse_multiplex_frame, json.dumps(frame))
+    assert error.fields == [{"loc": loc, "type": error_type}]
+
+
+@pytest.mark.parametrize("data", ["", "{bad", '{"message": "x"} trailing', "[1,"])
+def test_invalid_json(data):
+    error = _refusal(parse_room_frame, data)
+    assert error.error == INVALID_JSON
+    assert error.fields == []
+
+
+def test_non_finite_metric_value():
+    data = '{"action": "event", "type": "metric", "data": {"name": "cpu", "value": NaN}}'
+    error = _refusal(parse_room_frame, data)
+    assert error.fields == [{"loc": "data.value", "type": "finite_number"}]
+
+
+def test_unknown_keys_ignored():
+    assert parse_room_frame('{"message": "x", "extra": [1, 2]}') == {"message": "x"}
+
+
+def test_size_checked_before_parsing():
+    data = json.dumps({"message": "x" * 100})
+    assert parse_room_frame(data, max_size=len(data))["message"] == "x" * 100
+    # Not even JSON: refused on size alone
+    error = _refusal(parse_room_frame, "{" * 51, max_size=50)
+    assert error.error == FRAME_TOO_LARGE
+    assert json.loads(error.message(3)) == {"error": FRAME_TOO_LARGE, "limit": 50, "room_id": 3}
+
+
+def test_error_message_shape():
+    error = _refusal(parse_room_frame, '{"message": ""}')
+    assert json.loads(error.message(7)) == {
+        "error": INVALID_FRAME,
+        "fields": [{"loc": "message", "type": "string_too_short"}],
+        "room_id": 7
+    }
+    assert "room_id" not in json.loads(error.message())
+
+
+@pytest.mark.parametrize("frame", [
+    {"message": "x", "room_id": 4},
+    {"action": "fetch", "room_id": 4, "from_seq": 1, "to_seq": 2},
+    {"action": "ack", "room_id": 4, "seqs": [1]},
+    {"action": "event", "type": "typing", "room_id": 4}
+])
+def test_room_socket_refuses_other_rooms(frame):
+    data = json.dumps(frame)
+    assert parse_room_frame(data, room_id=4) == frame
+    assert parse_room_frame(json.dumps({k: v for k, v in frame.items() if k != "room_id"}), room_id=3)
+    error = _refusal(parse_room_frame, data, room_id=3)
+    assert error.error == INVALID_FRAME
+    assert error.fields == [{"loc": "room_id", "type": ROOM_MISMATCH}]
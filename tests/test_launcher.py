@@ -0,0 +1,82 @@
+"""Launcher: profile, command line and environment resolved into uvicorn options."""
+import pytest
+
+from src.frameworks_drivers import launcher
+
+
+@pytest.fixture(autouse=True)
+def plain_environment(monkeypatch):
+    """No cluster, database backend, 4 usable cores, whatever the test machine has."""
+    monkeypatch.setattr(launcher.settings, "CLUSTER_NODES", "")
+    monkeypatch.setattr(launcher.settings, "REPOSITORY_BACKEND", "sql")
+    monkeypatch.setattr(launcher, "usable_cores", lambda: 4)
+
+
+def _config(*argv: str) -> dict:
+    return launcher.build_config(launcher._parser().parse_args(["--host", "127.0.0.1", "--port", "8000", *argv]))
+
+
+@pytest.mark.parametrize("profile", sorted(launcher.PROFILES))
+def test_every_profile_runs_one_process(profile):
+    config = _config("--profile", profile)
+    assert config["workers"] == 1
+    assert config["nodes"] == []
+    for option, value in launcher.PROFILES[profile].items():
+        if option != "workers":
+            assert config[option] == value
+
+
+def test_command_line_overrides_the_profile():
+    config = _config(
+        "--profile", "throughput", "--no-ws-per-message-deflate", "--ws-ping-interval", "5", "--backlog", "128"
+    )
+    assert config["ws_per_message_deflate"] is False
+    assert config["ws_ping_interval"] == 5.0
+    assert config["backlog"] == 128
+    assert config["ws_max_queue"] == launcher.PROFILES["throughput"]["ws_max_queue"]
+
+
+def test_frame_limit_fits_the_protocol_limit():
+    assert _config()["ws_max_size"] == 4 * launcher.settings.WS_MAX_FRAME_SIZE
+    assert _config("--ws-max-size", "1000")["ws_max_size"] == 1000
+
+
+@pytest.mark.parametrize("workers,expected", [("3", 3), ("auto", 4)])
+def test_workers_start_a_local_cluster(workers, expected):
+    config = _config("--workers", workers)
+    assert config["workers"] == expected
+    assert config["nodes"] == [f"http://127.0.0.1:{8000 + index}" for index in range(expected)]
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "::"])
+def test_wildcard_cluster_needs_a_public_host(host):
+    args = launcher._parser().parse_args(["--host", host, "--workers", "2"])
+    with pytest.raises(ValueError, match="--public-host"):
+        launcher.build_config(args)
+    # main() turns it into a usage error
+    with pytest.raises(SystemExit) as info:
+        launcher.main(["--host", host, "--workers", "2", "--print-config"])
+    assert info.value.code == 2
+
+    config = _config("--host", host, "--workers", "2", "--public-host", "alerts.example.com")
+    assert config["nodes"] == ["http://alerts.example.com:8000", "http://alerts.example.com:8001"]
+    # One process needs no redirects
+    assert _config("--host", host)["nodes"] == []
+
+
+def test_single_process_settings(monkeypatch):
+    assert _config("--workers", "4", "--reload")["workers"] == 1
+    monkeypatch.setattr(launcher.settings, "REPOSITORY_BACKEND", "memory")
+    assert _config("--workers", "4")["workers"] == 1
+    monkeypatch.setattr(launcher.settings, "REPOSITORY_BACKEND", "sql")
+    monkeypatch.setattr(launcher.settings, "CLUSTER_NODES", "http://a:1,http://b:2")
+    config = _config("--workers", "4")
+    assert config["workers"] == 1 and config["nodes"] == []
+    assert any("CLUSTER_NODES" in note for note in config["notes"])
+
+
+def test_print_config(capsys):
+    launcher.main(["--host", "127.0.0.1", "--port", "8000", "--workers", "2", "--print-config"])
+    output = capsys.readouterr().out
+    assert "workers                  2" in output
+    assert "http://127.0.0.1:8001" in output
@@ -0,0 +1,16 @@
+"""LookupCache: room member lists, loaded whole on a miss and kept current."""
+from src.interface_adapters.repositories.lookup_cache import LookupCache
+
+
+def test_room_members_load_once_then_follow_changes():
+    cache = LookupCache()
+    # A room never loaded is left for the first lookup to load in full
+    cache.add_room_member(1, 5)
+    assert 1 not in cache.room_members
+    cache.put_room_members(1, [5, 6])
+    cache.add_room_member(1, 7)
+    cache.add_room_member(1, 5)
+    cache.remove_room_member(1, 6)
+    assert cache.room_members[1].tolist() == [5, 7]
+    cache.put_room_members(2, [])
+    assert cache.room_members[2].tolist() == []
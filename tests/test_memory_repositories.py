@@ -0,0 +1,204 @@
+"""Memory repositories: MemoryStore eviction, room routing, parity with the SQL repository."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.entities.alert import Alert, utcnow
+from src.entities.room import Room
+from src.entities.user import User
+from src.frameworks_drivers.db.orm_models import Base, RoomORM
+from src.interface_adapters.repositories.alert_repository import SQLAlertRepository
+from src.interface_adapters.repositories.memory_repositories import (
+    EPHEMERAL_ALERT_ID_BASE,
+    MemoryAlertRepository,
+    MemoryRoomRepository,
+    MemoryStore,
+    MemoryUserRepository,
+    RoomRoutedAlertRepository
+)
+from src.interface_adapters.repositories.repository_interfaces import DuplicateAlertError
+from src.interface_adapters.repositories.room_repository import SQLRoomRepository
+from src.interface_adapters.repositories.room_sequences import room_sequences
+from src.interface_adapters.repositories.user_repository import SQLUserRepository
+
+T0 = datetime(2026, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_sequences():
+    room_sequences.clear()
+    yield
+    room_sequences.clear()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([RoomORM(id=room_id, name=f"room {room_id}") for room_id in (1, 2, 3)])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def alert(room_id: int, content: str, **fields) -> Alert:
+    return Alert(id=None, content=content, user_id=1, room_id=room_id, **fields)
+
+
+def stored(store: MemoryStore, room_id: int, seq: int, **fields) -> Alert:
+    """An alert as MemoryStore.add_alert receives it (id and seq allocated)."""
+    return Alert(
+        id=store.next_alert_id(), content=f"s{seq}", user_id=1, room_id=room_id,
+        created_at=T0, seq=seq, **fields
+    )
+
+
+def shape(alerts):
+    return [(a.content, a.room_id, a.seq, a.severity) for a in alerts]
+
+
+def test_add_alert_evicts_oldest_of_the_room():
+    store = MemoryStore(max_alerts_per_room=3)
+    with store.lock:
+        for seq in range(1, 6):
+            store.add_alert(stored(store, 1, seq, client_msg_id=f"m{seq}", expires_at=T0))
+        store.add_alert(stored(store, 2, 1))
+    assert [a.seq for a in store.room_alerts[1]] == [3, 4, 5]
+    assert len(store.alerts) == 4
+    assert sorted(key[1] for key in store.client_msg_ids) == ["m3", "m4", "m5"]
+    assert sorted(store.expiring) == [3, 4, 5]
+    # A pending expiry of an evicted alert is a no-op delete
+    assert MemoryAlertRepository(store).delete_many([1, 2, 3]) == 1
+
+
+def test_unbounded_store_keeps_everything():
+    store = MemoryStore()
+    with store.lock:
+        for seq in range(1, 101):
+            store.add_alert(stored(store, 1, seq))
+    assert len(store.room_alerts[1]) == 100
+
+
+def test_add_alert_keeps_seq_order_after_a_reseed():
+    store = MemoryStore()
+    with store.lock:
+        for seq in (1, 2, 5, 3, 4):
+            store.add_alert(stored(store, 1, seq))
+    assert [a.seq for a in store.room_alerts[1]] == [1, 2, 3, 4, 5]
+    assert store.max_seq(1) == 5
+    with store.lock:
+        assert store.remove_alert(store.room_alerts[1][2].id)
+    assert [a.seq for a in store.room_alerts[1]] == [1, 2, 4, 5]
+
+
+def test_forget_room_drops_its_alerts_only():
+    store = MemoryStore()
+    repo = MemoryAlertRepository(store)
+    repo.create_many([alert(1, "a", client_msg_id="x"), alert(2, "b")])
+    store.forget_room(1)
+    assert shape(repo.get_all()) == [("b", 2, 1, "info")]
+    assert repo.get_by_client_msg_id(1, "x") is None
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_repositories_agree(backend, db):
+    repo = SQLAlertRepository(db) if backend == "sql" else MemoryAlertRepository(MemoryStore())
+    first = repo.create(alert(1, "a", client_msg_id="c1", created_at=T0))
+    repo.create_many([
+        alert(2, "b", created_at=T0 + timedelta(seconds=1)),
+        alert(1, "c", severity="warning", created_at=T0 + timedelta(seconds=2)),
+        alert(1, "d", created_at=T0 + timedelta(seconds=3)),
+        alert(1, "gone", expires_at=utcnow() - timedelta(seconds=1), created_at=T0 + timedelta(seconds=4))
+    ])
+    assert shape(repo.get_all(1)) == [("a", 1, 1, "info"), ("c", 1, 2, "warning"), ("d", 1, 3, "info")]
+    assert [a.content for a in repo.get_all()] == ["a", "b", "c", "d"]
+    assert [a.content for a in repo.get_after(1, first.id, 10)] == ["c", "d"]
+    assert [a.seq for a in repo.get_range(1, 2, 4, 10)] == [2, 3]
+    assert [a.seq for a in repo.get_range(1, 1, 4, 1)] == [1]
+    with pytest.raises(DuplicateAlertError) as error:
+        repo.create(alert(1, "again", client_msg_id="c1"))
+    assert error.value.existing.id == first.id
+    assert repo.get_by_client_msg_id(1, "c1").content == "a"
+    batch = repo.get_batch(1)
+    assert batch.seqs.tolist() == [1, 2, 3]
+    assert list(batch.contents()) == ["a", "c", "d"]
+    assert len(repo.get_expiring()) == 1
+    ids = [a.id for a in repo.get_all(1)]
+    assert repo.delete_many(ids[:2] + [ids[0]]) == 2
+    assert [a.content for a in repo.get_many(ids)] == ["d"]
+
+
+@pytest.fixture
+def routed(db):
+    memory = MemoryAlertRepository(MemoryStore(first_alert_id=EPHEMERAL_ALERT_ID_BASE))
+    return RoomRoutedAlertRepository(SQLAlertRepository(db), memory, frozenset({2}))
+
+
+def test_routed_ids_split_at_the_memory_base(routed):
+    durable = routed.create(alert(1, "d"))
+    ephemeral = routed.create(alert(2, "m"))
+    assert durable.id < EPHEMERAL_ALERT_ID_BASE == 2 ** 40 == ephemeral.id
+    assert routed._split_ids([EPHEMERAL_ALERT_ID_BASE - 1, EPHEMERAL_ALERT_ID_BASE, durable.id]) == (
+        [EPHEMERAL_ALERT_ID_BASE - 1, durable.id], [EPHEMERAL_ALERT_ID_BASE]
+    )
+    assert [a.content for a in routed.get_many([ephemeral.id, durable.id])] == ["d", "m"]
+    assert routed.get_all(2) == routed.memory.get_all(2)
+    assert routed.delete_many([ephemeral.id, durable.id, 12345]) == 2
+    assert routed.get_all() == []
+
+
+def test_routed_create_many_keeps_input_order(routed):
+    created = routed.create_many([alert(1, "d1"), alert(2, "m1"), alert(1, "d2"), alert(2, "m2"), alert(3, "d3")])
+    assert shape(created) == [
+        ("d1", 1, 1, "info"), ("m1", 2, 1, "info"), ("d2", 1, 2, "info"), ("m2", 2, 2, "info"), ("d3", 3, 1, "info")
+    ]
+    assert [a.id >= EPHEMERAL_ALERT_ID_BASE for a in created] == [False, True, False, True, False]
+    assert len(routed.durable.get_all()) == 3
+    assert len(routed.memory.get_all()) == 2
+
+
+def test_routed_get_all_merges_by_created_at(routed):
+    offsets = {"d0": 0, "m1": 1, "m2": 2, "d3": 3, "m4": 4, "d5": 5}
+    routed.create_many([
+        alert(2 if content.startswith("m") else 1, content, created_at=T0 + timedelta(seconds=offset))
+        for content, offset in sorted(offsets.items(), key=lambda item: item[0][0])
+    ])
+    expected = sorted(offsets, key=offsets.get)
+    assert [a.content for a in routed.get_all()] == expected
+    batch = routed.get_batch()
+    assert list(batch.contents()) == expected
+    assert batch.created_at.tolist() == sorted(batch.created_at.tolist())
+
+
+def test_routed_duplicate_lookup_checks_both(routed):
+    routed.create(alert(1, "d", client_msg_id="x"))
+    routed.create(alert(2, "m", client_msg_id="y"))
+    assert routed.get_by_client_msg_id(1, "x").content == "d"
+    assert routed.get_by_client_msg_id(1, "y").content == "m"
+    with pytest.raises(DuplicateAlertError):
+        routed.create(alert(2, "again", client_msg_id="y"))
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_room_listings_agree(backend, db):
+    if backend == "sql":
+        users, rooms = SQLUserRepository(db), SQLRoomRepository(db)
+    else:
+        store = MemoryStore()
+        users, rooms = MemoryUserRepository(store), MemoryRoomRepository(store)
+        for room_id in (1, 2, 3):
+            rooms.create(Room(id=None, name=f"room {room_id}"))
+    ana = users.create(User(id=None, username="ana", password="p"))
+    bob = users.create(User(id=None, username="bob", password="p"))
+    rooms.add_member(1, ana.id)
+    rooms.add_member(1, bob.id)
+    rooms.add_member(1, ana.id)
+    rooms.add_member(3, bob.id)
+    listings = rooms.get_listings()
+    assert [(room.id, room.name, [user.username for user in room.users], room.alert_ttl) for room in listings] == [
+        (1, "room 1", ["ana", "bob"], None), (2, "room 2", [], None), (3, "room 3", ["bob"], None)
+    ]
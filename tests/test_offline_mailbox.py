@@ -0,0 +1,61 @@
+"""OfflineMailbox: bounded per-user id queues, overflow to resync and id widening."""
+from src.interface_adapters.offline_mailbox import OfflineMailbox
+
+BIG = 2 ** 32 + 5
+
+
+def test_store_and_take():
+    mailbox = OfflineMailbox(capacity=4)
+    mailbox.store([1, 2], [10, 11])
+    mailbox.store([1], [12])
+    ids, resync = mailbox.take(1)
+    assert (ids.tolist(), resync) == ([10, 11, 12], False)
+    assert mailbox.take(2)[0].tolist() == [10, 11]
+    assert mailbox.take(1)[0].tolist() == []
+    assert len(mailbox) == 0
+
+
+def test_overflow_collapses_to_resync():
+    mailbox = OfflineMailbox(capacity=3)
+    mailbox.store([1, 2], [1, 2])
+    mailbox.store([1], [3])
+    mailbox.store([1, 2], [4])
+    assert mailbox.stats()["resync"] == 1
+    # Once flagged, later alerts are not queued again
+    mailbox.store([1], [5])
+    ids, resync = mailbox.take(1)
+    assert (ids.tolist(), resync) == ([], True)
+    assert mailbox.take(1)[1] is False
+    assert mailbox.take(2)[0].tolist() == [1, 2, 4]
+
+
+def test_batch_larger_than_capacity_flags_resync():
+    mailbox = OfflineMailbox(capacity=2)
+    mailbox.store([1], [1, 2, 3])
+    ids, resync = mailbox.take(1)
+    assert (ids.tolist(), resync) == ([], True)
+
+
+def test_zero_capacity_stores_nothing():
+    mailbox = OfflineMailbox(capacity=0)
+    mailbox.store([1], [1])
+    assert len(mailbox) == 0
+
+
+def test_large_ids_widen_existing_box():
+    mailbox = OfflineMailbox(capacity=8)
+    mailbox.store([1], [10, 11])
+    assert mailbox.stats()["bytes"] == 2 * 4
+    mailbox.store([1], [BIG])
+    mailbox.store([1], [12])
+    ids, _ = mailbox.take(1)
+    assert ids.typecode == "q"
+    assert ids.tolist() == [10, 11, BIG, 12]
+
+
+def test_large_ids_in_new_box():
+    mailbox = OfflineMailbox(capacity=8)
+    mailbox.store([1], [BIG, 3])
+    ids, _ = mailbox.take(1)
+    assert (ids.typecode, ids.tolist()) == ("q", [BIG, 3])
+
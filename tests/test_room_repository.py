@@ -0,0 +1,44 @@
+"""SQLRoomRepository memberships: repeated and concurrent adds leave a single row."""
+import threading
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from src.frameworks_drivers.db.orm_models import RoomORM, UserORM, room_users
+from src.frameworks_drivers.db.schema import ensure_schema
+from src.interface_adapters.repositories.room_repository import SQLRoomRepository
+from src.interface_adapters.room_catalog import room_catalog
+
+
+def test_concurrent_adds_insert_one_membership(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    ensure_schema(engine)
+    with Session(engine) as db:
+        db.add_all([RoomORM(id=1, name="ops"), UserORM(id=1, username="ana", password="x")])
+        db.commit()
+
+    version = room_catalog.version
+    barrier = threading.Barrier(8)
+    results = []
+
+    def add():
+        with Session(engine) as db:
+            barrier.wait()
+            results.append(SQLRoomRepository(db).add_member(1, 1))
+
+    threads = [threading.Thread(target=add) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8
+    # MEMBER_ADDED is published by the add that inserted the row only
+    assert room_catalog.version == version + 1
+    with Session(engine) as db:
+        assert db.execute(select(func.count()).select_from(room_users)).scalar() == 1
+        assert SQLRoomRepository(db).add_member(1, 2) is False
+        assert SQLRoomRepository(db).add_member(2, 1) is False
+    engine.dispose()
@@ -0,0 +1,110 @@
+"""RoomSequences: seeding, release after a failed insert, reseed after a conflict."""
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.frameworks_drivers.db.orm_models import AlertORM, Base, RoomORM
+from src.interface_adapters.repositories.room_sequences import RoomSequences
+
+
+class Seed:
+    """Seed callback recording which rooms it was asked for."""
+
+    def __init__(self, last: int = 0):
+        self.last = last
+        self.calls = []
+
+    def __call__(self, room_id: int) -> int:
+        self.calls.append(room_id)
+        return self.last
+
+
+def test_seeds_once_then_counts():
+    sequences = RoomSequences()
+    seed = Seed(41)
+    assert [sequences.next(1, seed) for _ in range(3)] == [42, 43, 44]
+    assert seed.calls == [1]
+    assert sequences.last(1) == 44
+    assert sequences.last(2) is None
+
+
+def test_rooms_are_independent():
+    sequences = RoomSequences()
+    assert sequences.next(1, Seed()) == 1
+    assert sequences.next(2, Seed(9)) == 10
+    assert sequences.next(1, Seed()) == 2
+
+
+def test_release_gives_back_the_last_seq_only():
+    sequences = RoomSequences()
+    seed = Seed()
+    first = sequences.next(1, seed)
+    second = sequences.next(1, seed)
+    # Allocated after `first`: giving it back would hand out `second` twice
+    sequences.release(1, first)
+    assert sequences.last(1) == second
+    sequences.release(1, second)
+    assert sequences.last(1) == first
+    assert sequences.next(1, seed) == second
+
+
+def test_release_of_unknown_room_is_a_no_op():
+    sequences = RoomSequences()
+    sequences.release(5, 1)
+    assert sequences.last(5) is None
+
+
+def test_reseed_only_moves_forward():
+    sequences = RoomSequences()
+    sequences.reseed(1, 10)
+    sequences.reseed(1, 4)
+    assert sequences.last(1) == 10
+    # Another worker took up to 20: the next local seq follows it
+    sequences.reseed(1, 20)
+    assert sequences.next(1, Seed()) == 21
+
+
+def test_forget_seeds_again():
+    sequences = RoomSequences()
+    sequences.next(1, Seed())
+    sequences.forget(1)
+    seed = Seed(7)
+    assert sequences.next(1, seed) == 8
+    assert seed.calls == [1]
+
+
+def test_concurrent_allocation_hands_out_each_seq_once():
+    sequences = RoomSequences()
+    allocated = []
+    lock = threading.Lock()
+
+    def worker():
+        mine = [sequences.next(1, Seed()) for _ in range(500)]
+        with lock:
+            allocated.extend(mine)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(allocated) == list(range(1, 4001))
+
+
+def test_warm_up_seeds_rooms_with_alerts():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([RoomORM(id=1, name="a"), RoomORM(id=2, name="b"), RoomORM(id=3, name="c")])
+        db.add_all([
+            AlertORM(content="x", room_id=1, seq=1),
+            AlertORM(content="y", room_id=1, seq=5),
+            AlertORM(content="z", room_id=2, seq=2)
+        ])
+        db.commit()
+        sequences = RoomSequences()
+        assert sequences.warm_up(db) == 2
+    assert sequences.last(1) == 5
+    assert sequences.last(2) == 2
+    assert sequences.last(3) is None
@@ -0,0 +1,119 @@
+"""ensure_schema: fresh databases, and upgrades from every earlier version."""
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from src.frameworks_drivers.db.schema import MIGRATIONS, SCHEMA_VERSION, ensure_schema, get_schema_version
+
+# The tables as the first release created them (schema version 0/1)
+BASELINE_DDL = [
+    "CREATE TABLE users (id INTEGER NOT NULL, username VARCHAR, password VARCHAR, PRIMARY KEY (id))",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    "CREATE TABLE rooms (id INTEGER NOT NULL, name VARCHAR(60), PRIMARY KEY (id), UNIQUE (name))",
+    "CREATE INDEX ix_rooms_id ON rooms (id)",
+    "CREATE TABLE room_users (room_id INTEGER, user_id INTEGER, "
+    "FOREIGN KEY(room_id) REFERENCES rooms (id), FOREIGN KEY(user_id) REFERENCES users (id))",
+    "CREATE TABLE alerts (id INTEGER NOT NULL, content VARCHAR(200), user_id INTEGER, room_id INTEGER, "
+    "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (id), "
+    "FOREIGN KEY(user_id) REFERENCES users (id), FOREIGN KEY(room_id) REFERENCES rooms (id))",
+    "CREATE INDEX ix_alerts_id ON alerts (id)",
+    "CREATE TABLE tokens (\"key\" VARCHAR NOT NULL, user_id INTEGER, PRIMARY KEY (\"key\"), "
+    "FOREIGN KEY(user_id) REFERENCES users (id))",
+    "CREATE INDEX ix_tokens_key ON tokens (\"key\")"
+]
+
+BASELINE_ROWS = [
+    "INSERT INTO users (id, username, password) VALUES (1, 'ana', 'x')",
+    "INSERT INTO rooms (id, name) VALUES (1, 'ops'), (2, 'dev')",
+    # Duplicate membership left by two racing adds
+    "INSERT INTO room_users (room_id, user_id) VALUES (1, 1), (2, 1), (1, 1)",
+    # Interleaved rooms: seqs must follow id order within each room
+    "INSERT INTO alerts (id, content, user_id, room_id) VALUES "
+    "(1, 'a', 1, 1), (2, 'b', 1, 2), (3, 'c', 1, 1), (4, 'd', NULL, 1), (5, 'e', 1, 2)"
+]
+
+
+def _engine(tmp_path, name: str = "app.db"):
+    return create_engine(f"sqlite:///{tmp_path / name}")
+
+
+def _baseline(engine, version: int):
+    """A database as left by release `version` (baseline tables plus its migrations)."""
+    with engine.begin() as conn:
+        for statement in BASELINE_DDL + BASELINE_ROWS:
+            conn.exec_driver_sql(statement)
+        for target, migrate in MIGRATIONS:
+            if target <= version:
+                migrate(conn)
+        conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+
+
+def _layout(engine) -> dict:
+    """Columns and index names of every table."""
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table))
+        )
+        for table in inspector.get_table_names()
+    }
+
+
+def test_fresh_database(tmp_path):
+    engine = _engine(tmp_path)
+    assert ensure_schema(engine) is True
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+    assert {"users", "rooms", "room_users", "alerts", "tokens", "ack_states", "alert_acks"} <= set(_layout(engine))
+
+
+def test_up_to_date_database_is_left_alone(tmp_path):
+    engine = _engine(tmp_path)
+    ensure_schema(engine)
+    assert ensure_schema(engine) is False
+
+
+@pytest.mark.parametrize("version", range(SCHEMA_VERSION))
+def test_upgrade_matches_a_fresh_database(tmp_path, version):
+    engine = _engine(tmp_path)
+    _baseline(engine, version)
+    assert ensure_schema(engine) is True
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+
+    fresh = _engine(tmp_path, "fresh.db")
+    ensure_schema(fresh)
+    assert _layout(engine) == _layout(fresh)
+
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT id, room_id, seq, severity, client_msg_id, expires_at FROM alerts ORDER BY id"
+        ).all()
+        assert conn.exec_driver_sql("SELECT alert_ttl FROM rooms").scalars().all() == [None, None]
+        memberships = conn.exec_driver_sql("SELECT room_id, user_id FROM room_users ORDER BY room_id").all()
+    assert [tuple(row) for row in memberships] == [(1, 1), (2, 1)]
+    assert [tuple(row) for row in rows] == [
+        (1, 1, 1, "info", None, None),
+        (2, 2, 1, "info", None, None),
+        (3, 1, 2, "info", None, None),
+        (4, 1, 3, "info", None, None),
+        (5, 2, 2, "info", None, None)
+    ]
+
+
+def test_upgraded_database_enforces_new_constraints(tmp_path):
+    engine = _engine(tmp_path)
+    _baseline(engine, 0)
+    ensure_schema(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE alerts SET client_msg_id = 'm1' WHERE id = 1")
+    for statement in (
+        # (room_id, seq), (user_id, client_msg_id) and memberships are unique
+        "INSERT INTO alerts (content, user_id, room_id, seq) VALUES ('dup', 1, 1, 2)",
+        "INSERT INTO alerts (content, user_id, room_id, seq, client_msg_id) VALUES ('dup', 1, 1, 9, 'm1')",
+        "INSERT INTO room_users (room_id, user_id) VALUES (1, 1)"
+    ):
+        with pytest.raises(Exception, match="UNIQUE"):
+            with engine.begin() as conn:
+                conn.exec_driver_sql(statement)
@@ -0,0 +1,82 @@
+"""SeqBitmap against a plain set, across array and bitmap chunks."""
+import random
+
+import pytest
+
+from src.entities.seq_bitmap import ARRAY_MAX, SeqBitmap
+
+
+def _assert_same(bitmap: SeqBitmap, expected: set):
+    assert len(bitmap) == len(expected)
+    assert list(bitmap) == sorted(expected)
+    restored = SeqBitmap.from_bytes(bitmap.to_bytes())
+    assert list(restored) == sorted(expected)
+    assert len(restored) == len(expected)
+
+
+def _chunk_kinds(bitmap: SeqBitmap) -> dict:
+    return {high: type(chunk).__name__ for high, chunk in bitmap._chunks.items()}
+
+
+def test_empty():
+    bitmap = SeqBitmap()
+    assert len(bitmap) == 0
+    assert 0 not in bitmap
+    assert bitmap.to_bytes() == b""
+    assert len(SeqBitmap.from_bytes(b"")) == 0
+    assert bitmap.discard(3) is False
+    assert bitmap.discard_below(100) == 0
+
+
+def test_add_and_discard_report_changes():
+    bitmap = SeqBitmap([5, 1, 70_000])
+    assert bitmap.add(5) is False
+    assert bitmap.add(6) is True
+    assert bitmap.discard(1) is True
+    assert bitmap.discard(1) is False
+    assert 70_000 in bitmap and 1 not in bitmap and 65_536 not in bitmap
+    _assert_same(bitmap, {5, 6, 70_000})
+
+
+def test_dense_chunk_switches_to_bitmap_and_back():
+    values = set(range(0, 2 * (ARRAY_MAX + 1), 2))
+    bitmap = SeqBitmap(values)
+    assert _chunk_kinds(bitmap) == {0: "bytearray"}
+    _assert_same(bitmap, values)
+    # Under half of ARRAY_MAX the chunk goes back to a sorted array
+    for value in sorted(values)[: len(values) - ARRAY_MAX // 2 + 1]:
+        bitmap.discard(value)
+        values.discard(value)
+    assert _chunk_kinds(bitmap) == {0: "array"}
+    _assert_same(bitmap, values)
+
+
+@pytest.mark.parametrize("cut", [0, 1, 7, 8, 4_000, 65_535, 65_536, 65_537, 140_000, 1 << 20])
+def test_discard_below(cut):
+    # Chunk 0 dense (bitmap), chunk 1 sparse (array), chunk 2 dense
+    values = set(range(0, 10_000)) | set(range(65_536, 70_000, 50)) | set(range(131_072, 141_072))
+    bitmap = SeqBitmap(values)
+    assert _chunk_kinds(bitmap) == {0: "bytearray", 1: "array", 2: "bytearray"}
+    removed = bitmap.discard_below(cut)
+    kept = {value for value in values if value >= cut}
+    assert removed == len(values) - len(kept)
+    _assert_same(bitmap, kept)
+
+
+def test_random_operations_match_a_set():
+    rng = random.Random(45)
+    bitmap = SeqBitmap()
+    expected = set()
+    for step in range(20_000):
+        # Mostly one hot chunk so it crosses the array/bitmap threshold
+        value = rng.randrange(12_000) if rng.random() < 0.9 else rng.randrange(1 << 32)
+        if rng.random() < 0.7:
+            assert bitmap.add(value) is (value not in expected)
+            expected.add(value)
+        else:
+            assert bitmap.discard(value) is (value in expected)
+            expected.discard(value)
+        if step % 2_500 == 0:
+            _assert_same(bitmap, expected)
+    assert all(value in bitmap for value in expected)
+    _assert_same(bitmap, expected)
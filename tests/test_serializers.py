@@ -0,0 +1,60 @@
+"""Precompiled serializers against the response_model path they replace."""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.entities.alert import Alert as AlertEntity, SEVERITY_CRITICAL, SEVERITY_WARNING
+from src.interface_adapters.presenters.schemas import Alert as AlertSchema, Room as RoomSchema
+from src.interface_adapters.presenters.serializers import alerts_to_json, rooms_to_json
+
+
+def _response_model_json(model, content) -> object:
+    """What FastAPI sends for `content` under response_model=model."""
+    adapter = TypeAdapter(model)
+    validated = adapter.validate_python(content, from_attributes=True)
+    return json.loads(json.dumps(adapter.dump_python(validated, mode="json")))
+
+
+ALERTS = [
+    # Defaults: no seq, no expiry, info
+    AlertEntity(id=1, content="plain", user_id=1, room_id=1, created_at=datetime(2024, 1, 1)),
+    AlertEntity(
+        id=2, content="warn", user_id=2, room_id=1,
+        created_at=datetime(2024, 1, 1, 12, 30, 15, 250_000),
+        seq=7, severity=SEVERITY_WARNING, expires_at=datetime(2024, 1, 2, 0, 0, 0, 1)
+    ),
+    AlertEntity(
+        id=3, content="ñandú \"quoted\" ☃", user_id=3, room_id=2,
+        created_at=datetime(1999, 12, 31, 23, 59, 59, 999_999),
+        seq=1, client_msg_id="c-1", severity=SEVERITY_CRITICAL
+    )
+]
+
+
+@pytest.mark.parametrize("alerts", [[], ALERTS[:1], ALERTS], ids=["empty", "one", "mixed"])
+def test_alerts_to_json_matches_response_model(alerts):
+    assert json.loads(alerts_to_json(alerts)) == _response_model_json(List[AlertSchema], alerts)
+
+
+def test_alerts_to_json_drops_internal_fields():
+    (row,) = json.loads(alerts_to_json(ALERTS[2:]))
+    assert "room_id" not in row and "client_msg_id" not in row
+
+
+ROOMS = [
+    SimpleNamespace(id=1, name="empty", users=[], alert_ttl=None),
+    SimpleNamespace(
+        id=2, name="ops",
+        users=[SimpleNamespace(id=1, username="ana"), SimpleNamespace(id=2, username="luis")],
+        alert_ttl=3600
+    )
+]
+
+
+@pytest.mark.parametrize("rooms", [[], ROOMS], ids=["empty", "mixed"])
+def test_rooms_to_json_matches_response_model(rooms):
+    assert json.loads(rooms_to_json(rooms)) == _response_model_json(List[RoomSchema], rooms)
@@ -0,0 +1,82 @@
+"""TimerWheel: every item fires on its deadline tick, through cascades and overflow."""
+import random
+
+import pytest
+
+from src.interface_adapters.alert_expiry import TimerWheel
+
+
+class SmallWheel(TimerWheel):
+    """2 levels of 4 slots: cascades every 4 ticks, overflow past 16 ticks out."""
+    BITS = 2
+    SLOTS = 1 << BITS
+    LEVELS = 2
+
+
+def _fire_ticks(wheel: TimerWheel, until: int) -> dict:
+    """Advance one tick at a time, mapping each expired item to its tick."""
+    fired = {}
+    while wheel.current < until:
+        tick = wheel.current + 1
+        for item in wheel.advance(tick):
+            assert item not in fired
+            fired[item] = tick
+    return fired
+
+
+@pytest.mark.parametrize("delta", [1, 2, 63, 64, 65, 127, 128, 4095, 4096, 4097, 70_000])
+def test_fires_on_deadline(delta):
+    start = 1_000_003
+    wheel = TimerWheel(start)
+    wheel.add(start + delta, "item")
+    assert wheel.advance(start + delta - 1) == []
+    assert wheel.advance(start + delta) == ["item"]
+    assert wheel.pending == 0
+
+
+def test_past_deadline_fires_next_tick():
+    wheel = TimerWheel(500)
+    wheel.add(10, "late")
+    wheel.add(500, "now")
+    assert sorted(wheel.advance(501)) == ["late", "now"]
+
+
+def test_big_jump_returns_everything_due():
+    wheel = TimerWheel(0)
+    for deadline in (1, 64, 4096, 262_144):
+        wheel.add(deadline, deadline)
+    assert sorted(wheel.advance(300_000)) == [1, 64, 4096, 262_144]
+    assert wheel.pending == 0
+
+
+@pytest.mark.parametrize("start", [0, 3, 15, 16, 61])
+def test_cascading_and_overflow_match_reference(start):
+    rng = random.Random(start)
+    wheel = SmallWheel(start)
+    expected = {}
+    for index in range(300):
+        # Up to 40 ticks out: level 0, level 1 and the overflow list
+        deadline = start + rng.randint(-2, 40)
+        wheel.add(deadline, index)
+        expected[index] = max(deadline, start + 1)
+    assert wheel.pending == 300
+
+    assert _fire_ticks(wheel, start + 50) == expected
+    assert wheel.pending == 0
+
+
+def test_items_added_while_running():
+    wheel = SmallWheel(0)
+    fired = {}
+    expected = {}
+    rng = random.Random(7)
+    for now in range(1, 120):
+        for item in wheel.advance(now):
+            fired[item] = now
+        for _ in range(3):
+            item = (now, len(expected))
+            deadline = now + rng.randint(0, 35)
+            wheel.add(deadline, item)
+            expected[item] = max(deadline, now + 1)
+    fired.update(_fire_ticks(wheel, 200))
+    assert fired == expected
@@ -0,0 +1,55 @@
+"""WebSocket handlers: idle sockets hold no connection of the read pool."""
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Settings and engines are read at import, so the app runs in its own process
+SCRIPT = textwrap.dedent("""
+    import json
+    from fastapi.testclient import TestClient
+    from main import app
+    from src.frameworks_drivers.db.connection import SessionLocal
+    from src.frameworks_drivers.db.orm_models import RoomORM
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        db.add(RoomORM(name="room 1"))
+        db.commit()
+        db.close()
+        client.post("/api/register", json={"username": "a", "password": "p"})
+        token = client.post("/api/login", json={"username": "a", "password": "p"}).json()["token"]
+        sockets = []
+        for _ in range(3):
+            ws = client.websocket_connect(f"/ws/alert/room/1?token={token}&last_alert_id=0")
+            ws.__enter__()
+            ws.send_text(json.dumps({"action": "fetch", "from_seq": 1, "to_seq": 5}))
+            assert json.loads(ws.receive_text())["room_id"] == 1
+            sockets.append(ws)
+        response = client.get("/api/alerts?room_id=1", headers={"Authorization": token})
+        assert response.status_code == 200, response.text
+        for ws in sockets:
+            ws.__exit__(None, None, None)
+    print("ok")
+""")
+
+
+def test_open_sockets_leave_the_read_pool_free(tmp_path):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}",
+        DB_SPLIT_READ_WRITE="1",
+        DB_READ_POOL_SIZE="2",
+        REPOSITORY_BACKEND="sql",
+        MEMORY_ROOMS="",
+        CLUSTER_NODES="",
+        PYTHONPATH=ROOT,
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=ROOT, env=env,
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")